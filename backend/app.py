@@ -1,25 +1,57 @@
 """
 API Flask pour la Détection de Fake News
-Modèle : Random Forest Optimized
+Modèles : Random Forest Optimized (défaut), Logistic Regression, cascade
 Version : 2.0
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Request, Response, g, request, jsonify, stream_with_context
 from flask_cors import CORS
-import pickle
-import re
-import nltk
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
+from werkzeug.exceptions import RequestEntityTooLarge
+import atexit
+import hmac
+import json
 import os
+import time
+
+import config
+from preprocessing import TextPreprocessor, vocabulary_words
+from result_cache import create_result_cache, cache_key
+from scoring import ModelScorer, CascadeScorer
+from model_loading import load_models, load_model_file, build_engine, build_vectorizer
+from model_catalog import ModelCatalog, UnknownModelError
+from model_registry import ModelBundle, ModelRegistry
+from pipeline import InferencePipeline
+from explanations import build_contributions
+from long_text import LongTextPolicy
+from near_duplicates import NearDuplicateIndex
+from parallel_preprocessing import ParallelPreprocessor
+from batching import MicroBatcher, QueueFullError
+from instrumentation import (
+    METRICS, REQUEST_LATENCY, STAGE_LATENCY, REQUESTS, ERRORS, PREDICTIONS,
+    RequestTrace, StructuredLogger
+)
 
 # ============================================================
 # INITIALISATION DE L'APPLICATION
 # ============================================================
 
+class APIRequest(Request):
+    """Requête avec une limite de taille propre à /predict/stream"""
+    
+    @property
+    def max_content_length(self):
+        if self.url_rule is not None and self.url_rule.rule == '/predict/stream':
+            return config.STREAM_MAX_REQUEST_BYTES or None
+        return config.MAX_REQUEST_BYTES or None
+
+
 app = Flask(__name__)
+app.request_class = APIRequest  # Corps limité à MAX_REQUEST_BYTES (413 au-delà)
 CORS(app)  # Permettre les requêtes depuis d'autres domaines
 
+# Journal structuré des requêtes (JSON, thread d'écriture, échantillonné)
+request_log = StructuredLogger(sample_rate=config.LOG_SAMPLE_RATE)
+
 print("=" * 60)
 print("🚀 FCC FAKE NEWS DETECTOR API - DÉMARRAGE")
 print("=" * 60)
@@ -30,36 +62,16 @@ print("=" * 60)
 
 print("\n📦 Chargement des modèles depuis models/...")
 
-# Charger le modèle Random Forest
-try:
-    model_path = os.path.join('models', 'random_forest_optimized.pkl')
-    with open(model_path, 'rb') as f:
-        model = pickle.load(f)
-    print(f"✅ Modèle chargé : Random Forest Optimized")
-except FileNotFoundError:
-    print(f"❌ ERREUR : Fichier '{model_path}' non trouvé")
-    print("   → Vérifiez que le fichier existe dans backend/models/")
-    model = None
-except Exception as e:
-    print(f"❌ ERREUR lors du chargement du modèle : {e}")
-    model = None
+def load_default_models():
+    """Charger le modèle principal (DEFAULT_MODEL) et le vectorizer partagé"""
+    return load_models(model_path=config.MODEL_CATALOG[config.DEFAULT_MODEL])
 
-# Charger le vectorizer TF-IDF
-try:
-    vectorizer_path = os.path.join('models', 'tfidf_vectorizer.pkl')
-    with open(vectorizer_path, 'rb') as f:
-        vectorizer = pickle.load(f)
-    print(f"✅ Vectorizer chargé : TF-IDF")
-except FileNotFoundError:
-    print(f"❌ ERREUR : Fichier '{vectorizer_path}' non trouvé")
-    print("   → Vérifiez que le fichier existe dans backend/models/")
-    vectorizer = None
-except Exception as e:
-    print(f"❌ ERREUR lors du chargement du vectorizer : {e}")
-    vectorizer = None
+
+model, vectorizer, model_version = load_default_models()
 
 # Vérification finale
 if model is not None and vectorizer is not None:
+    print(f"🔖 Version du modèle : {model_version}")
     print("\n" + "=" * 60)
     print("✅ TOUS LES MODÈLES SONT CHARGÉS AVEC SUCCÈS")
     print("=" * 60)
@@ -68,10 +80,77 @@ else:
     print("⚠️  ATTENTION : MODÈLES NON CHARGÉS")
     print("=" * 60)
 
+# ============================================================
+# CACHE DES PRÉDICTIONS
+# ============================================================
+
+try:
+    prediction_cache = create_result_cache(
+        config.PREDICTION_CACHE_BACKEND,
+        maxsize=config.PREDICTION_CACHE_SIZE,
+        ttl=config.PREDICTION_CACHE_TTL,
+        path=config.PREDICTION_CACHE_PATH
+    )
+except Exception as e:
+    print(f"❌ ERREUR lors de l'initialisation du cache de prédictions : {e}")
+    prediction_cache = None
+
+# Quasi-doublons (reprises retouchées) d'articles déjà notés : MinHash/LSH
+# sur les mots nettoyés, borné, rechargé depuis NEAR_DUPLICATE_PATH
+near_duplicates = None
+if config.NEAR_DUPLICATE_ENABLED:
+    near_duplicates = NearDuplicateIndex(
+        maxsize=config.NEAR_DUPLICATE_SIZE,
+        threshold=config.NEAR_DUPLICATE_THRESHOLD,
+        shingle_size=config.NEAR_DUPLICATE_SHINGLE,
+        ttl=config.NEAR_DUPLICATE_TTL
+    )
+    if config.NEAR_DUPLICATE_PATH and os.path.exists(config.NEAR_DUPLICATE_PATH):
+        try:
+            loaded = near_duplicates.load(config.NEAR_DUPLICATE_PATH)
+            print(f"✅ Index des quasi-doublons rechargé : {loaded} articles")
+        except Exception as e:
+            print(f"⚠️  Index des quasi-doublons non rechargé ({e})")
+    print(f"🧬 Quasi-doublons : similarité ≥ {config.NEAR_DUPLICATE_THRESHOLD}, "
+          f"{config.NEAR_DUPLICATE_SIZE} articles max")
+
+# Textes très longs : seule une partie bornée est analysée (MAX_TEXT_CHARS)
+try:
+    long_text_policy = LongTextPolicy(
+        config.MAX_TEXT_CHARS,
+        strategy=config.LONG_TEXT_STRATEGY,
+        segment_chars=config.LONG_TEXT_SEGMENT_CHARS
+    )
+except ValueError as e:
+    print(f"⚠️  {e} → stratégie \"chunks\"")
+    long_text_policy = LongTextPolicy(
+        config.MAX_TEXT_CHARS, segment_chars=config.LONG_TEXT_SEGMENT_CHARS
+    )
+
+if long_text_policy.max_chars:
+    print(f"📏 Textes de plus de {long_text_policy.max_chars} caractères : "
+          f"stratégie \"{long_text_policy.strategy}\"")
+
 # ============================================================
 # FONCTION DE NETTOYAGE DU TEXTE
 # ============================================================
 
+# Préprocesseur construit une seule fois (stopwords, lemmatiseur, regex)
+# et partagé par toutes les requêtes
+try:
+    preprocessor = TextPreprocessor(lemma_cache_size=config.LEMMA_CACHE_SIZE)
+    print(f"✅ Préprocesseur prêt : {len(preprocessor.stop_words)} stopwords")
+    
+    # Préchargement optionnel du cache de lemmes depuis le vocabulaire TF-IDF
+    if config.LEMMA_CACHE_PRELOAD and preprocessor.lemma_cache and vectorizer is not None:
+        preloaded = preprocessor.lemma_cache.preload(vocabulary_words(vectorizer))
+        print(f"✅ Cache de lemmes préchargé : {preloaded} mots")
+except Exception as e:
+    print(f"❌ ERREUR lors de l'initialisation du préprocesseur : {e}")
+    print("   → Vérifiez que les données NLTK (stopwords, wordnet) sont installées")
+    preprocessor = None
+
+
 def clean_text(text):
     """
     Nettoie et prétraite le texte avant l'analyse
@@ -91,39 +170,422 @@ def clean_text(text):
         str: Texte nettoyé et prétraité
     """
     try:
-        # 1. Minuscules
-        text = text.lower()
-        
-        # 2. Supprimer les URLs
-        text = re.sub(r'http\S+|www\S+|https\S+', '', text)
-        
-        # 3. Supprimer les emails
-        text = re.sub(r'\S+@\S+', '', text)
-        
-        # 4. Garder uniquement lettres et espaces
-        text = re.sub(r'[^a-zA-Z\s]', '', text)
-        
-        # 5. Supprimer espaces multiples
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        # 6. Supprimer les stopwords
-        stop_words = set(stopwords.words('english'))
-        words = text.split()
-        words = [word for word in words if word not in stop_words and len(word) > 2]
-        
-        # 7. Lemmatisation
-        lemmatizer = WordNetLemmatizer()
-        words = [lemmatizer.lemmatize(word) for word in words]
-        
-        # Retourner le texte nettoyé
-        cleaned = ' '.join(words)
-        
-        return cleaned
+        return preprocessor.clean(text)
     
     except Exception as e:
-        print(f"❌ Erreur dans clean_text : {e}")
+        request_log.log({"event": "clean_text_error", "error": str(e)}, sampled=False)
         return text
 
+
+def clean_words(text):
+    """
+    Nettoie le texte comme clean_text mais retourne la liste des mots
+    (chemin fusionné : ' '.join(clean_words(text)) == clean_text(text))
+    
+    Args:
+        text (str): Texte brut à nettoyer
+    
+    Returns:
+        list[str]: Mots nettoyés et lemmatisés
+    """
+    try:
+        return preprocessor.tokens(text)
+    
+    except Exception as e:
+        request_log.log({"event": "clean_text_error", "error": str(e)}, sampled=False)
+        return [text]
+
+# ============================================================
+# PIPELINE D'INFÉRENCE ET MICRO-BATCHING
+# ============================================================
+
+# Nettoyage des gros lots réparti sur plusieurs processus (PARALLEL_CLEAN_WORKERS)
+parallel_cleaner = None
+if preprocessor is not None and config.PARALLEL_CLEAN_WORKERS > 1:
+    parallel_cleaner = ParallelPreprocessor(
+        config.PARALLEL_CLEAN_WORKERS,
+        fallback=clean_text,
+        fallback_tokens=clean_words,
+        lemma_cache_size=config.LEMMA_CACHE_SIZE,
+        min_parallel_chars=config.PARALLEL_CLEAN_MIN_CHARS
+    )
+    print(f"🧵 Nettoyage parallèle : {config.PARALLEL_CLEAN_WORKERS} processus "
+          f"(lots de plus de {config.PARALLEL_CLEAN_MIN_CHARS} caractères)")
+
+# Article d'exemple utilisé par /test, par l'auto-test au démarrage et
+# pour préchauffer une nouvelle version du modèle
+SAMPLE_TEXT = "Breaking news! Scientists discovered shocking truth that doctors don't want you to know!"
+
+
+def build_scorer(model, vectorizer, name, version):
+    """
+    Scorer d'un modèle du catalogue
+    
+    Un seul appel à predict_proba par requête ; le label en est dérivé.
+    INFERENCE_ENGINE=compiled : forêt aplatie en tableaux NumPy (forest_engine).
+    La table des contributions par terme ("explain") est préparée ici, une
+    fois par modèle chargé (explanations ; forêt : au premier article expliqué)
+    """
+    engine = build_engine(model, vectorizer)
+    scorer = ModelScorer(engine, threshold=config.DECISION_THRESHOLD, name=name, version=version)
+    scorer.contributions = build_contributions(engine, vectorizer, scorer.fake_index)
+    return scorer
+
+
+def cache_namespace(scorer):
+    """
+    Espace de clés du cache : version du modèle (ou des deux modèles de la
+    cascade) + seuil de décision + traitement des textes longs
+    (un résultat dépend des trois)
+    """
+    return f"{scorer.version}:{config.DECISION_THRESHOLD}:{long_text_policy.signature}"
+
+
+def build_bundle(model, vectorizer, version):
+    """
+    Construire tout ce qui dépend d'une version du modèle
+    
+    Moteur d'inférence, vectorisation, scorer, pipeline, espace de clés
+    du cache et catalogue des autres modèles : appelé au démarrage puis à
+    chaque rechargement.
+    
+    Returns:
+        ModelBundle
+    """
+    # VECTORIZER_ENGINE=fast (défaut) : même matrice TF-IDF, sans le surcoût
+    # de TfidfVectorizer.transform (fast_vectorizer)
+    text_vectorizer = build_vectorizer(vectorizer)
+    
+    try:
+        scorer = build_scorer(model, vectorizer, config.DEFAULT_MODEL, version) if model is not None else None
+        if scorer is not None and config.DECISION_THRESHOLD is not None:
+            print(f"🎯 Seuil de décision FAKE : {config.DECISION_THRESHOLD}")
+    except Exception as e:
+        print(f"❌ ERREUR lors de l'initialisation du scorer : {e}")
+        scorer = None
+    
+    # Nettoyage → un seul transform → un seul predict_proba pour N articles.
+    # FUSED_TOKENIZER=1 (défaut) : les mots nettoyés vont directement au
+    # vectorizer rapide, sans texte nettoyé intermédiaire
+    pipeline = None
+    if scorer is not None:
+        pipeline = InferencePipeline(
+            clean_text, text_vectorizer, scorer,
+            clean_many=parallel_cleaner.clean_many if parallel_cleaner is not None else None,
+            tokenize=clean_words if config.FUSED_TOKENIZER else None,
+            tokens_many=parallel_cleaner.tokens_many if parallel_cleaner is not None else None,
+            long_text=long_text_policy
+        )
+        if pipeline.fused:
+            print("⚙️  Nettoyage et vectorisation fusionnés")
+    
+    # Autres modèles du catalogue : chargés au premier usage, même vectorizer
+    models = None
+    if scorer is not None:
+        models = ModelCatalog(
+            config.MODEL_CATALOG, config.DEFAULT_MODEL, scorer,
+            n_features=len(vectorizer.vocabulary_),
+            load=lambda path: load_model_file(path, version),
+            build_scorer=lambda other, name, other_version: build_scorer(other, vectorizer, name, other_version),
+            cascade=config.CASCADE_MODELS if len(config.CASCADE_MODELS) == 2 else None,
+            cascade_min_confidence=config.CASCADE_MIN_CONFIDENCE
+        )
+    
+    return ModelBundle(
+        version, model, vectorizer,
+        text_vectorizer=text_vectorizer,
+        scorer=scorer,
+        pipeline=pipeline,
+        cache_namespace=cache_namespace(scorer) if scorer is not None else None,
+        models=models
+    )
+
+
+def sample_prediction(bundle):
+    """
+    Noter l'article d'exemple avec une version du modèle (sans cache)
+    
+    Raises:
+        RuntimeError: Modèles ou préprocesseur non chargés
+    """
+    if bundle.pipeline is None or preprocessor is None:
+        raise RuntimeError("models or preprocessor not loaded")
+    vectorized = bundle.text_vectorizer.transform([preprocessor.clean(SAMPLE_TEXT)])
+    predictions, probabilities = bundle.scorer.score(vectorized)
+    return bundle.scorer.result(predictions[0], probabilities[0])
+
+
+def bind_prediction_cache(bundle):
+    """Les entrées (cache, quasi-doublons) d'une autre version du modèle sont invalidées"""
+    if prediction_cache is not None and bundle.version is not None:
+        prediction_cache.bind_model_version(bundle.cache_namespace)
+    if near_duplicates is not None and bundle.version is not None:
+        near_duplicates.bind_model_version(bundle.cache_namespace)
+
+
+def near_duplicate_args(scorer, ids, force):
+    """
+    Arguments de `predict_texts` pour l'index des quasi-doublons
+    
+    Args:
+        scorer: Scorer de la requête (espace de noms de l'index)
+        ids (list): Identifiant de chaque texte (None : empreinte du texte)
+        force (bool): Noter les textes même s'ils ont un quasi-doublon
+    
+    Returns:
+        dict: Vide si l'index est désactivé
+    """
+    if near_duplicates is None:
+        return {}
+    return {
+        "near_duplicates": near_duplicates,
+        "namespace": cache_namespace(scorer),
+        "ids": ids,
+        "force": force
+    }
+
+
+def save_near_duplicates():
+    """Écrire l'index des quasi-doublons (NEAR_DUPLICATE_PATH) ; appelé à l'arrêt"""
+    if near_duplicates is None or not config.NEAR_DUPLICATE_PATH:
+        return None
+    return near_duplicates.save(config.NEAR_DUPLICATE_PATH)
+
+
+# Version servie : remplacée d'un bloc au rechargement (fichiers surveillés
+# si MODEL_WATCH_INTERVAL > 0, ou POST /admin/reload). Chaque requête lit
+# `registry.current` une seule fois et se termine avec cette version
+registry = ModelRegistry(
+    load=load_default_models,
+    build=build_bundle,
+    warm=sample_prediction,
+    watch_paths=([config.MODEL_ARTIFACTS_DIR] if config.MODEL_ARTIFACTS_DIR else [config.VECTORIZER_PATH])
+    + sorted(set(config.MODEL_CATALOG.values())),
+    poll_interval=config.MODEL_WATCH_INTERVAL,
+    on_swap=bind_prediction_cache
+)
+registry.install(build_bundle(model, vectorizer, model_version))
+if prediction_cache is not None and model_version is not None:
+    print(f"✅ Cache de prédictions : {prediction_cache.backend}")
+
+# Le registre garde seul une référence vers le modèle (libéré au rechargement)
+del model, vectorizer, model_version
+
+
+def predict_current(items):
+    """
+    Noter un lot avec la version servie (micro-batching)
+    
+    Args:
+        items (list[tuple]): (texte, nom du modèle demandé, force,
+            identifiant de l'article, nombre de termes expliqués)
+    
+    Returns:
+        list[tuple]: (résultat, ModelBundle utilisé, scorer utilisé) pour
+            chaque texte ; en cas d'échec d'un groupe, le résultat de ses
+            textes est une erreur (error_code) et le scorer est None
+    """
+    bundle = registry.current
+    
+    # Un passage du pipeline par modèle demandé (et par valeur de force/explain)
+    groups = {}
+    for position, (_, name, force, _, explain) in enumerate(items):
+        groups.setdefault((name, force, explain), []).append(position)
+    
+    results = [None] * len(items)
+    for (name, force, explain), positions in groups.items():
+        # Un modèle impossible à charger n'échoue que pour ses propres requêtes
+        try:
+            scorer = bundle.models.scorer(name)
+        except Exception as e:
+            request_log.log({"event": "model_load_error", "model": name, "error": str(e)}, sampled=False)
+            for position in positions:
+                results[position] = ({
+                    "error": "Model unavailable",
+                    "message": f"Model '{name}' could not be loaded",
+                    "error_code": "model_unavailable",
+                    "details": str(e)
+                }, bundle, None)
+            continue
+        
+        try:
+            outputs = bundle.pipeline.predict_texts(
+                [items[position][0] for position in positions], scorer=scorer, explain=explain,
+                **near_duplicate_args(scorer, [items[position][3] for position in positions], force)
+            )
+        except Exception as e:
+            outputs = [{
+                "error": "Internal server error",
+                "message": "An error occurred during prediction",
+                "error_code": "internal",
+                "details": str(e)
+            } for _ in positions]
+        for position, output in zip(positions, outputs):
+            results[position] = (output, bundle, scorer)
+    return results
+
+
+# Statut HTTP des erreurs d'un article noté par /predict (défaut : 400)
+ERROR_STATUS = {'too_long': 413, 'model_unavailable': 503, 'internal': 500}
+
+
+# Regroupe les requêtes /predict concurrentes (MICROBATCH_ENABLED=1)
+batcher = None
+if config.MICROBATCH_ENABLED:
+    batcher = MicroBatcher(
+        predict_current,
+        max_batch_size=config.MICROBATCH_MAX_SIZE,
+        window_ms=config.MICROBATCH_WINDOW_MS,
+        max_queue=config.MICROBATCH_MAX_QUEUE
+    )
+    print(f"📥 Micro-batching : fenêtre {config.MICROBATCH_WINDOW_MS} ms, "
+          f"{config.MICROBATCH_MAX_SIZE} articles max")
+
+if registry.watch_paths and config.MODEL_WATCH_INTERVAL > 0:
+    print(f"👀 Surveillance des modèles toutes les {config.MODEL_WATCH_INTERVAL:g} s")
+
+# ============================================================
+# INSTRUMENTATION (TEMPS PAR ÉTAPE, MÉTRIQUES, JOURNAL)
+# ============================================================
+
+@app.before_request
+def start_trace():
+    """Démarrer le chronométrage de la requête"""
+    g.trace = RequestTrace()
+
+
+@app.after_request
+def record_trace(response):
+    """
+    Enregistrer les métriques et la ligne de journal de la requête
+    
+    Les erreurs serveur (5xx) sont toujours journalisées, les autres
+    requêtes selon LOG_SAMPLE_RATE.
+    """
+    trace = g.get('trace')
+    if trace is None:
+        return response
+    
+    # Route et non chemin brut : cardinalité des étiquettes bornée
+    endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    status = response.status_code
+    duration = trace.elapsed()
+    
+    REQUEST_LATENCY.observe(duration, endpoint=endpoint)
+    for stage, seconds in trace.stages.items():
+        STAGE_LATENCY.observe(seconds, endpoint=endpoint, stage=stage)
+    REQUESTS.inc(endpoint=endpoint, status=status)
+    if status >= 400:
+        ERRORS.inc(endpoint=endpoint, status=status)
+    
+    if endpoint != '/metrics':
+        request_log.log({
+            "event": "request",
+            "method": request.method,
+            "endpoint": endpoint,
+            "status": status,
+            "duration_ms": round(duration * 1000, 3),
+            "stages_ms": {stage: round(seconds * 1000, 3) for stage, seconds in trace.stages.items()},
+            **trace.fields
+        }, sampled=status < 500)
+    
+    return response
+
+
+@app.errorhandler(413)
+def request_too_large(error):
+    """Corps de requête au-delà de MAX_REQUEST_BYTES"""
+    return jsonify({
+        "error": "Request too large",
+        "message": f"Request body must not exceed {request.max_content_length} bytes"
+    }), 413
+
+
+# ============================================================
+# CHOIX DU MODÈLE PAR REQUÊTE
+# ============================================================
+
+def resolve_scorer(bundle, name):
+    """
+    Scorer du modèle demandé par une requête (chargé au premier usage)
+    
+    Args:
+        bundle (ModelBundle): Version servie
+        name (str): Nom du modèle, "cascade" ou None (DEFAULT_REQUEST_MODEL)
+    
+    Returns:
+        tuple: (scorer, None) ou (None, réponse d'erreur)
+    """
+    name = name or config.DEFAULT_REQUEST_MODEL
+    try:
+        if not isinstance(name, str):
+            raise UnknownModelError(name)
+        return bundle.models.scorer(name), None
+    except UnknownModelError:
+        return None, (jsonify({
+            "error": "Unknown model",
+            "message": f"Available models: {', '.join(bundle.models.names)}"
+        }), 400)
+    except Exception as e:
+        request_log.log({"event": "model_load_error", "model": name, "error": str(e)}, sampled=False)
+        return None, (jsonify({
+            "error": "Model unavailable",
+            "message": f"Model '{name}' could not be loaded",
+            "details": str(e)
+        }), 503)
+
+
+def model_fields(output, bundle, scorer):
+    """
+    Champs décrivant le modèle qui a noté un article
+    
+    Returns:
+        dict: model (nom affiché), model_id, model_version et, en mode
+            cascade, cascade_escalated (modèle coûteux appelé)
+    """
+    model_id = output.get("model_id", scorer.name)
+    fields = {
+        "model": config.MODEL_LABELS.get(model_id, model_id),
+        "model_id": model_id,
+        "model_version": bundle.models.version(model_id)
+    }
+    if isinstance(scorer, CascadeScorer):
+        fields["cascade_escalated"] = model_id == scorer.second.name
+    return fields
+
+
+def force_requested(data):
+    """
+    Notation complète demandée ("force": true dans le corps, ou ?force=1) :
+    ni cache, ni quasi-doublon
+    """
+    value = data.get('force') if isinstance(data, dict) else None
+    if value is None:
+        value = request.args.get('force', '')
+    return value is True or str(value).lower() in ('1', 'true', 'yes')
+
+
+def explain_requested(data):
+    """
+    Nombre de termes de l'explication demandée ("explain": true ou un entier)
+    
+    Returns:
+        tuple: (nombre de termes, 0 si aucune explication, None) ou
+            (None, réponse d'erreur)
+    """
+    value = data.get('explain')
+    if value is None or value is False:
+        return 0, None
+    if value is True:
+        return config.EXPLAIN_TOP_K, None
+    if isinstance(value, int) and value >= 0:
+        return min(value, config.EXPLAIN_MAX_TOP_K), None
+    return None, (jsonify({
+        "error": "Invalid 'explain' field",
+        "message": "'explain' must be a boolean or a non-negative number of terms"
+    }), 400)
+
+
 # ============================================================
 # ROUTES DE L'API
 # ============================================================
@@ -135,15 +597,22 @@ def home():
     
     Retourne les informations sur l'API et les endpoints disponibles
     """
+    bundle = registry.current
     return jsonify({
         "message": "FCC Fake News Detector API",
         "version": "2.0",
-        "model": "Random Forest Optimized",
-        "status": "operational" if (model and vectorizer) else "models not loaded",
+        "model": config.MODEL_LABELS.get(config.DEFAULT_MODEL, config.DEFAULT_MODEL),
+        "model_version": bundle.version,
+        "status": "operational" if bundle.loaded else "models not loaded",
         "endpoints": {
             "/": "API information",
             "/health": "Health check",
-            "/predict": "Fake news prediction (POST)"
+            "/stats": "Cache statistics",
+            "/metrics": "Prometheus metrics",
+            "/predict": "Fake news prediction (POST)",
+            "/predict/batch": "Batch fake news prediction (POST)",
+            "/predict/stream": "Streaming NDJSON bulk scoring (POST)",
+            "/admin/reload": "Hot model reload (POST, admin token)"
         },
         "author": "FCC Development Team",
         "year": 2024
@@ -155,24 +624,61 @@ def health():
     """
     Vérification de l'état de santé de l'API
     
-    Vérifie que les modèles sont chargés correctement
+    Vérifie que les modèles sont chargés correctement et indique la
+    version servie (empreinte, date de chargement, rechargements)
     """
-    if model is not None and vectorizer is not None:
+    bundle = registry.current
+    if bundle.loaded:
         return jsonify({
             "status": "healthy",
             "model": "loaded",
             "vectorizer": "loaded",
-            "model_type": "Random Forest Optimized"
+            "model_type": config.MODEL_LABELS.get(config.DEFAULT_MODEL, config.DEFAULT_MODEL),
+            "models": {
+                "default": config.DEFAULT_REQUEST_MODEL,
+                "available": bundle.models.names if bundle.models else [],
+                "loaded": bundle.models.loaded if bundle.models else []
+            },
+            **registry.status()
         }), 200
     else:
         return jsonify({
             "status": "unhealthy",
-            "model": "not loaded" if model is None else "loaded",
-            "vectorizer": "not loaded" if vectorizer is None else "loaded",
+            "model": "not loaded" if bundle.model is None else "loaded",
+            "vectorizer": "not loaded" if bundle.vectorizer is None else "loaded",
             "error": "Models failed to load"
         }), 500
 
 
+@app.route('/stats', methods=['GET'])
+def stats():
+    """
+    Statistiques des caches internes
+    
+    Retourne le nombre de hits, misses et évictions du cache de lemmes,
+    du cache de prédictions et de l'index des quasi-doublons
+    """
+    lemma_cache = preprocessor.lemma_cache if preprocessor is not None else None
+    
+    return jsonify({
+        "lemma_cache": lemma_cache.stats() if lemma_cache else {"enabled": False},
+        "prediction_cache": prediction_cache.stats() if prediction_cache else {"enabled": False},
+        "near_duplicates": near_duplicates.stats() if near_duplicates else {"enabled": False}
+    }), 200
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """
+    Métriques au format texte Prometheus
+    
+    Histogrammes de latence (requête complète et par étape), nombre de
+    requêtes par statut, nombre de prédictions par label et erreurs.
+    Les valeurs sont propres au worker qui répond.
+    """
+    return Response(METRICS.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+
 @app.route('/predict', methods=['POST'])
 def predict():
     """
@@ -182,7 +688,11 @@ def predict():
     
     Body JSON:
         {
-            "text": "Article text to analyze..."
+            "text": "Article text to analyze...",
+            "model": "forest", "linear" ou "cascade" (optionnel),
+            "id": "article-1" (optionnel, identifiant dans l'index des quasi-doublons),
+            "force": true (optionnel, noter sans cache ni quasi-doublon),
+            "explain": true ou 5 (optionnel, termes qui ont le plus pesé)
         }
     
     Retourne JSON:
@@ -195,20 +705,56 @@ def predict():
                 "fake": 0.0-1.0
             },
             "text_length": int,
-            "cleaned_length": int
+            "cleaned_length": int,
+            "text_strategy": "full", "head_tail" ou "chunks",
+            "cached": bool,
+            "model": str,
+            "model_id": str,
+            "model_version": str,
+            "near_duplicate": {"id": str, "similarity": float} ou null,
+            "explanation": {"method": str, "unit": str, "terms": [...]}
+                (seulement avec "explain")
         }
+    
+    Le champ "cached" indique si le résultat provient du cache
+    (clé : texte normalisé + version du modèle). "model_id" et
+    "model_version" désignent le modèle qui a noté le texte : en mode
+    "cascade", le modèle rapide ou, si sa confiance était insuffisante,
+    le modèle coûteux ("cascade_escalated"). L'empreinte change après un
+    rechargement à chaud.
+    
+    Au-delà de MAX_TEXT_CHARS caractères, "text_strategy" indique la
+    partie du texte analysée ("analyzed_length" caractères, en "segments"
+    notés puis agrégés pour "chunks") ; avec LONG_TEXT_STRATEGY=reject,
+    le texte est refusé (413).
+    
+    Avec NEAR_DUPLICATE_ENABLED=1, un article très proche d'un article
+    récemment noté (reprise légèrement retouchée) reprend son verdict :
+    "near_duplicate" donne l'identifiant de cet article et la similarité
+    estimée. "force": true note l'article quoi qu'il arrive.
+    
+    "explain" renvoie les termes TF-IDF de l'article dont la contribution
+    (table calculée une fois par modèle) est la plus forte en valeur
+    absolue, orientée vers FAKE (positive) ou REAL (négative). Un article
+    à expliquer est toujours noté : ni cache, ni quasi-doublon.
     """
     
+    # Version servie pour toute la requête
+    bundle = registry.current
+    
     # Vérifier que les modèles sont chargés
-    if model is None or vectorizer is None:
+    if bundle.pipeline is None:
         return jsonify({
             "error": "Models not loaded",
             "message": "ML models failed to load. Please check server logs."
         }), 500
     
+    trace = g.trace
+    
     try:
         # 1. Récupérer les données de la requête
-        data = request.get_json()
+        with trace.stage('parse'):
+            data = request.get_json()
         
         # Vérifier que le champ 'text' existe
         if not data or 'text' not in data:
@@ -226,49 +772,93 @@ def predict():
                 "message": "Please provide at least 10 characters"
             }), 400
         
-        print(f"\n📝 Nouvelle requête reçue : {len(text)} caractères")
+        trace.annotate(text_length=len(text))
         
-        # 2. Nettoyer le texte
-        cleaned_text = clean_text(text)
+        # Modèle demandé (chargé au premier usage)
+        scorer, error = resolve_scorer(bundle, data.get('model'))
+        if error is not None:
+            return error
         
-        # Vérifier que le texte nettoyé n'est pas vide
-        if not cleaned_text or len(cleaned_text) < 5:
-            return jsonify({
-                "error": "Text cleaning resulted in empty string",
-                "message": "Text contains no meaningful content after preprocessing"
-            }), 400
+        # Notation complète demandée : ni cache, ni quasi-doublon
+        force = force_requested(data)
+        item_id = data.get('id')
+        
+        # Explication demandée : l'article est noté (le cache ne garde pas d'explication)
+        explain, error = explain_requested(data)
+        if error is not None:
+            return error
         
-        print(f"🧹 Texte nettoyé : {len(cleaned_text)} caractères")
+        # Résultat déjà calculé pour ce texte et ce modèle ?
+        key = None
+        if prediction_cache is not None:
+            with trace.stage('cache'):
+                key = cache_key(text, cache_namespace(scorer), long_text_policy.max_chars)
+                cached = None if force or explain else prediction_cache.get(key)
+            if cached is not None:
+                result = dict(cached, text_length=len(text), cached=True)
+                PREDICTIONS.inc(label=result['label'], cached=True)
+                trace.annotate(label=result['label'], cached=True)
+                with trace.stage('serialize'):
+                    response = jsonify(result)
+                return response, 200
         
-        # 3. Vectoriser le texte
-        text_vectorized = vectorizer.transform([cleaned_text])
-        print(f"🔢 Texte vectorisé : shape {text_vectorized.shape}")
+        # 2-4. Nettoyer, vectoriser et prédire (un seul passage dans le modèle),
+        # directement ou regroupé avec d'autres requêtes (micro-batching)
+        if batcher is not None:
+            try:
+                future = batcher.submit((text, scorer.name, force, item_id, explain))
+            except QueueFullError:
+                return jsonify({
+                    "error": "Server overloaded",
+                    "message": "Too many pending predictions, please retry later"
+                }), 503, {"Retry-After": "1"}
+            with trace.stage('batch'):
+                output, batch_bundle, batch_scorer = future.result(timeout=config.MICROBATCH_TIMEOUT)
+            # Lot noté par une version rechargée entre-temps
+            if batch_bundle is not bundle and batch_scorer is not None:
+                bundle, scorer = batch_bundle, batch_scorer
+                key = cache_key(text, cache_namespace(scorer), long_text_policy.max_chars) if key is not None else None
+        else:
+            output = bundle.pipeline.predict_texts(
+                [text], trace, scorer=scorer, explain=explain,
+                **near_duplicate_args(scorer, [item_id], force)
+            )[0]
         
-        # 4. Faire la prédiction
-        prediction = int(model.predict(text_vectorized)[0])
-        probabilities = model.predict_proba(text_vectorized)[0]
+        # Vérifier que le texte nettoyé n'est pas vide (texte trop long, modèle indisponible...)
+        if "error" in output:
+            error = {"error": output["error"], "message": output["message"]}
+            if "details" in output:
+                error["details"] = output["details"]
+            return jsonify(error), ERROR_STATUS.get(output["error_code"], 400)
         
         # 5. Préparer la réponse
-        result = {
-            "prediction": prediction,
-            "label": "FAKE" if prediction == 1 else "REAL",
-            "confidence": float(max(probabilities)),
-            "probabilities": {
-                "real": float(probabilities[0]),
-                "fake": float(probabilities[1])
-            },
-            "text_length": len(text),
-            "cleaned_length": len(cleaned_text),
-            "model": "Random Forest Optimized"
-        }
+        result = dict(output, **model_fields(output, bundle, scorer))
+        result.setdefault("near_duplicate", None)
+        
+        if key is not None:
+            prediction_cache.set(key, {k: v for k, v in result.items() if k != "explanation"})
+        result["cached"] = False
         
-        print(f"✅ Prédiction : {result['label']} (Confiance : {result['confidence']:.2%})")
-        print("-" * 60)
+        PREDICTIONS.inc(label=result['label'], cached=False)
+        trace.annotate(
+            cleaned_length=result['cleaned_length'],
+            text_strategy=result['text_strategy'],
+            label=result['label'],
+            confidence=round(result['confidence'], 4),
+            model=result['model_id'],
+            cached=False,
+            near_duplicate=result['near_duplicate'] is not None
+        )
         
-        return jsonify(result), 200
+        with trace.stage('serialize'):
+            response = jsonify(result)
+        return response, 200
+    
+    except RequestEntityTooLarge:
+        raise  # Corps trop volumineux : réponse 413 (request_too_large)
     
     except Exception as e:
-        print(f"❌ Erreur lors de la prédiction : {str(e)}")
+        trace.annotate(error=str(e))
         return jsonify({
             "error": "Internal server error",
             "message": "An error occurred during prediction",
@@ -276,6 +866,315 @@ def predict():
         }), 500
 
 
+@app.route('/predict/batch', methods=['POST'])
+def predict_batch():
+    """
+    Prédiction par lots : plusieurs articles en un seul appel
+    
+    Les textes valides sont nettoyés ensemble puis vectorisés en une seule
+    matrice creuse (un seul `transform`) et notés par un seul appel à
+    `predict_proba`. Les erreurs sont rapportées article par article.
+    
+    Body JSON:
+        {
+            "items": [
+                {"id": "article-1", "text": "..."},
+                {"text": "..."}
+            ]
+        }
+        ou plus simplement :
+        {
+            "texts": ["...", "..."]
+        }
+        avec, dans les deux cas, "model" optionnel ("forest", "linear" ou
+        "cascade") et "force" optionnel (noter sans chercher de
+        quasi-doublon) pour tout le lot
+    
+    Retourne JSON:
+        {
+            "results": [
+                {"index": 0, "id": "article-1", "prediction": 0 ou 1, "model_id": ..., ...},
+                {"index": 1, "id": null, "error": "...", "message": "..."}
+            ],
+            "count": int,
+            "succeeded": int,
+            "failed": int,
+            "model": str,
+            "model_version": str
+        }
+    
+    Les résultats sont renvoyés dans l'ordre des articles reçus. Avec
+    NEAR_DUPLICATE_ENABLED=1, le résultat d'un quasi-doublon d'un article
+    déjà noté porte "near_duplicate" ({"id", "similarity"}).
+    """
+    
+    # Version servie pour tout le lot
+    bundle = registry.current
+    
+    # Vérifier que les modèles sont chargés
+    if bundle.pipeline is None:
+        return jsonify({
+            "error": "Models not loaded",
+            "message": "ML models failed to load. Please check server logs."
+        }), 500
+    
+    trace = g.trace
+    
+    with trace.stage('parse'):
+        data = request.get_json(silent=True)
+    
+    # 1. Normaliser l'entrée en une liste de (id, texte)
+    if isinstance(data, dict) and isinstance(data.get('items'), list):
+        raw_items = data['items']
+    elif isinstance(data, dict) and isinstance(data.get('texts'), list):
+        raw_items = [{"text": text} for text in data['texts']]
+    else:
+        return jsonify({
+            "error": "Missing 'items' or 'texts' field in request",
+            "message": "Please provide a list of articles in 'items' or 'texts'"
+        }), 400
+    
+    if not raw_items:
+        return jsonify({
+            "error": "Empty batch",
+            "message": "Please provide at least one article"
+        }), 400
+    
+    # 2. Appliquer les limites configurées
+    if len(raw_items) > config.BATCH_MAX_ITEMS:
+        return jsonify({
+            "error": "Batch too large",
+            "message": f"A batch may contain at most {config.BATCH_MAX_ITEMS} articles"
+        }), 413
+    
+    total_chars = sum(
+        len(item['text']) for item in raw_items
+        if isinstance(item, dict) and isinstance(item.get('text'), str)
+    )
+    if total_chars > config.BATCH_MAX_TOTAL_CHARS:
+        return jsonify({
+            "error": "Batch payload too large",
+            "message": f"Total text size must not exceed {config.BATCH_MAX_TOTAL_CHARS} characters"
+        }), 413
+    
+    scorer, error = resolve_scorer(bundle, data.get('model'))
+    if error is not None:
+        return error
+    
+    try:
+        # 3. Valider, nettoyer puis noter tout le lot en un seul passage
+        texts = [item.get('text') if isinstance(item, dict) else None for item in raw_items]
+        ids = [item.get('id') if isinstance(item, dict) else None for item in raw_items]
+        outputs = bundle.pipeline.predict_texts(
+            texts, trace, scorer=scorer, **near_duplicate_args(scorer, ids, force_requested(data))
+        )
+        
+        results = []
+        valid_indices = []
+        for index, (item, output) in enumerate(zip(raw_items, outputs)):
+            item_id = item.get('id') if isinstance(item, dict) else None
+            results.append(dict(output, index=index, id=item_id))
+            if "error" not in output:
+                valid_indices.append(index)
+                PREDICTIONS.inc(label=output['label'], cached=False)
+        
+        trace.annotate(batch_size=len(raw_items), succeeded=len(valid_indices))
+        
+        with trace.stage('serialize'):
+            response = jsonify({
+                "results": results,
+                "count": len(results),
+                "succeeded": len(valid_indices),
+                "failed": len(results) - len(valid_indices),
+                "model": config.MODEL_LABELS.get(scorer.name, scorer.name),
+                "model_version": scorer.version
+            })
+        return response, 200
+    
+    except RequestEntityTooLarge:
+        raise  # Corps trop volumineux : réponse 413 (request_too_large)
+    
+    except Exception as e:
+        trace.annotate(error=str(e))
+        return jsonify({
+            "error": "Internal server error",
+            "message": "An error occurred during batch prediction",
+            "details": str(e)
+        }), 500
+
+
+def _read_ndjson_lines(stream, max_line_bytes):
+    """
+    Lire un flux NDJSON ligne par ligne sans le charger entièrement
+    
+    Yields:
+        tuple: (numéro de ligne, objet décodé ou None, erreur ou None)
+    """
+    line_number = 0
+    while True:
+        line = stream.readline(max_line_bytes + 1)
+        if not line:
+            return
+        line_number += 1
+        
+        # Ligne trop longue : la consommer jusqu'au saut de ligne et la rejeter
+        if len(line) > max_line_bytes and not line.endswith(b'\n'):
+            while line and not line.endswith(b'\n'):
+                line = stream.readline(max_line_bytes + 1)
+            yield line_number, None, ("Line too long", f"Each line must not exceed {max_line_bytes} bytes")
+            continue
+        
+        if not line.strip():
+            line_number -= 1
+            continue
+        
+        try:
+            yield line_number, json.loads(line), None
+        except ValueError:
+            yield line_number, None, ("Invalid JSON", "Each line must be a JSON object or string")
+
+
+@app.route('/predict/stream', methods=['POST'])
+def predict_stream():
+    """
+    Notation en flux pour de gros volumes (NDJSON → NDJSON)
+    
+    Le corps de la requête est lu ligne par ligne au fil de son arrivée.
+    Les articles sont traités par paquets de STREAM_CHUNK_SIZE (un seul
+    transform + predict_proba par paquet) et les résultats sont renvoyés
+    dès qu'un paquet est terminé : la mémoire reste bornée quelle que soit
+    la taille de l'archive.
+    
+    Paramètres (query string) : model=forest, linear ou cascade (optionnel),
+    force=1 (optionnel, noter sans chercher de quasi-doublon)
+    
+    Corps (application/x-ndjson), une ligne par article :
+        {"id": "article-1", "text": "..."}
+        "texte brut également accepté"
+    
+    Réponse (application/x-ndjson), une ligne par article, dans l'ordre :
+        {"line": 1, "id": "article-1", "prediction": 0 ou 1, "label": ..., ...}
+        {"line": 2, "id": null, "error": "...", "message": "..."}
+    puis une ligne de synthèse :
+        {"summary": {"count": int, "succeeded": int, "failed": int, "model_version": str}}
+    
+    Tout le flux est noté par la version servie à son ouverture, même si
+    le modèle est rechargé pendant le traitement.
+    """
+    
+    # Version servie pour tout le flux
+    bundle = registry.current
+    pipeline = bundle.pipeline
+    
+    # Vérifier que les modèles sont chargés
+    if pipeline is None:
+        return jsonify({
+            "error": "Models not loaded",
+            "message": "ML models failed to load. Please check server logs."
+        }), 500
+    
+    scorer, error = resolve_scorer(bundle, request.args.get('model'))
+    if error is not None:
+        return error
+    
+    chunk_size = config.STREAM_CHUNK_SIZE
+    force = force_requested(None)
+    stream = request.stream
+    
+    def score_chunk(chunk, counts):
+        # chunk : liste de (ligne, id, texte, erreur de lecture)
+        readable = [(item_id, text) for _, item_id, text, error in chunk if error is None]
+        outputs = iter(pipeline.predict_texts(
+            [text for _, text in readable], scorer=scorer,
+            **near_duplicate_args(scorer, [item_id for item_id, _ in readable], force)
+        ))
+        lines = []
+        for line_number, item_id, _, error in chunk:
+            if error is None:
+                output = next(outputs)
+            else:
+                output = {"error": error[0], "message": error[1]}
+            
+            counts["count"] += 1
+            if "error" in output:
+                counts["failed"] += 1
+            else:
+                counts["succeeded"] += 1
+                PREDICTIONS.inc(label=output['label'], cached=False)
+            lines.append(json.dumps(dict(output, line=line_number, id=item_id)) + '\n')
+        return ''.join(lines)
+    
+    def generate():
+        counts = {"count": 0, "succeeded": 0, "failed": 0}
+        chunk = []
+        
+        for line_number, obj, error in _read_ndjson_lines(stream, config.STREAM_MAX_LINE_BYTES):
+            item_id = obj.get('id') if isinstance(obj, dict) else None
+            text = obj.get('text') if isinstance(obj, dict) else obj
+            chunk.append((line_number, item_id, text, error))
+            
+            if len(chunk) >= chunk_size:
+                yield score_chunk(chunk, counts)
+                chunk = []
+        
+        if chunk:
+            yield score_chunk(chunk, counts)
+        
+        yield json.dumps({"summary": dict(counts, model_version=scorer.version)}) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
+# ============================================================
+# ADMINISTRATION (RECHARGEMENT À CHAUD DU MODÈLE)
+# ============================================================
+
+@app.route('/admin/reload', methods=['POST'])
+def admin_reload():
+    """
+    Recharger le modèle depuis les fichiers, sans redémarrer le serveur
+    
+    La nouvelle version est chargée et préchauffée pendant que l'ancienne
+    continue de répondre, puis mise en service d'un bloc ; le cache de
+    prédictions est invalidé. Réservé aux requêtes portant l'en-tête
+    "X-Admin-Token" égal à ADMIN_TOKEN (route désactivée sans ADMIN_TOKEN).
+    Avec plusieurs workers gunicorn, seul le worker qui répond est
+    rechargé : préférer MODEL_WATCH_INTERVAL.
+    
+    Paramètres (query string) :
+        force=1 : recharger même si l'empreinte des fichiers est inchangée
+    
+    Retourne JSON:
+        {
+            "reloaded": bool,
+            "version": str,
+            "previous_version": str,
+            "reason" ou "error": str (si rien n'a été remplacé)
+        }
+    """
+    if not config.ADMIN_TOKEN:
+        return jsonify({
+            "error": "Admin endpoints disabled",
+            "message": "Set ADMIN_TOKEN to enable /admin/reload"
+        }), 404
+    
+    if not hmac.compare_digest(request.headers.get('X-Admin-Token', ''), config.ADMIN_TOKEN):
+        return jsonify({
+            "error": "Forbidden",
+            "message": "Missing or invalid X-Admin-Token header"
+        }), 403
+    
+    force = request.args.get('force', '').lower() in ('1', 'true', 'yes')
+    outcome = registry.reload(force=force)
+    g.trace.annotate(**outcome)
+    
+    if outcome.get("error"):
+        return jsonify(outcome), 500
+    if outcome.get("reason") == "reload already in progress":
+        return jsonify(outcome), 409
+    return jsonify(outcome), 200
+
+
 # ============================================================
 # ROUTE DE TEST (OPTIONNEL)
 # ============================================================
@@ -285,19 +1184,21 @@ def test():
     """
     Route de test pour vérifier rapidement l'API
     """
-    test_text = "Breaking news! Scientists discovered shocking truth that doctors don't want you to know!"
+    test_text = SAMPLE_TEXT
+    bundle = registry.current
     
     try:
         cleaned = clean_text(test_text)
-        vectorized = vectorizer.transform([cleaned])
-        prediction = int(model.predict(vectorized)[0])
-        probs = model.predict_proba(vectorized)[0]
+        vectorized = bundle.text_vectorizer.transform([cleaned])
+        predictions, probabilities = bundle.scorer.score(vectorized)
+        result = bundle.scorer.result(predictions[0], probabilities[0])
         
         return jsonify({
             "test": "success",
             "sample_text": test_text[:50] + "...",
-            "prediction": "FAKE" if prediction == 1 else "REAL",
-            "confidence": float(max(probs)),
+            "prediction": result["label"],
+            "confidence": result["confidence"],
+            "model_version": bundle.version,
             "message": "API is working correctly"
         }), 200
     
@@ -308,6 +1209,42 @@ def test():
         }), 500
 
 
+# ============================================================
+# AUTO-TEST AU DÉMARRAGE
+# ============================================================
+
+def warmup():
+    """
+    Prédiction de préchauffage sur l'article d'exemple
+    
+    Charge paresseusement tout ce qui ne l'est pas encore (corpus WordNet,
+    caches, code NumPy/scikit-learn) pour que la première vraie requête
+    ne paie pas ce coût. Le cache de prédictions n'est pas utilisé.
+    
+    Returns:
+        bool: True si la chaîne complète nettoyage → vectorisation →
+            scoring fonctionne
+    """
+    bundle = registry.current
+    if bundle.pipeline is None or preprocessor is None:
+        print("⚠️  Auto-test ignoré : modèles ou préprocesseur non chargés")
+        return False
+    
+    try:
+        start = time.perf_counter()
+        result = sample_prediction(bundle)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"🔥 Auto-test OK : {result['label']} ({elapsed:.1f} ms)")
+        return True
+    except Exception as e:
+        print(f"❌ Auto-test échoué : {e}")
+        return False
+
+
+# Exécuté à l'import : avec gunicorn --preload, une seule fois dans le
+# master avant le fork (voir gunicorn.conf.py)
+warmup_ok = warmup() if config.WARMUP_ON_START else None
+
 # ============================================================
 # DÉMARRAGE DU SERVEUR
 # ============================================================
@@ -322,10 +1259,25 @@ if __name__ == '__main__':
     print(f"🔗 Endpoints disponibles :")
     print(f"   - GET  /         → Informations API")
     print(f"   - GET  /health   → Vérification santé")
+    print(f"   - GET  /stats    → Statistiques des caches")
+    print(f"   - GET  /metrics  → Métriques Prometheus")
     print(f"   - POST /predict  → Prédiction fake news")
+    print(f"   - POST /predict/batch → Prédiction par lots")
+    print(f"   - POST /predict/stream → Notation en flux (NDJSON)")
+    print(f"   - POST /admin/reload → Rechargement du modèle")
     print(f"   - GET  /test     → Test rapide")
     print("=" * 60 + "\n")
     
+    # Pool de nettoyage démarré avant la première requête
+    if parallel_cleaner is not None:
+        parallel_cleaner.start()
+    
+    # Surveillance des fichiers du modèle (MODEL_WATCH_INTERVAL)
+    registry.start_watching()
+    
+    # Index des quasi-doublons écrit à l'arrêt (NEAR_DUPLICATE_PATH)
+    atexit.register(save_near_duplicates)
+    
     # Lancer l'application
     app.run(
         host='0.0.0.0',        # Écouter sur toutes les interfaces
@@ -0,0 +1,291 @@
+"""
+Point d'entrée ASGI : service asynchrone de l'API
+
+Sous gunicorn en workers synchrones, un client lent qui envoie un gros
+texte immobilise un thread du worker pendant toute la réception. Ici la
+boucle asyncio reçoit les corps de requête sans bloquer ; seul le calcul
+(analyse JSON, nettoyage, vectorisation, scoring) part dans un pool de
+threads borné :
+
+- mêmes routes, mêmes réponses JSON : une fois son corps reçu, chaque
+  requête est traitée par l'application Flask (app.py) elle-même, appelée
+  comme application WSGI dans un thread du pool (instrumentation, cache,
+  micro-batching et quasi-doublons compris) ;
+- concurrence bornée : ASGI_WORKERS threads, ASGI_MAX_PENDING requêtes
+  admises (corps en réception, en attente d'un thread ou en cours) ; au-delà, réponse 503
+  immédiate avec Retry-After, sans lire le corps ni allonger la file ;
+- corps bornés : MAX_REQUEST_BYTES (413 dès l'en-tête Content-Length ou
+  dès le dépassement) et ASGI_BODY_TIMEOUT (408 pour un client trop lent) ;
+- /predict/stream (flux NDJSON de taille illimitée) reste servi par
+  `gunicorn app:app`.
+
+Lancement (depuis backend/) :
+    uvicorn asgi:app --host 0.0.0.0 --port 5000
+    gunicorn -c gunicorn.conf.py -k uvicorn.workers.UvicornWorker asgi:app
+"""
+
+import asyncio
+import io
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import config
+import app as api
+from instrumentation import METRICS
+
+# Routes non servies en ASGI (corps et réponse en flux)
+WSGI_ONLY_ROUTES = ('/predict/stream',)
+
+REJECTED = METRICS.counter(
+    'fnd_asgi_rejected_total', 'Requests rejected by the ASGI entry point before reaching the API',
+    ('reason',)
+)
+
+
+def _json_response(status, payload, headers=()):
+    """Réponse JSON construite hors de Flask (rejets avant traitement)"""
+    body = json.dumps(payload).encode('utf-8')
+    return status, [
+        (b'content-type', b'application/json'),
+        (b'content-length', str(len(body)).encode('latin-1')),
+        *headers
+    ], body
+
+
+class AsyncAPI:
+    """
+    Application ASGI qui délègue le traitement à l'application WSGI
+
+    Le compteur de requêtes admises n'est modifié que par la boucle
+    asyncio : pas de verrou.
+
+    Args:
+        wsgi_app: Application WSGI (Flask) traitant une requête complète
+        workers (int): Threads du pool de calcul
+        max_pending (int): Requêtes admises à la fois
+        max_body_bytes (int): Taille maximale d'un corps (0 = illimitée)
+        body_timeout (float): Durée maximale de réception d'un corps
+            en secondes (0 = illimitée)
+        retry_after (int): Valeur de l'en-tête Retry-After des 503
+        on_startup (callable): Appelé au démarrage du processus (lifespan)
+        on_shutdown (callable): Appelé à l'arrêt du processus (lifespan)
+    """
+
+    def __init__(self, wsgi_app, workers=2, max_pending=32, max_body_bytes=0, body_timeout=30.0,
+                 retry_after=1, on_startup=None, on_shutdown=None):
+        self.wsgi_app = wsgi_app
+        self.workers = max(1, workers)
+        self.max_pending = max(1, max_pending)
+        self.max_body_bytes = max_body_bytes
+        self.body_timeout = body_timeout
+        self.retry_after = str(retry_after).encode('latin-1')
+        self.on_startup = on_startup
+        self.on_shutdown = on_shutdown
+        self.pending = 0
+        self._executor = None
+        self._executor_pid = None
+
+    def executor(self):
+        """Pool de threads du processus courant (créé après un éventuel fork)"""
+        if self._executor_pid != os.getpid():
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='asgi-worker')
+            self._executor_pid = os.getpid()
+        return self._executor
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http':
+            await self._http(scope, receive, send)
+        elif scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+
+    # ------------------------------------------------------------
+    # Cycle de vie du processus
+    # ------------------------------------------------------------
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self.executor()
+                if self.on_startup is not None:
+                    self.on_startup()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if self.on_shutdown is not None:
+                    self.on_shutdown()
+                if self._executor is not None:
+                    self._executor.shutdown(wait=True)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    # ------------------------------------------------------------
+    # Requêtes HTTP
+    # ------------------------------------------------------------
+
+    def _overloaded(self):
+        REJECTED.inc(reason='overloaded')
+        return _json_response(503, {
+            "error": "Server overloaded",
+            "message": "Too many pending requests, please retry later"
+        }, [(b'retry-after', self.retry_after)])
+
+    def _too_large(self):
+        REJECTED.inc(reason='too_large')
+        return _json_response(413, {
+            "error": "Request too large",
+            "message": f"Request body must not exceed {self.max_body_bytes} bytes"
+        })
+
+    async def _read_body(self, scope, receive):
+        """
+        Recevoir le corps de la requête sans bloquer la boucle
+
+        Returns:
+            tuple: (corps, None) ou (None, réponse de rejet)
+        """
+        limit = self.max_body_bytes
+        for name, value in scope['headers']:
+            if name == b'content-length' and limit and value.isdigit() and int(value) > limit:
+                return None, self._too_large()
+
+        chunks, size = [], 0
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return None, None
+            chunk = message.get('body', b'')
+            size += len(chunk)
+            if limit and size > limit:
+                return None, self._too_large()
+            chunks.append(chunk)
+            if not message.get('more_body', False):
+                return b''.join(chunks), None
+
+    async def _http(self, scope, receive, send):
+        if scope['path'] in WSGI_ONLY_ROUTES:
+            response = _json_response(404, {
+                "error": "Not available",
+                "message": f"{scope['path']} is only served by the WSGI entry point (gunicorn app:app)"
+            })
+        elif self.pending >= self.max_pending:
+            # File pleine : refus immédiat, le corps n'est même pas lu
+            response = self._overloaded()
+        else:
+            # La place est réservée dès l'admission : les corps en cours de
+            # réception comptent (mémoire bornée à max_pending corps)
+            self.pending += 1
+            try:
+                try:
+                    body, response = await asyncio.wait_for(
+                        self._read_body(scope, receive), self.body_timeout or None
+                    )
+                except asyncio.TimeoutError:
+                    REJECTED.inc(reason='body_timeout')
+                    body, response = None, _json_response(408, {
+                        "error": "Request timeout",
+                        "message": "Request body was not received in time"
+                    })
+                if body is None and response is None:
+                    return  # Client déconnecté
+
+                if response is None:
+                    response = await self._dispatch(scope, body)
+            finally:
+                self.pending -= 1
+
+        status, headers, content = response
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': content})
+
+    async def _dispatch(self, scope, body):
+        """Traiter la requête admise dans le pool de threads"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor(), self._call_wsgi, _environ(scope, body))
+
+    def _call_wsgi(self, environ):
+        """Appeler l'application WSGI (thread du pool) et collecter la réponse"""
+        started = {}
+
+        def start_response(status, headers, exc_info=None):
+            started['status'] = int(status.split(' ', 1)[0])
+            started['headers'] = [
+                (name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers
+            ]
+
+        try:
+            iterable = self.wsgi_app(environ, start_response)
+            try:
+                content = b''.join(iterable)
+            finally:
+                if hasattr(iterable, 'close'):
+                    iterable.close()
+        except Exception as e:
+            return _json_response(500, {
+                "error": "Internal server error",
+                "message": "An error occurred while processing the request",
+                "details": str(e)
+            })
+        return started['status'], started['headers'], content
+
+
+def _environ(scope, body):
+    """Environnement WSGI d'une requête ASGI dont le corps a été reçu"""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', ''),
+        'PATH_INFO': scope['path'],
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'REMOTE_PORT': str(client[1]),
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False
+    }
+    for name, value in scope['headers']:
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if name == 'CONTENT_TYPE':
+            environ['CONTENT_TYPE'] = value
+        elif name != 'CONTENT_LENGTH':
+            key = f'HTTP_{name}'
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+def _startup():
+    """Pool de nettoyage et surveillance des modèles du processus (comme app.py)"""
+    if api.parallel_cleaner is not None:
+        api.parallel_cleaner.start()
+    api.registry.start_watching()
+
+
+def _shutdown():
+    """Écrire l'index des quasi-doublons (NEAR_DUPLICATE_PATH)"""
+    try:
+        api.save_near_duplicates()
+    except Exception as e:
+        print(f"⚠️  Index des quasi-doublons non écrit : {e}")
+
+
+app = AsyncAPI(
+    api.app,
+    workers=config.ASGI_WORKERS,
+    max_pending=config.ASGI_MAX_PENDING,
+    max_body_bytes=config.MAX_REQUEST_BYTES,
+    body_timeout=config.ASGI_BODY_TIMEOUT,
+    retry_after=config.ASGI_RETRY_AFTER,
+    on_startup=_startup,
+    on_shutdown=_shutdown
+)
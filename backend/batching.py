@@ -0,0 +1,129 @@
+"""
+Micro-batching des requêtes /predict
+
+Sous charge concurrente, chaque requête note un seul article alors que
+`transform` et `predict_proba` sont vectorisés. Le MicroBatcher regroupe
+les articles qui arrivent dans une courte fenêtre (quelques ms) ou jusqu'à
+une taille maximale, les traite en un seul appel, puis rend à chaque
+requête en attente son propre résultat.
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from instrumentation import METRICS
+
+BATCH_SIZE = METRICS.histogram(
+    'fnd_microbatch_size', 'Number of articles per micro-batch',
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+)
+QUEUE_DELAY = METRICS.histogram(
+    'fnd_microbatch_queue_delay_seconds', 'Time an article waits before its micro-batch starts',
+    buckets=(0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.25, 0.5, 1.0)
+)
+REJECTED = METRICS.counter(
+    'fnd_microbatch_rejected_total', 'Articles rejected because the micro-batch queue was full'
+)
+
+
+class QueueFullError(RuntimeError):
+    """La file du micro-batcher est pleine"""
+
+
+class MicroBatcher:
+    """
+    Regroupe des appels unitaires en lots
+
+    Un thread d'arrière-plan (démarré paresseusement dans chaque processus,
+    gunicorn --preload oblige) attend un premier article, puis collecte
+    les suivants jusqu'à `max_batch_size` articles ou jusqu'à `window_ms`
+    après l'arrivée du premier.
+
+    Args:
+        process_batch (callable): Liste d'articles → liste de résultats
+            (même longueur, même ordre)
+        max_batch_size (int): Taille maximale d'un lot
+        window_ms (float): Fenêtre de collecte en millisecondes
+        max_queue (int): Articles en attente au-delà desquels submit échoue
+    """
+
+    def __init__(self, process_batch, max_batch_size=32, window_ms=5.0, max_queue=10_000):
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.window = window_ms / 1000.0
+        self.max_queue = max_queue
+        self._queue = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = queue.Queue(self.max_queue)
+            threading.Thread(target=self._run, name='micro-batcher', daemon=True).start()
+            self._pid = os.getpid()
+
+    def submit(self, item):
+        """
+        Soumettre un article
+
+        Args:
+            item: Article transmis tel quel à `process_batch`
+
+        Returns:
+            Future: Résultat de l'article
+
+        Raises:
+            QueueFullError: Trop d'articles en attente
+        """
+        self._ensure_started()
+        future = Future()
+        try:
+            self._queue.put_nowait((item, future, time.perf_counter()))
+        except queue.Full:
+            REJECTED.inc()
+            raise QueueFullError("micro-batch queue is full")
+        return future
+
+    def _collect(self):
+        # Premier article : attente bloquante
+        batch = [self._queue.get()]
+        deadline = batch[0][2] + self.window
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    # Fenêtre écoulée : prendre ce qui est déjà arrivé
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+
+            BATCH_SIZE.observe(len(batch))
+            for _, _, enqueued in batch:
+                QUEUE_DELAY.observe(started - enqueued)
+
+            items = [item for item, _, _ in batch]
+            try:
+                results = self.process_batch(items)
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, future, _), result in zip(batch, results):
+                future.set_result(result)
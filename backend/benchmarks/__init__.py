@@ -0,0 +1,3 @@
+"""
+Benchmarks du backend (à lancer depuis backend/ : python -m benchmarks.<nom>)
+"""
@@ -0,0 +1,113 @@
+"""
+Benchmark des documents longs : latence selon la longueur et la stratégie
+
+Pour chaque longueur de document (10 Ko à 2 Mo), mesure le temps de
+nettoyage + vectorisation + scoring d'un article avec le texte entier
+("full") puis avec chaque stratégie de LongTextPolicy ("head_tail",
+"chunks"), et l'écart de probabilité FAKE par rapport au texte entier.
+
+Usage (depuis backend/, hors ligne) :
+    python -m benchmarks.bench_long_documents
+    python -m benchmarks.bench_long_documents --max-text-chars 50000 --output long.json
+"""
+
+import argparse
+import json
+
+from benchmarks.bench_pipeline import _prepare_models
+from benchmarks.common import (
+    DEFAULT_MODEL_PATH, DEFAULT_VECTORIZER_PATH,
+    synthetic_articles, measure, summarize
+)
+
+DOC_SIZES = (10_000, 50_000, 200_000, 500_000, 2_000_000)
+STRATEGIES = ('full', 'head_tail', 'chunks')
+
+
+def _int_list(value):
+    return [int(item) for item in value.split(',') if item]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark latency versus document length")
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--vectorizer', default=DEFAULT_VECTORIZER_PATH)
+    parser.add_argument('--stand-in', action='store_true', help="use a tiny in-memory forest")
+    parser.add_argument('--doc-sizes', type=_int_list, default=list(DOC_SIZES))
+    parser.add_argument('--max-text-chars', type=int, default=100_000)
+    parser.add_argument('--segment-chars', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--output', help="write results as JSON")
+    args = parser.parse_args()
+
+    args.batch_sizes = [1]
+    _prepare_models(args)
+
+    import app as backend
+    from long_text import LongTextPolicy
+    from pipeline import InferencePipeline
+
+    bundle = backend.registry.current
+    if bundle.pipeline is None or backend.preprocessor is None:
+        raise SystemExit("Models and NLTK data (stopwords, wordnet) are required: see backend/README.md")
+
+    def pipeline_for(strategy):
+        policy = None
+        if strategy != 'full':
+            policy = LongTextPolicy(args.max_text_chars, strategy, args.segment_chars)
+        base = bundle.pipeline
+        return InferencePipeline(
+            base.clean, base.vectorizer, base.scorer,
+            clean_many=base.clean_many,
+            tokenize=backend.clean_words if base.fused else None,
+            tokens_many=base.tokens_many if base.fused else None,
+            long_text=policy
+        )
+
+    pipelines = {strategy: pipeline_for(strategy) for strategy in STRATEGIES}
+
+    results = []
+    print(f"Limite : {args.max_text_chars} caractères, segments de {args.segment_chars}")
+    print(f"{'taille':>10}{'stratégie':>11}{'p50 (ms)':>11}{'p95 (ms)':>11}"
+          f"{'analysés':>11}{'P(fake)':>9}{'écart':>9}")
+
+    for chars in args.doc_sizes:
+        text = synthetic_articles(bundle.vectorizer, 1, chars, seed=chars)[0]
+        # Moins de répétitions pour les documents les plus longs
+        repeat = max(2, min(args.repeat, args.repeat * 100_000 // chars))
+
+        reference = None
+        for strategy in STRATEGIES:
+            pipeline = pipelines[strategy]
+            output = pipeline.predict_texts([text])[0]
+            p_fake = output['probabilities']['fake']
+            if reference is None:
+                reference = output
+
+            stats = summarize(measure(lambda: pipeline.predict_texts([text]), repeat, warmup=1))
+            stats.update({
+                "doc_chars": chars,
+                "strategy": strategy,
+                "applied": output['text_strategy'],
+                "analyzed_chars": output.get('analyzed_length', chars),
+                "p_fake": p_fake,
+                "p_fake_delta": p_fake - reference['probabilities']['fake'],
+                "label_matches_full": output['prediction'] == reference['prediction'],
+                "repeat": repeat
+            })
+            results.append(stats)
+            print(f"{chars:>10}{strategy:>11}{stats['p50_ms']:>11.1f}{stats['p95_ms']:>11.1f}"
+                  f"{stats['analyzed_chars']:>11}{p_fake:>9.3f}{stats['p_fake_delta']:>+9.3f}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({
+                "max_text_chars": args.max_text_chars,
+                "segment_chars": args.segment_chars,
+                "results": results
+            }, f, indent=2)
+        print(f"\nRésultats écrits dans {args.output}")
+
+
+if __name__ == '__main__':
+    main()
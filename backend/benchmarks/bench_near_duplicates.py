@@ -0,0 +1,111 @@
+"""
+Benchmark de l'index des quasi-doublons : latence de recherche selon la
+taille de l'index
+
+Pour chaque taille (1 000 à 100 000 articles), remplit un
+NearDuplicateIndex d'articles synthétiques (mots du vocabulaire TF-IDF,
+comme les mots nettoyés), puis mesure la recherche d'une reprise
+retouchée d'un article indexé (hit) et d'un article inconnu (miss), ainsi
+que la mémoire occupée. Le calcul de la signature, indépendant de la
+taille, est mesuré à part.
+
+Usage (depuis backend/, hors ligne, sans données NLTK) :
+    python -m benchmarks.bench_near_duplicates
+    python -m benchmarks.bench_near_duplicates --sizes 1000,20000 --output near_dup.json
+"""
+
+import argparse
+import json
+import random
+import tracemalloc
+
+from benchmarks.common import DEFAULT_VECTORIZER_PATH, load_pickle, measure, summarize
+from near_duplicates import NearDuplicateIndex
+
+INDEX_SIZES = (1_000, 10_000, 20_000, 50_000, 100_000)
+
+
+def _int_list(value):
+    return [int(item) for item in value.split(',') if item]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark near-duplicate lookup latency versus index size")
+    parser.add_argument('--vectorizer', default=DEFAULT_VECTORIZER_PATH)
+    parser.add_argument('--sizes', type=_int_list, default=list(INDEX_SIZES))
+    parser.add_argument('--words', type=int, default=300, help="cleaned words per article")
+    parser.add_argument('--edit-rate', type=float, default=0.01, help="fraction of words replaced in a repost")
+    parser.add_argument('--threshold', type=float, default=0.85)
+    parser.add_argument('--repeat', type=int, default=500)
+    parser.add_argument('--output', help="write results as JSON")
+    args = parser.parse_args()
+
+    vectorizer = load_pickle(args.vectorizer)
+    vocabulary = sorted({word for term in vectorizer.vocabulary_ for word in term.split()})
+    rng = random.Random(0)
+
+    def article():
+        return [rng.choice(vocabulary) for _ in range(args.words)]
+
+    def repost(words):
+        words = list(words)
+        for _ in range(max(1, int(len(words) * args.edit_rate))):
+            words[rng.randrange(len(words))] = rng.choice(vocabulary)
+        return words
+
+    probe = article()
+    index = NearDuplicateIndex(maxsize=1, threshold=args.threshold)
+    signature_stats = summarize(measure(lambda: index.signature(probe), args.repeat))
+    print(f"Signature ({args.words} mots) : p50 {signature_stats['p50_ms'] * 1000:.1f} µs, "
+          f"p95 {signature_stats['p95_ms'] * 1000:.1f} µs")
+
+    results = []
+    print(f"{'taille':>9}{'hit p50 (µs)':>14}{'hit p95':>9}{'miss p50 (µs)':>15}{'miss p95':>10}"
+          f"{'reconnus':>10}{'mémoire (Mo)':>14}")
+
+    for size in args.sizes:
+        tracemalloc.start()
+        index = NearDuplicateIndex(maxsize=size, threshold=args.threshold)
+        originals = []
+        for position in range(size):
+            words = article()
+            if position < 100:
+                originals.append((f"a{position}", words))
+            index.add(f"a{position}", index.signature(words), 'bench', {"label": "FAKE"})
+        memory = tracemalloc.get_traced_memory()[0] / 1e6
+        tracemalloc.stop()
+
+        reposts = [(item_id, index.signature(repost(words))) for item_id, words in originals]
+        found = sum(
+            1 for item_id, signature in reposts
+            if (index.lookup(signature, 'bench') or {}).get('near_duplicate', {}).get('id') == item_id
+        )
+        unknown = index.signature(article())
+
+        hit = summarize(measure(lambda: index.lookup(reposts[0][1], 'bench'), args.repeat))
+        miss = summarize(measure(lambda: index.lookup(unknown, 'bench'), args.repeat))
+        results.append({
+            "index_size": size,
+            "hit": hit,
+            "miss": miss,
+            "reposts_found": found / len(reposts),
+            "memory_mb": memory
+        })
+        print(f"{size:>9}{hit['p50_ms'] * 1000:>14.1f}{hit['p95_ms'] * 1000:>9.1f}"
+              f"{miss['p50_ms'] * 1000:>15.1f}{miss['p95_ms'] * 1000:>10.1f}"
+              f"{found / len(reposts):>10.0%}{memory:>14.1f}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({
+                "words": args.words,
+                "edit_rate": args.edit_rate,
+                "threshold": args.threshold,
+                "signature": signature_stats,
+                "results": results
+            }, f, indent=2)
+        print(f"\nRésultats écrits dans {args.output}")
+
+
+if __name__ == '__main__':
+    main()
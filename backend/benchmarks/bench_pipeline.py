@@ -0,0 +1,221 @@
+"""
+Benchmark du pipeline d'inférence : nettoyage, vectorisation, scoring et
+aller-retour HTTP complet (client de test Flask)
+
+Mesure chaque étape sur des articles synthétiques de plusieurs tailles
+(du tweet au document de 50 Ko) et pour des lots de 1 à 1024 articles.
+Rapporte p50/p95/p99 par appel et le débit en articles/seconde, et écrit
+un fichier JSON comparable d'une exécution à l'autre.
+
+Usage (depuis backend/, hors ligne) :
+    python -m benchmarks.bench_pipeline --output bench_before.json
+    python -m benchmarks.bench_pipeline --output bench_after.json --compare bench_before.json
+    python -m benchmarks.bench_pipeline --quick --stand-in
+
+Sans models/random_forest_optimized.pkl, un petit modèle de substitution
+est entraîné en mémoire (--stand-in pour le forcer). Les données NLTK
+(stopwords, wordnet) doivent être installées localement.
+"""
+
+import argparse
+import json
+import os
+import pickle
+import platform
+import sys
+import tempfile
+import time
+
+from benchmarks.common import (
+    DEFAULT_MODEL_PATH, DEFAULT_VECTORIZER_PATH,
+    load_pickle, build_stand_in, synthetic_articles, measure, summarize
+)
+
+DOC_SIZES = (280, 1_000, 5_000, 20_000, 50_000)
+BATCH_SIZES = (1, 8, 64, 256, 1024)
+STAGES = ('clean', 'vectorize', 'score', 'roundtrip')
+
+# Volume de texte maximal traité par appel mesuré : au-delà, la combinaison
+# (taille, lot) est ignorée pour garder une durée d'exécution raisonnable
+DEFAULT_MAX_CHARS_PER_CALL = 5_000_000
+
+
+def _prepare_models(args):
+    """Charger les modèles (ou le substitut) et préparer l'environnement de l'app"""
+    vectorizer = load_pickle(args.vectorizer) if os.path.exists(args.vectorizer) else None
+    use_stand_in = args.stand_in or not os.path.exists(args.model) or vectorizer is None
+
+    if use_stand_in:
+        model, vectorizer = build_stand_in(vectorizer)
+        workdir = tempfile.mkdtemp(prefix='bench-models-')
+        args.model = os.path.join(workdir, 'stand_in_model.pkl')
+        args.vectorizer = os.path.join(workdir, 'stand_in_vectorizer.pkl')
+        with open(args.model, 'wb') as f:
+            pickle.dump(model, f)
+        with open(args.vectorizer, 'wb') as f:
+            pickle.dump(vectorizer, f)
+    else:
+        model = load_pickle(args.model)
+
+    # L'app lit sa configuration à l'import : mêmes modèles que le benchmark,
+    # pas de cache de prédictions (il fausserait les mesures), journal coupé
+    os.environ.update({
+        'MODEL_PATH': args.model,
+        'VECTORIZER_PATH': args.vectorizer,
+        'PREDICTION_CACHE_BACKEND': 'none',
+        'LOG_SAMPLE_RATE': '0',
+        'BATCH_MAX_ITEMS': str(max(args.batch_sizes)),
+        'BATCH_MAX_TOTAL_CHARS': str(max(args.batch_sizes) * max(args.doc_sizes) * 2),
+    })
+    return model, vectorizer, use_stand_in
+
+
+def _roundtrip(client, texts):
+    """Un appel HTTP : /predict pour un article, /predict/batch sinon"""
+    if len(texts) == 1:
+        response = client.post('/predict', json={'text': texts[0]})
+    else:
+        response = client.post('/predict/batch', json={'texts': texts})
+    if response.status_code != 200:
+        raise RuntimeError(f"HTTP {response.status_code}: {response.get_data(as_text=True)[:200]}")
+    return response
+
+
+def run(args):
+    """
+    Exécuter toutes les combinaisons étape × taille × lot
+
+    Returns:
+        dict: {"meta": ..., "results": [...]}
+    """
+    model, vectorizer, use_stand_in = _prepare_models(args)
+
+    import sklearn
+    import app as backend
+
+    if backend.preprocessor is None:
+        sys.exit("NLTK data (stopwords, wordnet) is required: see backend/README.md")
+
+    client = backend.app.test_client()
+    preprocessor = backend.preprocessor
+    text_vectorizer = backend.registry.current.text_vectorizer
+    scorer = backend.registry.current.scorer
+
+    results = []
+    print(f"{'étape':<11}{'taille':>8}{'lot':>6}{'p50 (ms)':>11}{'p95 (ms)':>11}"
+          f"{'p99 (ms)':>11}{'articles/s':>13}")
+
+    for chars in args.doc_sizes:
+        for batch_size in args.batch_sizes:
+            if chars * batch_size > args.max_chars_per_call:
+                continue
+
+            texts = synthetic_articles(vectorizer, batch_size, chars, seed=chars + batch_size)
+            cleaned = preprocessor.clean_many(texts)
+            matrix = text_vectorizer.transform(cleaned)
+
+            # Moins de répétitions pour les appels les plus lourds
+            repeat = max(3, min(args.repeat, args.max_chars_per_call * 4 // (chars * batch_size)))
+
+            calls = {
+                'clean': lambda: preprocessor.clean_many(texts),
+                'vectorize': lambda: text_vectorizer.transform(cleaned),
+                'score': lambda: scorer.score(matrix),
+                'roundtrip': lambda: _roundtrip(client, texts),
+            }
+            for stage in args.stages:
+                stats = summarize(measure(calls[stage], repeat, warmup=1), items_per_call=batch_size)
+                stats.update({"stage": stage, "doc_chars": chars, "batch_size": batch_size, "repeat": repeat})
+                results.append(stats)
+                print(f"{stage:<11}{chars:>8}{batch_size:>6}{stats['p50_ms']:>11.3f}"
+                      f"{stats['p95_ms']:>11.3f}{stats['p99_ms']:>11.3f}{stats['throughput']:>13.1f}")
+
+    return {
+        "meta": {
+            "timestamp": time.strftime('%Y-%m-%dT%H:%M:%S'),
+            "python": platform.python_version(),
+            "sklearn": sklearn.__version__,
+            "platform": platform.platform(),
+            "model": type(model).__name__,
+            "stand_in": use_stand_in,
+            "engine": type(scorer.model).__name__,
+            "vectorizer": type(text_vectorizer).__name__,
+        },
+        "results": results
+    }
+
+
+def compare(current, baseline_path, tolerance):
+    """
+    Comparer les p50 à une exécution précédente
+
+    Returns:
+        int: Nombre de régressions (p50 plus lent de plus de `tolerance`)
+    """
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    def index(report):
+        return {(r['stage'], r['doc_chars'], r['batch_size']): r for r in report['results']}
+
+    before, after = index(baseline), index(current)
+    regressions = 0
+    print(f"\nComparaison avec {baseline_path} (p50, seuil {tolerance:.0%})")
+    print(f"{'étape':<11}{'taille':>8}{'lot':>6}{'avant':>11}{'après':>11}{'écart':>9}")
+    for key in sorted(before.keys() & after.keys()):
+        old, new = before[key]['p50_ms'], after[key]['p50_ms']
+        change = (new - old) / old if old else 0.0
+        flag = ''
+        if change > tolerance:
+            regressions += 1
+            flag = '  ⚠️'
+        stage, chars, batch_size = key
+        print(f"{stage:<11}{chars:>8}{batch_size:>6}{old:>11.3f}{new:>11.3f}{change:>+9.1%}{flag}")
+    print(f"{regressions} régression(s)")
+    return regressions
+
+
+def _int_list(value):
+    return [int(item) for item in value.split(',') if item]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the backend inference pipeline")
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--vectorizer', default=DEFAULT_VECTORIZER_PATH)
+    parser.add_argument('--stand-in', action='store_true', help="use a tiny in-memory forest")
+    parser.add_argument('--doc-sizes', type=_int_list, default=list(DOC_SIZES))
+    parser.add_argument('--batch-sizes', type=_int_list, default=list(BATCH_SIZES))
+    parser.add_argument('--stages', type=lambda v: v.split(','), default=list(STAGES))
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--max-chars-per-call', type=int, default=DEFAULT_MAX_CHARS_PER_CALL)
+    parser.add_argument('--quick', action='store_true', help="small grid for a fast check")
+    parser.add_argument('--output', help="write results as JSON")
+    parser.add_argument('--compare', help="baseline JSON to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.10)
+    parser.add_argument('--fail-on-regression', action='store_true')
+    args = parser.parse_args()
+
+    unknown = set(args.stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+    if args.quick:
+        args.doc_sizes = [280, 5_000]
+        args.batch_sizes = [1, 64]
+        args.repeat = min(args.repeat, 10)
+
+    report = run(args)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nRésultats écrits dans {args.output}")
+
+    if args.compare:
+        regressions = compare(report, args.compare, args.tolerance)
+        if regressions and args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Microbenchmark : predict + predict_proba (deux passes) contre ModelScorer
+(une passe), et contre le moteur compilé (forêt) ou le moteur linéaire
+creux (régression logistique)
+
+Usage (depuis backend/) :
+    python -m benchmarks.bench_scoring
+    python -m benchmarks.bench_scoring --model models/fake_news_model.pkl --repeat 500
+"""
+
+import argparse
+
+import numpy as np
+
+from benchmarks.common import (
+    DEFAULT_MODEL_PATH, DEFAULT_VECTORIZER_PATH,
+    load_pickle, vocabulary_documents, measure, summarize
+)
+from scoring import ModelScorer
+from forest_engine import CompiledForest
+from linear_engine import SparseLinearModel
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--vectorizer', default=DEFAULT_VECTORIZER_PATH)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    model = load_pickle(args.model)
+    vectorizer = load_pickle(args.vectorizer)
+    scorer = ModelScorer(model)
+
+    X = vectorizer.transform(vocabulary_documents(vectorizer, 1))
+
+    def two_passes():
+        prediction = model.predict(X)[0]
+        probabilities = model.predict_proba(X)[0]
+        return prediction, probabilities
+
+    def one_pass():
+        predictions, probabilities = scorer.score(X)
+        return predictions[0], probabilities[0]
+
+    # Les deux chemins doivent donner exactement le même résultat
+    reference, candidate = two_passes(), one_pass()
+    assert reference[0] == candidate[0]
+    assert np.array_equal(reference[1], candidate[1])
+
+    paths = [("predict + predict_proba", two_passes), ("ModelScorer.score", one_pass)]
+
+    # Moteur compilé (forêts uniquement)
+    try:
+        compiled_scorer = ModelScorer(CompiledForest.from_sklearn(model))
+    except TypeError:
+        compiled_scorer = None
+    if compiled_scorer is not None:
+        assert np.allclose(compiled_scorer.predict_proba(X), model.predict_proba(X), rtol=0, atol=1e-9)
+        paths.append(("CompiledForest", lambda: compiled_scorer.score(X)))
+
+    # Moteur linéaire creux (régression logistique binaire) : parité exacte
+    if SparseLinearModel.supports(model):
+        linear_scorer = ModelScorer(SparseLinearModel.from_sklearn(model))
+        assert np.array_equal(linear_scorer.predict_proba(X), model.predict_proba(X))
+        paths.append(("SparseLinearModel", lambda: linear_scorer.score(X)))
+        paths.append(("SparseLinearModel.proba", lambda: linear_scorer.predict_proba(X)))
+
+    print(f"Modèle : {type(model).__name__} ({args.model}), 1 article par appel")
+    print(f"{'chemin':<28}{'p50 (ms)':>10}{'p95 (ms)':>10}{'p99 (ms)':>10}")
+    results = {}
+    for name, func in paths:
+        results[name] = summarize(measure(func, args.repeat))
+        stats = results[name]
+        print(f"{name:<28}{stats['p50_ms']:>10.3f}{stats['p95_ms']:>10.3f}{stats['p99_ms']:>10.3f}")
+
+    for name in list(results)[1:]:
+        speedup = results["predict + predict_proba"]["p50_ms"] / results[name]["p50_ms"]
+        print(f"Gain médian ({name}) : x{speedup:.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,248 @@
+"""
+Test de charge : service Flask (gunicorn gthread) vs service ASGI (asgi.py)
+
+Démarre successivement les deux services avec la même configuration
+gunicorn (gunicorn.conf.py, mêmes workers), puis envoie pendant
+`--duration` secondes :
+
+- `--concurrency` clients rapides qui enchaînent des POST /predict
+  (connexions keep-alive, articles synthétiques de `--chars` caractères) ;
+- `--slow-clients` clients lents qui envoient chacun un article de
+  `--slow-chars` caractères à `--slow-rate` octets/seconde, en boucle
+  (connexions mobiles, uploads de gros textes).
+
+Rapporte le débit et la latence p50/p95/p99 des clients rapides, les
+réponses 503 (contre-pression) et les autres erreurs, et les envois lents
+aboutis. Le cache de prédictions est désactivé.
+
+Usage (depuis backend/, données NLTK installées) :
+    python -m benchmarks.bench_serving
+    python -m benchmarks.bench_serving --slow-clients 0 --concurrency 32 --output serving.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+import numpy as np
+
+from benchmarks.common import (
+    DEFAULT_MODEL_PATH, DEFAULT_VECTORIZER_PATH, load_pickle, build_stand_in, synthetic_articles
+)
+
+SERVERS = {
+    'flask': [],
+    'asgi': ['-k', 'uvicorn.workers.UvicornWorker'],
+}
+MODULES = {'flask': 'app:app', 'asgi': 'asgi:app'}
+
+
+# ============================================================
+# CLIENT HTTP/1.1 MINIMAL (asyncio)
+# ============================================================
+
+def _request_head(path, length):
+    return (
+        f"POST {path} HTTP/1.1\r\nHost: bench\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {length}\r\n\r\n"
+    ).encode('latin-1')
+
+
+async def _read_response(reader):
+    """Lire une réponse (statut, en-têtes, corps de longueur Content-Length)"""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("connection closed by server")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    await reader.readexactly(int(headers.get('content-length', 0)))
+    return int(status_line.split()[1]), headers
+
+
+async def _fast_client(port, bodies, offset, deadline, results):
+    """Enchaîner des POST /predict sur une connexion keep-alive"""
+    reader = writer = None
+    position = offset
+    while time.perf_counter() < deadline:
+        body = bodies[position % len(bodies)]
+        position += 1
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            start = time.perf_counter()
+            writer.write(_request_head('/predict', len(body)) + body)
+            await writer.drain()
+            status, headers = await _read_response(reader)
+            results.append((status, time.perf_counter() - start))
+            if headers.get('connection', '').lower() == 'close':
+                writer.close()
+                writer = None
+            if status == 503:
+                await asyncio.sleep(0.05)  # Contre-pression : pause brève avant de réessayer
+        except (ConnectionError, asyncio.IncompleteReadError, OSError):
+            results.append((None, 0.0))
+            writer = None
+            await asyncio.sleep(0.05)
+    if writer is not None:
+        writer.close()
+
+
+async def _slow_client(port, body, rate, deadline, completed):
+    """Envoyer un gros article lentement, en boucle (une connexion par envoi)"""
+    step = max(1, int(rate / 10))
+    while time.perf_counter() < deadline:
+        try:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(_request_head('/predict', len(body)))
+            for start in range(0, len(body), step):
+                writer.write(body[start:start + step])
+                await writer.drain()
+                await asyncio.sleep(0.1)
+            status, _ = await _read_response(reader)
+            completed.append(status)
+            writer.close()
+        except (ConnectionError, asyncio.IncompleteReadError, OSError):
+            completed.append(None)
+            await asyncio.sleep(0.1)
+
+
+async def _load(port, args, bodies, slow_body):
+    deadline = time.perf_counter() + args.duration
+    results, completed = [], []
+    tasks = [
+        _fast_client(port, bodies, index * 7, deadline, results) for index in range(args.concurrency)
+    ] + [
+        _slow_client(port, slow_body, args.slow_rate, deadline, completed) for _ in range(args.slow_clients)
+    ]
+    start = time.perf_counter()
+    await asyncio.gather(*tasks)
+    return results, completed, time.perf_counter() - start
+
+
+# ============================================================
+# SERVEURS
+# ============================================================
+
+def _start_server(name, port, env):
+    command = [
+        sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '-b', f'127.0.0.1:{port}',
+        *SERVERS[name], MODULES[name]
+    ]
+    process = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    for _ in range(600):
+        if process.poll() is not None:
+            sys.exit(f"{name} server exited with code {process.returncode}")
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/health', timeout=1)
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    sys.exit(f"{name} server did not start")
+
+
+def _server_env(args):
+    model_path = args.model
+    if not os.path.exists(model_path):
+        # Sans random_forest_optimized.pkl : substitut entraîné en mémoire
+        model, _ = build_stand_in(load_pickle(args.vectorizer))
+        model_path = os.path.join(tempfile.mkdtemp(prefix='bench-models-'), 'stand_in_model.pkl')
+        with open(model_path, 'wb') as f:
+            pickle.dump(model, f)
+
+    return dict(
+        os.environ,
+        MODEL_PATH=model_path,
+        VECTORIZER_PATH=args.vectorizer,
+        PREDICTION_CACHE_BACKEND='none',
+        LOG_SAMPLE_RATE='0',
+        WEB_CONCURRENCY=str(args.workers),
+        GUNICORN_THREADS=str(args.threads),
+        ASGI_WORKERS=str(args.threads),
+        ASGI_MAX_PENDING=str(args.max_pending)
+    )
+
+
+def _summarize(results, completed, elapsed):
+    latencies = np.array([duration for status, duration in results if status == 200])
+    p50, p95, p99 = (np.percentile(latencies, [50, 95, 99]) * 1000) if len(latencies) else (np.nan,) * 3
+    return {
+        "requests_ok": int(len(latencies)),
+        "throughput": float(len(latencies) / elapsed),
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "rejected_503": sum(1 for status, _ in results if status == 503),
+        "errors": sum(1 for status, _ in results if status not in (200, 503)),
+        "slow_uploads_ok": sum(1 for status in completed if status == 200),
+        "slow_uploads_failed": sum(1 for status in completed if status != 200)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test: Flask (gthread) vs ASGI entry point")
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--vectorizer', default=DEFAULT_VECTORIZER_PATH)
+    parser.add_argument('--servers', default='flask,asgi')
+    parser.add_argument('--duration', type=float, default=20.0)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--chars', type=int, default=2_000)
+    parser.add_argument('--slow-clients', type=int, default=4)
+    parser.add_argument('--slow-chars', type=int, default=50_000)
+    parser.add_argument('--slow-rate', type=int, default=20_000, help="bytes/second per slow client")
+    parser.add_argument('--workers', type=int, default=1, help="gunicorn workers (both servers)")
+    parser.add_argument('--threads', type=int, default=2, help="GUNICORN_THREADS and ASGI_WORKERS")
+    parser.add_argument('--max-pending', type=int, default=32, help="ASGI_MAX_PENDING")
+    parser.add_argument('--port', type=int, default=5890)
+    parser.add_argument('--output', help="write results as JSON")
+    args = parser.parse_args()
+
+    vectorizer = load_pickle(args.vectorizer)
+    articles = synthetic_articles(vectorizer, 200, args.chars, seed=1)
+    bodies = [json.dumps({"text": article}).encode('utf-8') for article in articles]
+    slow_body = json.dumps({"text": synthetic_articles(vectorizer, 1, args.slow_chars, seed=2)[0]}).encode('utf-8')
+    env = _server_env(args)
+
+    results = {}
+    print(f"{args.concurrency} clients rapides ({args.chars} caractères), {args.slow_clients} clients lents "
+          f"({len(slow_body)} octets à {args.slow_rate} o/s), {args.duration:g} s par service\n")
+    print(f"{'service':<8}{'req/s':>9}{'p50 (ms)':>10}{'p95':>9}{'p99':>9}{'503':>7}{'erreurs':>9}{'lents OK':>10}")
+
+    for offset, name in enumerate(args.servers.split(',')):
+        port = args.port + offset
+        process = _start_server(name, port, env)
+        try:
+            # Préchauffage (premières requêtes, connexions)
+            asyncio.run(_load(port, argparse.Namespace(
+                duration=1.0, concurrency=2, slow_clients=0, slow_rate=args.slow_rate
+            ), bodies, slow_body))
+            summary = _summarize(*asyncio.run(_load(port, args, bodies, slow_body)))
+        finally:
+            process.terminate()
+            process.wait()
+
+        results[name] = summary
+        print(f"{name:<8}{summary['throughput']:>9.1f}{summary['p50_ms']:>10.1f}{summary['p95_ms']:>9.1f}"
+              f"{summary['p99_ms']:>9.1f}{summary['rejected_503']:>7}{summary['errors']:>9}"
+              f"{summary['slow_uploads_ok']:>10}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"params": {k: v for k, v in vars(args).items() if k != 'output'}, "results": results}, f, indent=2)
+        print(f"\nRésultats écrits dans {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+"""
+Outils communs aux benchmarks : chargement des modèles, données synthétiques,
+statistiques de latence
+"""
+
+import os
+import pickle
+import random
+import time
+import warnings
+
+import numpy as np
+
+DEFAULT_MODEL_PATH = os.path.join('models', 'random_forest_optimized.pkl')
+DEFAULT_VECTORIZER_PATH = os.path.join('models', 'tfidf_vectorizer.pkl')
+
+
+def load_pickle(path):
+    """Charger un fichier .pkl (les avertissements de version sklearn sont masqués)"""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+
+def vocabulary_documents(vectorizer, count, words_per_doc=200, seed=0):
+    """
+    Générer des documents déjà nettoyés à partir du vocabulaire TF-IDF
+
+    Ne nécessite pas les données NLTK : utile pour mesurer la vectorisation
+    et le modèle indépendamment du nettoyage.
+    """
+    rng = random.Random(seed)
+    words = sorted({word for term in vectorizer.vocabulary_ for word in term.split()})
+    return [' '.join(rng.choices(words, k=words_per_doc)) for _ in range(count)]
+
+
+def measure(func, repeat, warmup=3):
+    """
+    Mesurer la latence d'un appel
+
+    Returns:
+        np.ndarray: Durées en secondes
+    """
+    for _ in range(warmup):
+        func()
+    durations = np.empty(repeat)
+    for i in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations[i] = time.perf_counter() - start
+    return durations
+
+
+def summarize(durations, items_per_call=1):
+    """
+    Résumer une série de durées
+
+    Returns:
+        dict: p50/p95/p99 en millisecondes et débit en articles/seconde
+    """
+    p50, p95, p99 = np.percentile(durations, [50, 95, 99]) * 1000
+    return {
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "mean_ms": float(durations.mean() * 1000),
+        "throughput": float(items_per_call * len(durations) / durations.sum())
+    }
+
+
+# Mots outils et bruit ajoutés aux articles synthétiques pour exercer
+# toutes les étapes du nettoyage (stopwords, URLs, emails, ponctuation)
+_FILLER = (
+    "the", "a", "of", "and", "to", "in", "is", "that", "was", "for",
+    "on", "are", "with", "they", "be", "at", "this", "have", "from",
+)
+_NOISE = (
+    "https://example.com/article?id=42", "www.news-site.org", "contact@press.com",
+    "2024", "100%", "!!!", "...", "#breaking", "@reporter", "(AP)", "U.S.",
+)
+
+
+def synthetic_articles(vectorizer, count, chars, seed=0):
+    """
+    Générer des articles bruts d'environ `chars` caractères
+
+    Les mots viennent du vocabulaire TF-IDF (pour que les articles aient des
+    features non nulles), mêlés de mots outils, d'URLs et de ponctuation.
+
+    Args:
+        vectorizer: TfidfVectorizer ajusté
+        count (int): Nombre d'articles
+        chars (int): Longueur visée de chaque article
+        seed (int): Graine du générateur
+
+    Returns:
+        list[str]
+    """
+    rng = random.Random(seed)
+    words = sorted({word for term in vectorizer.vocabulary_ for word in term.split()})
+    articles = []
+    for _ in range(count):
+        parts = []
+        length = 0
+        while length < chars:
+            roll = rng.random()
+            if roll < 0.55:
+                token = rng.choice(words).capitalize() if rng.random() < 0.1 else rng.choice(words)
+            elif roll < 0.95:
+                token = rng.choice(_FILLER)
+            else:
+                token = rng.choice(_NOISE)
+            parts.append(token)
+            length += len(token) + 1
+        articles.append(' '.join(parts)[:chars])
+    return articles
+
+
+def build_stand_in(vectorizer=None, n_estimators=50, seed=0):
+    """
+    Construire un petit modèle de substitution (hors ligne, en mémoire)
+
+    Utile quand models/random_forest_optimized.pkl n'est pas disponible :
+    une Random Forest est entraînée sur des documents synthétiques. Sans
+    vectorizer, un TfidfVectorizer est ajusté sur ces mêmes documents.
+
+    Returns:
+        tuple: (modèle, vectorizer)
+    """
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    rng = random.Random(seed)
+    if vectorizer is None:
+        base = [f"word{i}" for i in range(2000)]
+        documents = [' '.join(rng.choices(base, k=100)) for _ in range(400)]
+        vectorizer = TfidfVectorizer(max_features=5000, ngram_range=(1, 2)).fit(documents)
+
+    documents = vocabulary_documents(vectorizer, 400, words_per_doc=80, seed=seed)
+    labels = [i % 2 for i in range(len(documents))]
+    model = RandomForestClassifier(n_estimators=n_estimators, max_depth=12, random_state=seed)
+    model.fit(vectorizer.transform(documents), labels)
+    return model, vectorizer
@@ -0,0 +1,293 @@
+"""
+Configuration de l'API Flask
+Toutes les valeurs sont surchargeables par variables d'environnement
+"""
+
+import os
+
+
+def _env_int(name, default):
+    """Lire un entier depuis l'environnement (valeur par défaut si absent ou invalide)"""
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_float(name, default=None):
+    """Lire un flottant depuis l'environnement (valeur par défaut si absent ou invalide)"""
+    try:
+        return float(os.environ[name])
+    except (KeyError, ValueError):
+        return default
+
+
+def _env_bool(name, default=False):
+    """Lire un booléen depuis l'environnement ("1", "true", "yes", "on")"""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def _env_mapping(name, default):
+    """Lire un dictionnaire "nom=valeur,nom=valeur" depuis l'environnement"""
+    value = os.environ.get(name)
+    if not value:
+        return dict(default)
+    mapping = {}
+    for item in value.split(','):
+        key, _, path = item.partition('=')
+        if key.strip() and path.strip():
+            mapping[key.strip()] = path.strip()
+    return mapping or dict(default)
+
+
+# ============================================================
+# MODÈLES
+# ============================================================
+
+# Fichiers du modèle et du vectorizer (relatifs au dossier backend/)
+MODEL_PATH = os.environ.get('MODEL_PATH', os.path.join('models', 'random_forest_optimized.pkl'))
+VECTORIZER_PATH = os.environ.get('VECTORIZER_PATH', os.path.join('models', 'tfidf_vectorizer.pkl'))
+
+# Dossier d'artefacts .npy mappés en mémoire (voir convert_models.py).
+# Si défini, il remplace le modèle principal et VECTORIZER_PATH
+MODEL_ARTIFACTS_DIR = os.environ.get('MODEL_ARTIFACTS_DIR') or None
+
+# Modèles servis, tous ajustés sur VECTORIZER_PATH : "nom=fichier.pkl,..."
+# (défaut : forest = MODEL_PATH, linear = régression logistique)
+MODEL_CATALOG = _env_mapping('MODEL_CATALOG', {
+    'forest': MODEL_PATH,
+    'linear': os.environ.get('LINEAR_MODEL_PATH', os.path.join('models', 'fake_news_model.pkl'))
+})
+
+# Modèle principal, chargé au démarrage (les autres le sont au premier usage)
+DEFAULT_MODEL = os.environ.get('DEFAULT_MODEL', 'forest').strip()
+MODEL_CATALOG.setdefault(DEFAULT_MODEL, MODEL_PATH)
+
+# Modèle utilisé quand une requête n'en précise pas ("cascade" possible)
+DEFAULT_REQUEST_MODEL = os.environ.get('DEFAULT_REQUEST_MODEL', DEFAULT_MODEL).strip()
+
+# Cascade : "rapide,coûteux" ; le modèle coûteux n'est appelé que si la
+# confiance du modèle rapide est inférieure à CASCADE_MIN_CONFIDENCE
+CASCADE_MODELS = tuple(
+    name.strip() for name in os.environ.get('CASCADE_MODELS', 'linear,forest').split(',') if name.strip()
+)
+CASCADE_MIN_CONFIDENCE = _env_float('CASCADE_MIN_CONFIDENCE', 0.8)
+
+# Noms affichés dans les réponses (champ "model")
+MODEL_LABELS = {
+    'forest': 'Random Forest Optimized',
+    'linear': 'Logistic Regression',
+    'cascade': 'Cascade'
+}
+
+# Moteur d'inférence : "sklearn" (défaut) ou "compiled" (forêt aplatie NumPy)
+INFERENCE_ENGINE = os.environ.get('INFERENCE_ENGINE', 'sklearn').strip().lower()
+
+# Régression logistique : "fast" (défaut, produit creux avec le vecteur de
+# poids précalculé) ou "sklearn" (LogisticRegression.predict_proba)
+LINEAR_ENGINE = os.environ.get('LINEAR_ENGINE', 'fast').strip().lower()
+
+# Vectorisation : "fast" (défaut, index + IDF dense, CSR construite
+# directement) ou "sklearn" (TfidfVectorizer.transform)
+VECTORIZER_ENGINE = os.environ.get('VECTORIZER_ENGINE', 'fast').strip().lower()
+
+# Nettoyage et vectorisation fusionnés : les mots nettoyés vont directement
+# au vectorizer rapide, sans texte intermédiaire (VECTORIZER_ENGINE=fast)
+FUSED_TOKENIZER = _env_bool('FUSED_TOKENIZER', True)
+
+
+# Prédiction de préchauffage au chargement de l'application
+WARMUP_ON_START = _env_bool('WARMUP_ON_START', True)
+
+
+# ============================================================
+# RECHARGEMENT À CHAUD DU MODÈLE
+# ============================================================
+
+# Intervalle de scrutation des fichiers du modèle en secondes
+# (MODEL_ARTIFACTS_DIR, sinon MODEL_PATH et VECTORIZER_PATH ; 0 = désactivée)
+MODEL_WATCH_INTERVAL = _env_float('MODEL_WATCH_INTERVAL', 0.0)
+
+# Jeton exigé par POST /admin/reload (en-tête X-Admin-Token ; vide = route désactivée)
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN', '')
+
+
+# ============================================================
+# TAILLE DES REQUÊTES ET TEXTES LONGS
+# ============================================================
+
+# Taille maximale du corps d'une requête en octets (413 au-delà, 0 = illimitée)
+MAX_REQUEST_BYTES = _env_int('MAX_REQUEST_BYTES', 16 * 1024 * 1024)
+
+# Même limite pour /predict/stream (archives volumineuses : illimitée par défaut)
+STREAM_MAX_REQUEST_BYTES = _env_int('STREAM_MAX_REQUEST_BYTES', 0)
+
+# Nombre maximal de caractères analysés par texte (0 = texte entier)
+MAX_TEXT_CHARS = _env_int('MAX_TEXT_CHARS', 100_000)
+
+# Au-delà : "chunks" (segments répartis sur le document, agrégés),
+# "head_tail" (début + fin) ou "reject" (erreur 413)
+LONG_TEXT_STRATEGY = os.environ.get('LONG_TEXT_STRATEGY', 'chunks').strip().lower()
+
+# Taille d'un segment pour la stratégie "chunks"
+LONG_TEXT_SEGMENT_CHARS = _env_int('LONG_TEXT_SEGMENT_CHARS', 10_000)
+
+
+# ============================================================
+# PRÉDICTION PAR LOTS (/predict/batch)
+# ============================================================
+
+# Nombre maximal d'articles acceptés dans une requête
+BATCH_MAX_ITEMS = _env_int('BATCH_MAX_ITEMS', 1000)
+
+# Taille totale maximale (en caractères) de l'ensemble des textes d'un lot
+BATCH_MAX_TOTAL_CHARS = _env_int('BATCH_MAX_TOTAL_CHARS', 5_000_000)
+
+
+# ============================================================
+# NOTATION EN FLUX (/predict/stream)
+# ============================================================
+
+# Nombre d'articles notés ensemble avant d'envoyer leurs résultats
+STREAM_CHUNK_SIZE = _env_int('STREAM_CHUNK_SIZE', 256)
+
+# Taille maximale d'une ligne NDJSON (octets)
+STREAM_MAX_LINE_BYTES = _env_int('STREAM_MAX_LINE_BYTES', 1_000_000)
+
+
+# ============================================================
+# CACHE DE LEMMES
+# ============================================================
+
+# Nombre maximal de lemmes gardés en mémoire (0 = cache désactivé)
+LEMMA_CACHE_SIZE = _env_int('LEMMA_CACHE_SIZE', 100_000)
+
+# Précharger le cache au démarrage avec le vocabulaire du vectorizer TF-IDF
+LEMMA_CACHE_PRELOAD = _env_bool('LEMMA_CACHE_PRELOAD', False)
+
+
+# ============================================================
+# NETTOYAGE PARALLÈLE (lots)
+# ============================================================
+
+# Processus de nettoyage pour les gros lots (/predict/batch, /predict/stream).
+# 0 = nettoyage en série dans le worker
+PARALLEL_CLEAN_WORKERS = _env_int('PARALLEL_CLEAN_WORKERS', 0)
+
+# Taille de lot (caractères) en dessous de laquelle le nettoyage reste en série
+PARALLEL_CLEAN_MIN_CHARS = _env_int('PARALLEL_CLEAN_MIN_CHARS', 200_000)
+
+
+# ============================================================
+# CACHE DES PRÉDICTIONS
+# ============================================================
+
+# Backend : "memory" (par worker), "sqlite" (partagé entre workers) ou "none"
+PREDICTION_CACHE_BACKEND = os.environ.get('PREDICTION_CACHE_BACKEND', 'memory')
+
+# Nombre maximal de résultats gardés en cache
+PREDICTION_CACHE_SIZE = _env_int('PREDICTION_CACHE_SIZE', 10_000)
+
+# Durée de vie d'un résultat en secondes (0 = illimitée)
+PREDICTION_CACHE_TTL = _env_int('PREDICTION_CACHE_TTL', 3600)
+
+# Fichier SQLite du backend partagé
+PREDICTION_CACHE_PATH = os.environ.get(
+    'PREDICTION_CACHE_PATH', os.path.join('cache', 'predictions.sqlite3')
+)
+
+
+# ============================================================
+# ARTICLES QUASI DUPLIQUÉS (MinHash/LSH)
+# ============================================================
+
+# Reprendre le verdict d'un article déjà noté très similaire (reprises
+# légèrement retouchées d'une même campagne) au lieu de le noter à nouveau
+NEAR_DUPLICATE_ENABLED = _env_bool('NEAR_DUPLICATE_ENABLED', False)
+
+# Similarité de Jaccard estimée (n-grammes de mots nettoyés) à partir de
+# laquelle deux articles sont des quasi-doublons
+NEAR_DUPLICATE_THRESHOLD = _env_float('NEAR_DUPLICATE_THRESHOLD', 0.85)
+
+# Nombre maximal d'articles indexés (par worker ; le plus ancien est remplacé)
+NEAR_DUPLICATE_SIZE = _env_int('NEAR_DUPLICATE_SIZE', 20_000)
+
+# Durée de vie d'un article indexé en secondes (0 = illimitée)
+NEAR_DUPLICATE_TTL = _env_int('NEAR_DUPLICATE_TTL', 86_400)
+
+# Longueur des n-grammes de mots comparés
+NEAR_DUPLICATE_SHINGLE = _env_int('NEAR_DUPLICATE_SHINGLE', 2)
+
+# Fichier de persistance (rechargé au démarrage, écrit à l'arrêt) ; vide = aucun
+NEAR_DUPLICATE_PATH = os.environ.get('NEAR_DUPLICATE_PATH', '')
+
+
+# ============================================================
+# SCORING
+# ============================================================
+
+# Seuil sur la probabilité FAKE (ex : 0.7 pour privilégier la précision).
+# Non défini : classe la plus probable, comme model.predict
+DECISION_THRESHOLD = _env_float('DECISION_THRESHOLD')
+
+
+# ============================================================
+# EXPLICATIONS ("explain" sur /predict)
+# ============================================================
+
+# Nombre de termes renvoyés par défaut ("explain": true)
+EXPLAIN_TOP_K = _env_int('EXPLAIN_TOP_K', 10)
+
+# Nombre maximal de termes demandables ("explain": 50)
+EXPLAIN_MAX_TOP_K = _env_int('EXPLAIN_MAX_TOP_K', 50)
+
+
+# ============================================================
+# JOURNALISATION
+# ============================================================
+
+# Fraction des requêtes réussies écrites dans le journal structuré (0-1).
+# Les erreurs serveur sont toujours journalisées
+LOG_SAMPLE_RATE = _env_float('LOG_SAMPLE_RATE', 1.0)
+
+
+# ============================================================
+# MICRO-BATCHING (/predict)
+# ============================================================
+
+# Regrouper les requêtes /predict concurrentes en un seul appel au modèle
+MICROBATCH_ENABLED = _env_bool('MICROBATCH_ENABLED', False)
+
+# Fenêtre de collecte après l'arrivée du premier article (millisecondes)
+MICROBATCH_WINDOW_MS = _env_float('MICROBATCH_WINDOW_MS', 5.0)
+
+# Nombre maximal d'articles par lot
+MICROBATCH_MAX_SIZE = _env_int('MICROBATCH_MAX_SIZE', 32)
+
+# Articles en attente au-delà desquels /predict répond 503
+MICROBATCH_MAX_QUEUE = _env_int('MICROBATCH_MAX_QUEUE', 1000)
+
+# Attente maximale du résultat d'un lot (secondes)
+MICROBATCH_TIMEOUT = _env_float('MICROBATCH_TIMEOUT', 30.0)
+
+
+# ============================================================
+# SERVICE ASYNCHRONE (asgi.py)
+# ============================================================
+
+# Threads du pool qui exécute nettoyage et scoring (par processus)
+ASGI_WORKERS = _env_int('ASGI_WORKERS', 2)
+
+# Requêtes admises à la fois (corps en réception, en attente d'un thread ou
+# en cours) : borne aussi la mémoire des corps reçus ; au-delà,
+# réponse 503 immédiate avec Retry-After
+ASGI_MAX_PENDING = _env_int('ASGI_MAX_PENDING', 32)
+
+# Valeur de l'en-tête Retry-After des réponses 503 (secondes)
+ASGI_RETRY_AFTER = _env_int('ASGI_RETRY_AFTER', 1)
+
+# Durée maximale de réception d'un corps de requête (secondes, 0 = illimitée)
+ASGI_BODY_TIMEOUT = _env_float('ASGI_BODY_TIMEOUT', 30.0)
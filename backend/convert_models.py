@@ -0,0 +1,132 @@
+"""
+Conversion des modèles .pkl en artefacts mappables en mémoire (.npy)
+
+Usage (depuis backend/) :
+    python convert_models.py --out models/artifacts
+    python convert_models.py --out models/artifacts --report
+
+Puis démarrer l'API avec MODEL_ARTIFACTS_DIR=models/artifacts.
+
+--report mesure, dans des processus neufs, le temps de chargement et la
+mémoire d'un worker avec les .pkl puis avec les artefacts.
+"""
+
+import argparse
+import json
+import os
+import pickle
+import subprocess
+import sys
+import time
+import warnings
+
+import config
+from model_artifacts import export_artifacts, load_artifacts
+from result_cache import fingerprint
+
+
+def _memory_kb():
+    """
+    Mémoire du processus courant en Ko
+
+    Returns:
+        dict: rss (pages résidentes, partagées comprises) et private
+            (pages propres au processus, Linux uniquement)
+    """
+    memory = {"rss": None, "private": None}
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            values = {}
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[1].isdigit():
+                    values[parts[0].rstrip(':')] = int(parts[1])
+        memory["rss"] = values.get('Rss')
+        memory["private"] = values.get('Private_Clean', 0) + values.get('Private_Dirty', 0)
+    except OSError:
+        import resource
+        memory["rss"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return memory
+
+
+def _measure(mode, model_path, vectorizer_path, artifacts_dir):
+    """Charger les modèles selon `mode` et afficher temps + mémoire en JSON"""
+    before = _memory_kb()
+    start = time.perf_counter()
+
+    if mode == 'pickle':
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            with open(model_path, 'rb') as f:
+                model = pickle.load(f)
+            with open(vectorizer_path, 'rb') as f:
+                vectorizer = pickle.load(f)
+    else:
+        model, vectorizer, _ = load_artifacts(artifacts_dir)
+
+    # Une prédiction pour toucher les pages réellement utilisées
+    model.predict_proba(vectorizer.transform(['breaking news government report']))
+    elapsed = time.perf_counter() - start
+    after = _memory_kb()
+
+    print(json.dumps({
+        "mode": mode,
+        "load_seconds": elapsed,
+        "rss_kb": after["rss"] - before["rss"] if after["rss"] is not None else None,
+        "private_kb": (after["private"] - before["private"]) if after["private"] is not None else None
+    }))
+
+
+def _report(args):
+    """Comparer le chargement .pkl et le chargement mappé en mémoire"""
+    print(f"\n{'mode':<12}{'chargement':>14}{'RSS (Mo)':>12}{'privée (Mo)':>14}")
+    for mode in ('pickle', 'artifacts'):
+        output = subprocess.run(
+            [sys.executable, __file__, '--measure', mode,
+             '--model', args.model, '--vectorizer', args.vectorizer, '--out', args.out],
+            check=True, capture_output=True, text=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        rss = f"{result['rss_kb'] / 1024:.1f}" if result['rss_kb'] is not None else "n/a"
+        private = f"{result['private_kb'] / 1024:.1f}" if result['private_kb'] is not None else "n/a"
+        print(f"{mode:<12}{result['load_seconds'] * 1000:>11.1f} ms{rss:>12}{private:>14}")
+    print("\nLa mémoire privée est celle que chaque worker ne partage pas :")
+    print("les pages mappées des artefacts comptent dans le RSS mais sont partagées.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert .pkl models to memory-mappable artifacts")
+    parser.add_argument('--model', default=config.MODEL_PATH)
+    parser.add_argument('--vectorizer', default=config.VECTORIZER_PATH)
+    parser.add_argument('--out', default=os.path.join('models', 'artifacts'))
+    parser.add_argument('--report', action='store_true', help="compare load time and memory")
+    parser.add_argument('--measure', choices=('pickle', 'artifacts'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        _measure(args.measure, args.model, args.vectorizer, args.out)
+        return
+
+    with open(args.model, 'rb') as f:
+        model_bytes = f.read()
+    with open(args.vectorizer, 'rb') as f:
+        vectorizer_bytes = f.read()
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        model = pickle.loads(model_bytes)
+        vectorizer = pickle.loads(vectorizer_bytes)
+
+    manifest = export_artifacts(
+        model, vectorizer, args.out,
+        fingerprint=fingerprint(model_bytes, vectorizer_bytes)
+    )
+    print(f"✅ Artefacts écrits dans {args.out} "
+          f"({manifest['model_kind']}, version {manifest['fingerprint']})")
+
+    if args.report:
+        _report(args)
+
+
+if __name__ == '__main__':
+    main()
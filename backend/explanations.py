@@ -0,0 +1,314 @@
+"""
+Explication des prédictions : termes TF-IDF qui ont le plus pesé
+
+LIME ou SHAP réévaluent le modèle des centaines de fois par article. Ici
+une table par modèle est construite une fois, puis seules les colonnes non
+nulles de la ligne déjà produite par `vectorizer.transform` (les termes de
+l'article) y sont lues :
+
+- régression logistique : les coefficients ; la contribution d'un terme
+  est poids TF-IDF × coefficient, en log-odds (décomposition exacte de la
+  fonction de décision) ;
+- forêt : les nœuds de décision rangés par feature et par seuil ; la
+  contribution d'un terme est la somme, sur les nœuds qui le testent et
+  dont il dépasse le seuil, de (P(FAKE) à droite − P(FAKE) à gauche) ×
+  part des échantillons d'entraînement qui atteignent le nœud, moyennée
+  sur les arbres. C'est l'effet attendu de sa valeur TF-IDF sur la forêt
+  (seuils compris), pas la décomposition du chemin suivi par l'article.
+  La table est construite au premier article expliqué.
+"""
+
+import threading
+
+import numpy as np
+
+from forest_engine import CompiledForest
+from linear_engine import SparseLinearModel
+
+
+def _row_weights(weights, begin, end):
+    """Poids normalisés des lignes d'un article (comme aggregate_segments)"""
+    if end - begin == 1:
+        return np.ones(1)
+    row_weights = np.asarray(weights[begin:end], dtype=np.float64)
+    return row_weights / row_weights.sum()
+
+
+def _top_terms(method, unit, terms, columns, values, contributions, top_k):
+    """
+    Termes de plus forte contribution absolue
+
+    Returns:
+        dict: method, unit et terms (term, tfidf, contribution, direction),
+            par contribution absolue décroissante
+    """
+    if len(contributions) > top_k:
+        selected = np.argpartition(-np.abs(contributions), top_k - 1)[:top_k]
+    else:
+        selected = np.arange(len(contributions))
+    selected = selected[np.argsort(-np.abs(contributions[selected]), kind='stable')]
+
+    return {
+        "method": method,
+        "unit": unit,
+        "terms": [
+            {
+                "term": str(terms[columns[i]]),
+                "tfidf": round(float(values[i]), 6),
+                "contribution": round(float(contributions[i]), 6),
+                "direction": "fake" if contributions[i] > 0 else "real"
+            }
+            for i in selected.tolist()
+            if contributions[i] != 0
+        ]
+    }
+
+
+class FeatureContributions:
+    """
+    Table des contributions par terme d'un modèle linéaire
+
+    Args:
+        weights (np.ndarray): Coefficient par colonne (n_features,),
+            positif vers FAKE
+        terms (np.ndarray): Terme de chaque colonne du vectorizer
+    """
+
+    method = 'linear_coefficients'
+    unit = 'log_odds'
+
+    def __init__(self, weights, terms):
+        if len(weights) != len(terms):
+            raise ValueError(f"{len(weights)} contributions for {len(terms)} vectorizer terms")
+        self.weights = weights
+        self.terms = terms
+
+    @classmethod
+    def from_linear(cls, coef, terms, fake_index):
+        """
+        Table d'une régression logistique binaire
+
+        Args:
+            coef (np.ndarray): Coefficients (n_features,) ; une fonction de
+                décision positive désigne classes_[1]
+            terms (np.ndarray): Terme de chaque colonne
+            fake_index (int): Position de la classe FAKE dans classes_
+        """
+        weights = np.asarray(coef, dtype=np.float64)
+        return cls(weights if fake_index == 1 else -weights, terms)
+
+    def explain(self, X, begin, end, weights=None, top_k=10):
+        """
+        Termes qui ont le plus pesé sur un article
+
+        Args:
+            X: Matrice TF-IDF CSR (celle qui a été notée)
+            begin, end (int): Lignes de l'article (plusieurs si l'article a
+                été noté en segments)
+            weights (array-like): Poids de chaque ligne de X (longueur
+                nettoyée), comme pour l'agrégation des probabilités
+            top_k (int): Nombre de termes renvoyés
+
+        Returns:
+            dict: method, unit et terms (term, tfidf, contribution,
+                direction), par contribution absolue décroissante
+        """
+        if end - begin == 1:
+            start, stop = X.indptr[begin], X.indptr[end]
+            columns = X.indices[start:stop]
+            values = X.data[start:stop]
+        else:
+            # Segments : moyenne pondérée, comme les probabilités (aggregate_segments)
+            combined = X[begin:end].T @ _row_weights(weights, begin, end)
+            columns = np.flatnonzero(combined)
+            values = combined[columns]
+
+        return _top_terms(self.method, self.unit, self.terms, columns, values,
+                          self.weights[columns] * values, top_k)
+
+
+def _forest_splits(model, fake_index):
+    """
+    Nœuds de décision d'une forêt et effet du passage à droite
+
+    Args:
+        model: CompiledForest (avec `node_weight`) ou forêt scikit-learn
+        fake_index (int): Position de la classe FAKE dans classes_
+
+    Returns:
+        tuple: (feature, seuil, effet) par nœud interne ; effet =
+            (P(FAKE) enfant droit − P(FAKE) enfant gauche) × part des
+            échantillons d'entraînement qui atteignent le nœud / nb d'arbres
+    """
+    if isinstance(model, CompiledForest):
+        # Les feuilles bouclent sur elles-mêmes (forest_engine)
+        internal = model.left != np.arange(len(model.feature))
+        fake = model.node_proba[:, fake_index]
+        effect = (fake[model.right[internal]] - fake[model.left[internal]]) * model.node_weight[internal]
+        return model.feature[internal], model.threshold[internal], effect / model.n_trees
+
+    features, thresholds, effects = [], [], []
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        internal = tree.children_left != -1
+        value = tree.value[:, 0, :].astype(np.float64)
+        normalizer = value.sum(axis=1)
+        normalizer[normalizer == 0.0] = 1.0
+        fake = value[:, fake_index] / normalizer
+        weight = tree.weighted_n_node_samples / tree.weighted_n_node_samples[0]
+        left, right = tree.children_left[internal], tree.children_right[internal]
+
+        features.append(tree.feature[internal])
+        thresholds.append(tree.threshold[internal])
+        effects.append((fake[right] - fake[left]) * weight[internal])
+    return np.concatenate(features), np.concatenate(thresholds), np.concatenate(effects) / len(model.estimators_)
+
+
+class ForestSplitEffects:
+    """
+    Effets des termes d'un article sur une forêt, lus dans une table
+
+    La table (construite au premier article expliqué, puis gardée) range
+    les nœuds de décision par feature puis par seuil. La contribution d'un
+    terme de l'article est la somme des effets des nœuds qui le testent et
+    dont le seuil est dépassé par sa valeur TF-IDF (l'article part à
+    droite), pondérés par la part des échantillons d'entraînement qui
+    atteignent chaque nœud. Un terme sous tous les seuils ne contribue pas ;
+    les termes absents de l'article ne sont pas lus. C'est un effet attendu
+    sur la forêt, pas la décomposition du chemin suivi par l'article.
+
+    Args:
+        model: CompiledForest (avec `node_weight`) ou forêt scikit-learn
+            (aucune copie compilée n'est construite)
+        terms (np.ndarray): Terme de chaque colonne du vectorizer
+        fake_index (int): Position de la classe FAKE dans classes_
+    """
+
+    method = 'forest_split_effects'
+    unit = 'probability'
+
+    def __init__(self, model, terms, fake_index):
+        if isinstance(model, CompiledForest) and model.node_weight is None:
+            raise ValueError("forest has no node weights (artifacts exported before node_weight)")
+        n_features = getattr(model, 'n_features', None) or model.n_features_in_
+        if n_features != len(terms):
+            raise ValueError(f"{n_features} forest features for {len(terms)} vectorizer terms")
+        self.model = model
+        self.terms = terms
+        self.fake_index = fake_index
+        self._table = None
+        self._lock = threading.Lock()
+
+    def table(self):
+        """
+        Table des nœuds par feature (construite une fois)
+
+        Returns:
+            tuple: (offsets (n_features + 1), seuils, effets), nœuds triés
+                par feature puis par seuil
+        """
+        if self._table is None:
+            with self._lock:
+                if self._table is None:
+                    feature, threshold, effect = _forest_splits(self.model, self.fake_index)
+                    order = np.lexsort((threshold, feature))
+                    offsets = np.searchsorted(feature[order], np.arange(len(self.terms) + 1))
+                    self._table = (offsets, threshold[order], effect[order])
+        return self._table
+
+    def effects(self, columns, values):
+        """
+        Contribution de chaque (colonne, valeur TF-IDF)
+
+        Args:
+            columns (np.ndarray): Colonnes non nulles
+            values (np.ndarray): Valeurs TF-IDF correspondantes
+
+        Returns:
+            np.ndarray: Contribution par entrée, en probabilité FAKE
+        """
+        offsets, thresholds, effects = self.table()
+        starts = offsets[columns]
+        lengths = offsets[columns + 1] - starts
+        total = int(lengths.sum())
+        if total == 0:
+            return np.zeros(len(columns))
+
+        # Nœuds des colonnes demandées, à plat (une plage par colonne)
+        owner = np.repeat(np.arange(len(columns)), lengths)
+        nodes = np.arange(total) + np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+
+        # Comme l'arbre sklearn : valeur en float32, à droite si valeur > seuil
+        values = np.asarray(values, dtype=np.float32).astype(np.float64)
+        crossed = thresholds[nodes] < values[owner]
+        return np.bincount(owner, weights=np.where(crossed, effects[nodes], 0.0), minlength=len(columns))
+
+    def explain(self, X, begin, end, weights=None, top_k=10):
+        """
+        Termes qui ont le plus pesé sur un article (mêmes arguments et même
+        résultat que FeatureContributions.explain)
+        """
+        start, stop = X.indptr[begin], X.indptr[end]
+        columns = X.indices[start:stop]
+        values = X.data[start:stop]
+        contributions = self.effects(columns, values)
+
+        if end - begin > 1:
+            # Segments : moyenne pondérée, comme les probabilités (aggregate_segments)
+            row_weights = _row_weights(weights, begin, end)[
+                np.repeat(np.arange(end - begin), np.diff(X.indptr[begin:end + 1]))
+            ]
+            columns, position = np.unique(columns, return_inverse=True)
+            values = np.bincount(position, weights=values * row_weights)
+            contributions = np.bincount(position, weights=contributions * row_weights)
+
+        return _top_terms(self.method, self.unit, self.terms, columns, values, contributions, top_k)
+
+
+def vocabulary_terms(vectorizer):
+    """
+    Terme de chaque colonne d'un vectorizer ajusté
+
+    Returns:
+        np.ndarray: Termes, par index de colonne
+    """
+    terms = np.empty(len(vectorizer.vocabulary_), dtype=object)
+    for term, column in vectorizer.vocabulary_.items():
+        terms[column] = term
+    return terms
+
+
+def build_contributions(model, vectorizer, fake_index, log=print):
+    """
+    Préparer les explications d'un modèle chargé
+
+    Args:
+        model: Moteur d'inférence ou modèle scikit-learn (forêt ou
+            régression logistique binaire)
+        vectorizer: Vectorizer ajusté (termes des colonnes)
+        fake_index (int): Position de la classe FAKE dans classes_
+        log (callable): Fonction d'affichage
+
+    Returns:
+        FeatureContributions ou ForestSplitEffects, ou None si le modèle
+            n'est pas pris en charge
+    """
+    if model is None or vectorizer is None:
+        return None
+    try:
+        terms = vocabulary_terms(vectorizer)
+        if isinstance(model, SparseLinearModel):
+            contributions = FeatureContributions.from_linear(model.coef, terms, fake_index)
+        elif SparseLinearModel.supports(model):
+            contributions = FeatureContributions.from_linear(model.coef_[0], terms, fake_index)
+        elif isinstance(model, CompiledForest) or hasattr(model, 'estimators_'):
+            # Table construite au premier article expliqué
+            contributions = ForestSplitEffects(model, terms, fake_index)
+        else:
+            raise TypeError(f"{type(model).__name__} is not supported")
+    except Exception as e:
+        log(f"⚠️  Explications indisponibles ({e})")
+        return None
+
+    log(f"🔎 Explications : contributions par terme ({contributions.method})")
+    return contributions
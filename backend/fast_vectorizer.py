@@ -0,0 +1,260 @@
+"""
+Vectorisation TF-IDF rapide (mêmes matrices que TfidfVectorizer.transform)
+
+`TfidfVectorizer.transform` enchaîne analyseur générique, construction
+d'une matrice de comptes, validation, multiplication par l'IDF puis
+normalisation : pour un seul article, l'essentiel du temps passe dans
+ces étapes intermédiaires. Le FastTfidfVectorizer est construit à partir
+du vectorizer ajusté et garde :
+
+- l'index terme → colonne (table de hachage) ;
+- les poids IDF dans un tableau NumPy dense, indexé par colonne.
+
+Les n-grammes d'un lot sont convertis en identifiants (ligne, colonne),
+comptés en une seule passe NumPy et la matrice CSR est construite
+directement, triée comme celle de scikit-learn. Les normes sont
+accumulées dans le même ordre que scikit-learn : la matrice est
+identique au bit près.
+
+`transform_words` part directement des mots produits par le nettoyage,
+sans les joindre en chaîne puis les redécouper.
+"""
+
+import math
+import re
+
+import numpy as np
+import scipy.sparse as sp
+
+# Motif de tokens par défaut de scikit-learn (mots de 2 caractères ou plus)
+DEFAULT_TOKEN_PATTERN = r"(?u)\b\w\w+\b"
+
+
+class FastTfidfVectorizer:
+    """
+    Remplaçant de `TfidfVectorizer.transform` pour un vectorizer ajusté
+
+    Configurations prises en charge : analyzer="word", sans preprocessor
+    ni tokenizer personnalisés, sans strip_accents, dtype float64.
+
+    Args:
+        vocabulary (dict): Terme → index de colonne
+        idf (np.ndarray): Poids IDF par colonne (None si use_idf=False)
+        token_pattern (str): Expression régulière des tokens
+        ngram_range (tuple): (n minimal, n maximal)
+        lowercase (bool): Mettre le texte en minuscules
+        stop_words (frozenset): Mots retirés avant les n-grammes
+        binary (bool): Comptes remplacés par 1
+        sublinear_tf (bool): tf remplacé par 1 + log(tf)
+        norm (str): "l2", "l1" ou None
+    """
+
+    def __init__(self, vocabulary, idf, token_pattern=DEFAULT_TOKEN_PATTERN, ngram_range=(1, 1),
+                 lowercase=True, stop_words=None, binary=False, sublinear_tf=False, norm='l2'):
+        self.vocabulary = vocabulary
+        self.idf = None if idf is None else np.asarray(idf, dtype=np.float64)
+        self.n_features = len(vocabulary)
+        self.ngram_range = tuple(ngram_range)
+        self.lowercase = lowercase
+        self.stop_words = frozenset(stop_words) if stop_words else None
+        self.binary = binary
+        self.sublinear_tf = sublinear_tf
+        self.norm = norm
+
+        pattern = re.compile(token_pattern)
+        if pattern.groups > 1:
+            raise ValueError("token_pattern must capture at most one group")
+        self._findall = pattern.findall
+        self._default_pattern = token_pattern == DEFAULT_TOKEN_PATTERN
+
+    @classmethod
+    def from_sklearn(cls, vectorizer):
+        """
+        Construire le vectorizer rapide à partir d'un TfidfVectorizer ajusté
+
+        Raises:
+            ValueError: Configuration non prise en charge
+        """
+        if vectorizer.analyzer != 'word':
+            raise ValueError(f"Unsupported analyzer: {vectorizer.analyzer!r}")
+        if vectorizer.preprocessor is not None or vectorizer.tokenizer is not None:
+            raise ValueError("Custom preprocessor/tokenizer are not supported")
+        if vectorizer.strip_accents is not None:
+            raise ValueError("strip_accents is not supported")
+        if vectorizer.input != 'content':
+            raise ValueError(f"Unsupported input: {vectorizer.input!r}")
+        if np.dtype(vectorizer.dtype) != np.float64:
+            raise ValueError(f"Unsupported dtype: {np.dtype(vectorizer.dtype).name}")
+        if vectorizer.norm not in ('l1', 'l2', None):
+            raise ValueError(f"Unsupported norm: {vectorizer.norm!r}")
+
+        return cls(
+            vocabulary=dict(vectorizer.vocabulary_),
+            idf=vectorizer.idf_ if vectorizer.use_idf else None,
+            token_pattern=vectorizer.token_pattern,
+            ngram_range=vectorizer.ngram_range,
+            lowercase=vectorizer.lowercase,
+            stop_words=vectorizer.get_stop_words(),
+            binary=vectorizer.binary,
+            sublinear_tf=vectorizer.sublinear_tf,
+            norm=vectorizer.norm
+        )
+
+    def _tokenize(self, document):
+        """Tokens d'un document (comme l'analyseur "word", avant les stopwords)"""
+        if self.lowercase:
+            document = document.lower()
+        return self._findall(document)
+
+    def _word_tokens(self, words):
+        """
+        Tokens du document ' '.join(words), sans construire la chaîne
+
+        Avec le motif par défaut, un token ne contient jamais d'espace :
+        les tokens du document joint sont ceux de chaque mot, dans l'ordre.
+        Un mot ASCII alphabétique (en minuscules si lowercase) d'au moins
+        2 lettres est son propre et unique token ; les autres mots sont
+        découpés par le motif.
+        """
+        if not self._default_pattern:
+            return self._tokenize(' '.join(words))
+
+        lowercase = self.lowercase
+
+        # Cas courant (sortie de TextPreprocessor) : tous les mots sont
+        # des tokens, vérifié en une passe C sur leur concaténation
+        letters = ''.join(words)
+        if (letters.isascii() and letters.isalpha() and (letters.islower() or not lowercase)
+                and min(map(len, words)) > 1):
+            return words
+
+        tokens = []
+        for word in words:
+            if len(word) > 1 and word.isascii() and word.isalpha() and (word.islower() or not lowercase):
+                tokens.append(word)
+            else:
+                tokens.extend(self._tokenize(word))
+        return tokens
+
+    def _ngrams(self, tokens):
+        """Stopwords retirés puis n-grammes d'une liste de tokens"""
+        if self.stop_words is not None:
+            stop_words = self.stop_words
+            tokens = [token for token in tokens if token not in stop_words]
+
+        min_n, max_n = self.ngram_range
+        if max_n == 1:
+            return tokens
+
+        grams = list(tokens) if min_n == 1 else []
+        for n in range(max(min_n, 2), min(max_n, len(tokens)) + 1):
+            if n == 2:
+                grams.extend([first + ' ' + second for first, second in zip(tokens, tokens[1:])])
+            else:
+                grams.extend([' '.join(tokens[i:i + n]) for i in range(len(tokens) - n + 1)])
+        return grams
+
+    def _columns(self, token_lists, n_rows):
+        """
+        Comptes (ligne, colonne) d'un lot
+
+        Returns:
+            tuple: (indptr, indices, counts) triés par ligne puis colonne
+        """
+        lookup = self.vocabulary.get
+        n_features = self.n_features
+        keys = []
+        for row, tokens in enumerate(token_lists):
+            # Identifiant unique (ligne, colonne) : ligne * n_features + colonne
+            offset = row * n_features
+            keys.extend([offset + column for column in map(lookup, self._ngrams(tokens))
+                         if column is not None])
+
+        keys, counts = np.unique(np.array(keys, dtype=np.int64), return_counts=True)
+        rows = keys // n_features
+        indices = (keys - rows * n_features).astype(np.int32)
+        indptr = np.searchsorted(rows, np.arange(n_rows + 1)).astype(np.int32)
+        return indptr, indices, counts
+
+    def _row_norms(self, data, indptr):
+        # Somme séquentielle, dans l'ordre des colonnes, comme scikit-learn
+        # (une réduction NumPy groupe les additions différemment)
+        values = (data * data if self.norm == 'l2' else np.abs(data)).tolist()
+        bounds = indptr.tolist()
+        norms = np.ones(len(bounds) - 1)
+        for row in range(len(bounds) - 1):
+            total = 0.0
+            for value in values[bounds[row]:bounds[row + 1]]:
+                total += value
+            if total > 0:
+                norms[row] = math.sqrt(total) if self.norm == 'l2' else total
+        return norms
+
+    def _matrix(self, token_lists, n_rows):
+        """Matrice TF-IDF à partir des tokens de chaque ligne"""
+        indptr, indices, counts = self._columns(token_lists, n_rows)
+
+        if self.binary:
+            data = np.ones(len(counts), dtype=np.float64)
+        else:
+            data = counts.astype(np.float64)
+        if self.sublinear_tf:
+            np.log(data, data)
+            data += 1.0
+        if self.idf is not None:
+            data *= self.idf[indices]
+        if self.norm is not None:
+            data /= np.repeat(self._row_norms(data, indptr), np.diff(indptr))
+
+        return sp.csr_matrix((data, indices, indptr), shape=(n_rows, self.n_features))
+
+    def transform(self, raw_documents):
+        """
+        Vectoriser des documents
+
+        Args:
+            raw_documents (list[str]): Documents (textes nettoyés)
+
+        Returns:
+            scipy.sparse.csr_matrix: Matrice TF-IDF (n_documents, n_features),
+                identique à TfidfVectorizer.transform
+        """
+        if isinstance(raw_documents, str):
+            raise ValueError("Iterable over raw text documents expected, string object received.")
+        documents = list(raw_documents)
+        return self._matrix(map(self._tokenize, documents), len(documents))
+
+    def transform_words(self, word_lists):
+        """
+        Vectoriser des listes de mots sans les joindre en chaînes
+
+        Args:
+            word_lists (list[list[str]]): Mots nettoyés de chaque document
+                (TextPreprocessor.tokens)
+
+        Returns:
+            scipy.sparse.csr_matrix: Identique à
+                transform([' '.join(words) for words in word_lists])
+        """
+        return self._matrix(map(self._word_tokens, word_lists), len(word_lists))
+
+    def matches(self, vectorizer, documents):
+        """
+        Vérifier que la sortie est identique à celle du vectorizer scikit-learn
+
+        Args:
+            vectorizer: TfidfVectorizer d'origine
+            documents (list[str]): Documents de contrôle
+
+        Returns:
+            bool
+        """
+        expected = vectorizer.transform(documents)
+        actual = self.transform(documents)
+        expected.sort_indices()
+        return (
+            expected.shape == actual.shape
+            and np.array_equal(expected.indptr, actual.indptr)
+            and np.array_equal(expected.indices, actual.indices)
+            and np.array_equal(expected.data, actual.data)
+        )
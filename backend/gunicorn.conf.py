@@ -0,0 +1,122 @@
+"""
+Configuration gunicorn de production
+
+Lancement (depuis backend/) :
+    gunicorn -c gunicorn.conf.py app:app
+    gunicorn -c gunicorn.conf.py -k uvicorn.workers.UvicornWorker asgi:app   (ASGI)
+
+- preload_app : les modèles sont chargés une seule fois dans le master,
+  puis partagés avec les workers par copy-on-write après le fork
+- gc.freeze() avant le fork : les objets chargés sont sortis du suivi du
+  ramasse-miettes, qui n'écrit donc plus dans leurs pages (sinon chaque
+  collecte dans un worker recopierait ces pages)
+- workers/threads dimensionnés d'après les CPU disponibles
+
+Variables d'environnement :
+    PORT                 Port d'écoute (défaut : 5000)
+    WEB_CONCURRENCY      Nombre de workers (défaut : nombre de CPU, max 8)
+    GUNICORN_THREADS     Threads par worker (défaut : 2)
+    GUNICORN_PRELOAD     Charger l'app dans le master (défaut : 1)
+    GUNICORN_TIMEOUT     Timeout d'un worker en secondes (défaut : 60)
+"""
+
+import gc
+import os
+
+
+def _cpu_count():
+    # CPU réellement attribués au processus (conteneurs, taskset)
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+# ============================================================
+# SERVEUR
+# ============================================================
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+# Le scoring est limité par le CPU : un worker par cœur suffit, quelques
+# threads par worker recouvrent les entrées/sorties réseau
+workers = int(os.environ.get('WEB_CONCURRENCY', min(_cpu_count(), 8)))
+threads = int(os.environ.get('GUNICORN_THREADS', 2))
+worker_class = 'gthread' if threads > 1 else 'sync'
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+graceful_timeout = 30
+keepalive = 5
+
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1').lower() in ('1', 'true', 'yes', 'on')
+
+accesslog = '-'
+errorlog = '-'
+
+# ============================================================
+# PARTAGE COPY-ON-WRITE
+# ============================================================
+
+if preload_app:
+    # Pas de collecte pendant le chargement des modèles dans le master :
+    # évite de disperser les objets survivants dans des pages à moitié libres
+    gc.disable()
+
+
+def when_ready(server):
+    """Master prêt (app préchargée) : vérifier l'auto-test"""
+    import sys
+    app_module = sys.modules.get('app')
+    if app_module is None:
+        server.log.info("App not preloaded: models load in each worker")
+        return
+
+    if getattr(app_module, 'warmup_ok', None) is False:
+        server.log.warning("Startup self-check failed: see the logs above")
+    else:
+        server.log.info("Models preloaded in master (version %s)", app_module.registry.current.version)
+
+
+def pre_fork(server, worker):
+    """Geler les objets du master juste avant chaque fork"""
+    if preload_app:
+        gc.freeze()
+        # Préchargement terminé : le master (longue durée de vie, relance
+        # les workers) collecte de nouveau ses propres cycles
+        gc.enable()
+
+
+def post_fork(server, worker):
+    """Réactiver le ramasse-miettes dans le worker"""
+    gc.enable()
+    server.log.info("Worker %s ready (%d frozen objects shared)", worker.pid, gc.get_freeze_count())
+
+
+def post_worker_init(worker):
+    """Démarrer le pool de nettoyage parallèle et la surveillance des modèles du worker"""
+    import sys
+    app_module = sys.modules.get('app')
+    cleaner = getattr(app_module, 'parallel_cleaner', None)
+    if cleaner is not None:
+        cleaner.start()
+        worker.log.info("Worker %s: %d cleaning processes started", worker.pid, cleaner.workers)
+
+    # Chaque worker surveille les fichiers et recharge sa propre version
+    registry = getattr(app_module, 'registry', None)
+    if registry is not None and registry.start_watching():
+        worker.log.info("Worker %s: watching model files every %gs", worker.pid, registry.poll_interval)
+
+
+def worker_exit(server, worker):
+    """Écrire l'index des quasi-doublons du worker (NEAR_DUPLICATE_PATH)"""
+    import sys
+    app_module = sys.modules.get('app')
+    save = getattr(app_module, 'save_near_duplicates', None)
+    if save is None:
+        return
+    try:
+        saved = save()
+        if saved is not None:
+            server.log.info("Worker %s: %d near-duplicate entries saved", worker.pid, saved)
+    except Exception as e:
+        server.log.warning("Worker %s: near-duplicate index not saved (%s)", worker.pid, e)
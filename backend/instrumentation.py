@@ -0,0 +1,306 @@
+"""
+Instrumentation de l'API : temps par étape, métriques Prometheus et
+journal structuré non bloquant
+
+- RequestTrace : chronomètre les étapes d'une requête (parse, clean,
+  vectorize, score, serialize)
+- Counter / Histogram / MetricsRegistry : métriques exposées au format
+  texte Prometheus sur /metrics (par processus : une série par worker)
+- StructuredLogger : lignes JSON écrites par un thread d'arrière-plan,
+  avec échantillonnage ; la requête ne fait qu'un `put_nowait` en file
+"""
+
+import bisect
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# Bornes des histogrammes de latence (secondes)
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+# ============================================================
+# MÉTRIQUES
+# ============================================================
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labelnames, labelvalues, extra=None):
+    pairs = list(zip(labelnames, labelvalues))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """
+    Compteur monotone, éventuellement étiqueté
+
+    Args:
+        name (str): Nom Prometheus
+        documentation (str): Texte d'aide (# HELP)
+        labelnames (tuple): Noms des étiquettes
+    """
+
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        """Incrémenter la série correspondant aux étiquettes"""
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        """Valeur courante d'une série (0 si absente)"""
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def render(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """
+    Histogramme à bornes fixes, éventuellement étiqueté
+
+    Args:
+        name (str): Nom Prometheus
+        documentation (str): Texte d'aide (# HELP)
+        labelnames (tuple): Noms des étiquettes
+        buckets (tuple): Bornes supérieures croissantes (+Inf ajouté)
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        """Enregistrer une observation"""
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        position = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][position] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        with self._lock:
+            items = sorted((key, (list(s[0]), s[1], s[2])) for key, s in self._series.items())
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, key, ('le', _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Ensemble de métriques rendues ensemble sur /metrics"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        """Créer (ou retrouver) un compteur"""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        """Créer (ou retrouver) un histogramme"""
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self):
+        """
+        Rendre toutes les métriques au format texte Prometheus 0.0.4
+
+        Returns:
+            str
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+# Registre du processus et métriques standard de l'API
+METRICS = MetricsRegistry()
+
+REQUEST_LATENCY = METRICS.histogram(
+    'fnd_request_duration_seconds', 'End-to-end request latency', ('endpoint',)
+)
+STAGE_LATENCY = METRICS.histogram(
+    'fnd_stage_duration_seconds', 'Latency of each pipeline stage', ('endpoint', 'stage')
+)
+REQUESTS = METRICS.counter(
+    'fnd_http_requests_total', 'HTTP requests by endpoint and status', ('endpoint', 'status')
+)
+ERRORS = METRICS.counter(
+    'fnd_errors_total', 'Requests answered with an error status', ('endpoint', 'status')
+)
+PREDICTIONS = METRICS.counter(
+    'fnd_predictions_total', 'Predictions served by label', ('label', 'cached')
+)
+
+
+# ============================================================
+# CHRONOMÉTRAGE PAR ÉTAPE
+# ============================================================
+
+class RequestTrace:
+    """
+    Temps par étape et champs de journal d'une requête
+
+    Usage :
+        trace = RequestTrace()
+        with trace.stage('clean'):
+            cleaned = clean_text(text)
+        trace.annotate(label='FAKE')
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.stages = {}
+        self.fields = {}
+
+    @contextmanager
+    def stage(self, name):
+        """Chronométrer une étape (durées cumulées si répétée)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def annotate(self, **fields):
+        """Ajouter des champs à la ligne de journal de la requête"""
+        self.fields.update(fields)
+
+    def elapsed(self):
+        """Durée écoulée depuis le début de la requête (secondes)"""
+        return time.perf_counter() - self.start
+
+
+# ============================================================
+# JOURNAL STRUCTURÉ NON BLOQUANT
+# ============================================================
+
+class StructuredLogger:
+    """
+    Journal JSON (une ligne par événement) écrit hors du chemin critique
+
+    Les événements sont déposés dans une file bornée ; un thread
+    d'arrière-plan les écrit sur `stream`. Si la file est pleine,
+    l'événement est abandonné (compté dans `dropped`) plutôt que de
+    bloquer la requête.
+
+    Le thread est démarré paresseusement dans chaque processus : avec
+    gunicorn --preload, un thread créé dans le master n'existerait pas
+    dans les workers.
+
+    Args:
+        stream: Flux de sortie (défaut : stderr)
+        sample_rate (float): Fraction des événements échantillonnés écrits (0-1)
+        maxsize (int): Taille de la file
+    """
+
+    def __init__(self, stream=None, sample_rate=1.0, maxsize=10_000):
+        self.stream = stream or sys.stderr
+        self.sample_rate = sample_rate
+        self.dropped = 0
+        self._maxsize = maxsize
+        self._queue = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = queue.Queue(self._maxsize)
+            threading.Thread(target=self._run, name='structured-logger', daemon=True).start()
+            self._pid = os.getpid()
+
+    def _run(self):
+        events = self._queue
+        while True:
+            event = events.get()
+            try:
+                self.stream.write(json.dumps(event, default=str) + '\n')
+                self.stream.flush()
+            except Exception:
+                pass
+
+    def log(self, event, sampled=True):
+        """
+        Enregistrer un événement
+
+        Args:
+            event (dict): Champs de l'événement (sérialisables en JSON)
+            sampled (bool): Soumettre l'événement à l'échantillonnage
+                (False pour les erreurs, toujours écrites)
+        """
+        if sampled and self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return
+        self._ensure_started()
+        event.setdefault('ts', time.time())
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
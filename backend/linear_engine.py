@@ -0,0 +1,118 @@
+"""
+Moteur d'inférence creux pour la régression logistique
+
+`LogisticRegression.predict_proba` repasse, pour chaque requête, par la
+validation de l'entrée, `safe_sparse_dot` sur `coef_.T` (2-D) et un
+empilement transposé : environ 0,1 ms pour un seul article, alors que le
+calcul utile est un produit scalaire sur les ~250 termes non nuls de la
+ligne TF-IDF. Ce moteur extrait une fois au chargement le vecteur de poids
+(contigu, float64) et l'ordonnée à l'origine, puis calcule directement
+X @ w + b (produit matrice creuse × vecteur, dans l'ordre des indices de la
+ligne) suivi de la sigmoïde : mêmes opérations, donc mêmes probabilités au
+bit près que scikit-learn.
+"""
+
+import numpy as np
+from scipy.special import expit
+
+
+class SparseLinearModel:
+    """
+    Régression logistique binaire réduite à un vecteur de poids
+
+    Args:
+        coef (np.ndarray): Poids par feature (n_features,), float64 contigu
+        intercept (float): Ordonnée à l'origine
+        classes (np.ndarray): Classes du modèle (`classes_`)
+    """
+
+    def __init__(self, coef, intercept, classes):
+        self.coef = coef
+        self.intercept = intercept
+        self.classes_ = classes
+        self.n_features = len(coef)
+
+    @staticmethod
+    def supports(model):
+        """
+        Le modèle est-il une régression logistique binaire « un contre le
+        reste » (sigmoïde sur une seule fonction de décision) ?
+
+        Args:
+            model: Modèle chargé
+
+        Returns:
+            bool
+        """
+        coef = getattr(model, 'coef_', None)
+        if coef is None or not hasattr(model, 'intercept_') or not hasattr(model, 'predict_proba'):
+            return False
+        if np.ndim(coef) != 2 or coef.shape[0] != 1 or len(getattr(model, 'classes_', ())) != 2:
+            return False
+        # En multinomial, scikit-learn applique un softmax sur [-d, d]
+        return getattr(model, 'multi_class', 'auto') in ('ovr', 'auto', 'warn', 'deprecated')
+
+    @classmethod
+    def from_sklearn(cls, model):
+        """
+        Extraire les poids d'une LogisticRegression binaire ajustée
+
+        Args:
+            model: LogisticRegression scikit-learn (ou artefacts rechargés)
+
+        Returns:
+            SparseLinearModel
+        """
+        if not cls.supports(model):
+            raise TypeError(f"{type(model).__name__} is not a fitted binary logistic regression")
+        return cls(
+            coef=np.ascontiguousarray(model.coef_[0], dtype=np.float64),
+            intercept=float(model.intercept_[0]),
+            classes=np.asarray(model.classes_)
+        )
+
+    def decision_function(self, X):
+        """
+        Score linéaire X @ w + b
+
+        Args:
+            X: Matrice TF-IDF creuse ou dense (n_articles, n_features)
+
+        Returns:
+            np.ndarray: (n_articles,)
+        """
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"X has {X.shape[1]} features, expected {self.n_features}")
+        # CSR × vecteur dense : noyau C de scipy, somme dans l'ordre des
+        # indices de chaque ligne (comme safe_sparse_dot dans sklearn)
+        products = np.asarray(X @ self.coef, dtype=np.float64).ravel()
+        return products + self.intercept
+
+    def predict_proba(self, X):
+        """
+        Probabilités par classe (sigmoïde, comme LogisticRegression)
+
+        Args:
+            X: Matrice TF-IDF creuse ou dense (n_articles, n_features)
+
+        Returns:
+            np.ndarray: (n_articles, 2)
+        """
+        positive = expit(self.decision_function(X))
+        output = np.empty((len(positive), 2))
+        output[:, 0] = 1 - positive
+        output[:, 1] = positive
+        return output
+
+    def matches(self, model, X):
+        """
+        Vérifier que le moteur donne exactement les probabilités de sklearn
+
+        Args:
+            model: LogisticRegression d'origine
+            X: Échantillon de lignes TF-IDF
+
+        Returns:
+            bool
+        """
+        return np.array_equal(self.predict_proba(X), model.predict_proba(X))
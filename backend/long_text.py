@@ -0,0 +1,122 @@
+"""
+Stratégies pour les documents très longs
+
+Un document de plusieurs Mo (PDF extrait par le frontend) passerait en
+entier dans les regex et la lemmatisation : plusieurs secondes de CPU et
+des pics de mémoire pour un seul article. Au-delà de `max_chars`, seule
+une partie bornée du texte est analysée :
+
+- "head_tail" : le début et la fin du document (titre, chapeau et
+  conclusion portent l'essentiel du signal) ;
+- "chunks" : des segments répartis régulièrement sur tout le document,
+  notés ensemble puis agrégés (moyenne des probabilités pondérée par la
+  longueur nettoyée de chaque segment) ;
+- "reject" : le document est refusé (erreur "too_long").
+
+Les coupures tombent sur des espaces : aucun mot n'est tronqué.
+"""
+
+STRATEGIES = ('head_tail', 'chunks', 'reject')
+
+
+def _word_start(text, position):
+    """Première position >= `position` qui ne coupe pas un mot"""
+    if position <= 0 or text[position - 1].isspace():
+        return max(position, 0)
+    space = _next_space(text, position)
+    return space + 1 if space != -1 else len(text)
+
+
+def _word_end(text, position):
+    """Dernière position <= `position` qui ne coupe pas un mot"""
+    if position >= len(text) or text[position].isspace():
+        return min(position, len(text))
+    space = _previous_space(text, position)
+    return space if space != -1 else position
+
+
+def _next_space(text, position, window=100):
+    # Recherche bornée : un "mot" de plus de `window` caractères est coupé
+    for index in range(position, min(position + window, len(text))):
+        if text[index].isspace():
+            return index
+    return -1
+
+
+def _previous_space(text, position, window=100):
+    for index in range(position - 1, max(position - window, 0) - 1, -1):
+        if text[index].isspace():
+            return index
+    return -1
+
+
+class LongTextPolicy:
+    """
+    Découpage des textes plus longs que `max_chars`
+
+    Args:
+        max_chars (int): Nombre maximal de caractères analysés par texte
+            (0 = pas de limite)
+        strategy (str): "head_tail", "chunks" ou "reject"
+        segment_chars (int): Taille d'un segment (stratégie "chunks")
+    """
+
+    def __init__(self, max_chars, strategy='chunks', segment_chars=10_000):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown long text strategy: {strategy!r}")
+        self.max_chars = max_chars
+        self.strategy = strategy
+        self.segment_chars = max(1, min(segment_chars, max_chars)) if max_chars else segment_chars
+
+    @property
+    def signature(self):
+        """Identifiant des paramètres (pour l'espace de clés du cache)"""
+        if not self.max_chars:
+            return 'full'
+        return f"{self.strategy}-{self.max_chars}-{self.segment_chars}"
+
+    def split(self, text):
+        """
+        Parties du texte à analyser
+
+        Args:
+            text (str): Texte brut
+
+        Returns:
+            tuple: (segments, stratégie appliquée) ; segments vaut None si
+                le texte est refusé. Stratégie "full" : texte inchangé.
+        """
+        if not self.max_chars or len(text) <= self.max_chars:
+            return [text], 'full'
+
+        if self.strategy == 'reject':
+            return None, 'reject'
+
+        if self.strategy == 'head_tail':
+            half = self.max_chars // 2
+            head = text[:_word_end(text, half)]
+            tail = text[_word_start(text, len(text) - half):]
+            return [head + '\n' + tail], 'head_tail'
+
+        return self._sample_segments(text), 'chunks'
+
+    def _sample_segments(self, text):
+        """Segments régulièrement espacés, `max_chars` caractères au total"""
+        size = self.segment_chars
+        count = max(1, self.max_chars // size)
+        total = -(-len(text) // size)  # segments dans tout le document
+
+        # Positions de départ réparties du début à la fin du document
+        if count == 1:
+            starts = [0]
+        else:
+            step = (total - 1) / (count - 1)
+            starts = sorted({round(i * step) * size for i in range(count)})
+
+        segments = []
+        for start in starts:
+            begin = _word_start(text, start)
+            end = _word_end(text, min(start + size, len(text)))
+            if end > begin:
+                segments.append(text[begin:end])
+        return segments or [text[:size]]
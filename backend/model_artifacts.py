@@ -0,0 +1,198 @@
+"""
+Artefacts de modèle mappables en mémoire
+
+Un fichier .pkl est désérialisé en un graphe d'objets Python dans chaque
+worker gunicorn : démarrage lent et mémoire multipliée par le nombre de
+workers. Ici les tableaux (nœuds de la forêt, coefficients, IDF, termes du
+vocabulaire) sont stockés en .npy et ouverts avec `mmap_mode='r'` : les
+pages sont partagées par tous les workers via le cache de pages de l'OS.
+
+Structure d'un dossier d'artefacts :
+    manifest.json          type de modèle, paramètres, empreinte
+    forest_*.npy           tableaux de CompiledForest (modèle "forest") ;
+                           forest_node_weight.npy est facultatif (explications)
+    linear_*.npy           coefficients (modèle "linear")
+    vectorizer_terms.npy   termes du vocabulaire, par index de colonne
+    vectorizer_idf.npy     poids IDF, par index de colonne (si use_idf)
+"""
+
+import json
+import os
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from forest_engine import CompiledForest
+
+MANIFEST = 'manifest.json'
+FORMAT_VERSION = 1
+
+FOREST_ARRAYS = ('feature', 'threshold', 'left', 'right', 'node_proba', 'roots')
+
+# Absent des artefacts exportés avant les explications
+OPTIONAL_FOREST_ARRAYS = ('node_weight',)
+
+# Paramètres du vectorizer nécessaires à `transform`
+VECTORIZER_PARAMS = (
+    'analyzer', 'binary', 'lowercase', 'ngram_range', 'norm', 'smooth_idf',
+    'strip_accents', 'sublinear_tf', 'token_pattern', 'use_idf', 'stop_words'
+)
+
+
+# ============================================================
+# EXPORT
+# ============================================================
+
+def _save(directory, name, array):
+    np.save(os.path.join(directory, f"{name}.npy"), np.ascontiguousarray(array))
+
+
+def export_artifacts(model, vectorizer, directory, fingerprint=None):
+    """
+    Écrire le modèle et le vectorizer sous forme de tableaux .npy
+
+    Args:
+        model: RandomForestClassifier ou modèle linéaire (coef_/intercept_)
+        vectorizer: TfidfVectorizer ajusté
+        directory (str): Dossier de sortie (créé au besoin)
+        fingerprint (str): Version du modèle d'origine (reprise telle quelle
+            pour que les clés du cache de prédictions restent valides)
+
+    Returns:
+        dict: Contenu du manifeste écrit
+    """
+    if vectorizer.tokenizer is not None or vectorizer.preprocessor is not None:
+        raise ValueError("Vectorizers with custom tokenizer/preprocessor cannot be exported")
+    if not isinstance(vectorizer.stop_words, (type(None), str, list, tuple, set, frozenset)):
+        raise ValueError("Unsupported stop_words value")
+
+    os.makedirs(directory, exist_ok=True)
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "fingerprint": fingerprint,
+        "model_class": type(model).__name__
+    }
+
+    # 1. Modèle
+    if hasattr(model, 'estimators_'):
+        forest = model if isinstance(model, CompiledForest) else CompiledForest.from_sklearn(model)
+        for name in FOREST_ARRAYS:
+            _save(directory, f"forest_{name}", getattr(forest, name))
+        for name in OPTIONAL_FOREST_ARRAYS:
+            if getattr(forest, name) is not None:
+                _save(directory, f"forest_{name}", getattr(forest, name))
+        manifest.update({
+            "model_kind": "forest",
+            "n_features": int(forest.n_features),
+            "max_depth": int(forest.max_depth)
+        })
+        classes = forest.classes_
+    elif hasattr(model, 'coef_') and hasattr(model, 'intercept_'):
+        _save(directory, 'linear_coef', model.coef_)
+        _save(directory, 'linear_intercept', model.intercept_)
+        manifest.update({
+            "model_kind": "linear",
+            "n_features": int(model.coef_.shape[1])
+        })
+        classes = model.classes_
+    else:
+        raise TypeError(f"Unsupported model type: {type(model).__name__}")
+    manifest["classes"] = np.asarray(classes).tolist()
+
+    # 2. Vectorizer : termes rangés par index de colonne + IDF
+    terms = [None] * len(vectorizer.vocabulary_)
+    for term, column in vectorizer.vocabulary_.items():
+        terms[column] = term
+    _save(directory, 'vectorizer_terms', np.array(terms, dtype=str))
+    if vectorizer.use_idf:
+        _save(directory, 'vectorizer_idf', vectorizer.idf_)
+
+    params = {name: getattr(vectorizer, name) for name in VECTORIZER_PARAMS}
+    if isinstance(params['stop_words'], (set, frozenset, tuple)):
+        params['stop_words'] = sorted(params['stop_words'])
+    params['ngram_range'] = list(params['ngram_range'])
+    params['dtype'] = np.dtype(vectorizer.dtype).name
+    manifest["vectorizer"] = params
+
+    with open(os.path.join(directory, MANIFEST), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+# ============================================================
+# CHARGEMENT
+# ============================================================
+
+def _load(directory, name, mmap_mode):
+    return np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode)
+
+
+def read_manifest(directory):
+    """Lire le manifeste d'un dossier d'artefacts"""
+    with open(os.path.join(directory, MANIFEST), encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported artifacts format: {manifest.get('format_version')}")
+    return manifest
+
+
+def load_artifacts(directory, mmap_mode='r'):
+    """
+    Charger un modèle et un vectorizer depuis un dossier d'artefacts
+
+    Les tableaux sont mappés en mémoire (lecture seule) : le chargement est
+    quasi instantané et les pages sont partagées entre processus.
+
+    Args:
+        directory (str): Dossier produit par `export_artifacts`
+        mmap_mode (str | None): Mode passé à np.load (None = copie en mémoire)
+
+    Returns:
+        tuple: (modèle, vectorizer, empreinte)
+            - modèle : CompiledForest ou LogisticRegression
+            - vectorizer : TfidfVectorizer prêt pour `transform`
+    """
+    manifest = read_manifest(directory)
+    classes = np.asarray(manifest["classes"])
+
+    # 1. Modèle
+    if manifest["model_kind"] == "forest":
+        arrays = {name: _load(directory, f"forest_{name}", mmap_mode) for name in FOREST_ARRAYS}
+        for name in OPTIONAL_FOREST_ARRAYS:
+            if os.path.exists(os.path.join(directory, f"forest_{name}.npy")):
+                arrays[name] = _load(directory, f"forest_{name}", mmap_mode)
+        model = CompiledForest(
+            classes=classes,
+            n_features=manifest["n_features"],
+            max_depth=manifest["max_depth"],
+            **arrays
+        )
+    elif manifest["model_kind"] == "linear":
+        model = LogisticRegression()
+        model.coef_ = _load(directory, 'linear_coef', mmap_mode)
+        model.intercept_ = _load(directory, 'linear_intercept', mmap_mode)
+        model.classes_ = classes
+        model.n_features_in_ = manifest["n_features"]
+    else:
+        raise ValueError(f"Unknown model kind: {manifest['model_kind']}")
+
+    # 2. Vectorizer : le dictionnaire du vocabulaire est reconstruit
+    # (objets Python, propres à chaque worker) ; l'IDF reste mappé
+    params = dict(manifest["vectorizer"])
+    params['ngram_range'] = tuple(params['ngram_range'])
+    params['dtype'] = np.dtype(params['dtype']).type
+    terms = _load(directory, 'vectorizer_terms', None)
+    vectorizer = TfidfVectorizer(
+        vocabulary={term: column for column, term in enumerate(terms.tolist())},
+        **params
+    )
+    if vectorizer.use_idf:
+        vectorizer.idf_ = _load(directory, 'vectorizer_idf', mmap_mode)
+    else:
+        # Sans IDF, rien n'est appris : `fit` sur le vocabulaire fixé marque
+        # seulement le vectorizer comme ajusté
+        vectorizer.fit(terms.tolist())
+
+    fingerprint = manifest.get("fingerprint") or 'artifacts'
+    return model, vectorizer, fingerprint
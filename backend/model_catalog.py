@@ -0,0 +1,122 @@
+"""
+Catalogue des modèles servis (chargement paresseux, vectorizer partagé)
+
+Plusieurs modèles sont ajustés sur le même TF-IDF (tfidf_vectorizer.pkl) :
+la Random Forest optimisée ("forest") et la régression logistique
+("linear", fake_news_model.pkl). Le modèle principal est chargé au
+démarrage, les autres à leur première utilisation. Chaque requête peut
+choisir son modèle ; "cascade" note d'abord avec le modèle rapide et ne
+passe au modèle coûteux que les articles incertains, sur la même
+matrice TF-IDF (CascadeScorer).
+"""
+
+import threading
+
+from scoring import CascadeScorer
+
+# Nom réservé au mode cascade
+CASCADE = 'cascade'
+
+
+class UnknownModelError(KeyError):
+    """Modèle absent du catalogue"""
+
+
+class ModelCatalog:
+    """
+    Scorers des modèles d'un même vectorizer, créés au premier usage
+
+    Le catalogue appartient à une version servie (ModelBundle) : au
+    rechargement à chaud, un nouveau catalogue repart du seul modèle
+    principal et les autres modèles sont rechargés à leur prochain usage.
+
+    Args:
+        paths (dict): Nom → fichier .pkl du modèle
+        default (str): Nom du modèle principal
+        default_scorer (ModelScorer): Scorer du modèle principal (déjà chargé)
+        n_features (int): Nombre de colonnes du vectorizer partagé
+        load (callable): Chemin → (modèle, version) (load_model_file)
+        build_scorer (callable): (modèle, nom, version) → ModelScorer
+        cascade (tuple): (modèle rapide, modèle coûteux), ou None
+        cascade_min_confidence (float): Confiance du modèle rapide en
+            dessous de laquelle le modèle coûteux est appelé
+    """
+
+    def __init__(self, paths, default, default_scorer, n_features, load, build_scorer,
+                 cascade=None, cascade_min_confidence=0.8):
+        self.paths = dict(paths)
+        self.default = default
+        self.n_features = n_features
+        self.load = load
+        self.build_scorer = build_scorer
+        self.cascade = tuple(cascade) if cascade else None
+        self.cascade_min_confidence = cascade_min_confidence
+        self._scorers = {default: default_scorer}
+        self._cascade_scorer = None
+        self._lock = threading.Lock()
+
+    @property
+    def names(self):
+        """Modèles disponibles (y compris "cascade" si configurée)"""
+        names = list(dict.fromkeys([self.default, *self.paths]))
+        if self.cascade:
+            names.append(CASCADE)
+        return names
+
+    @property
+    def loaded(self):
+        """Modèles déjà chargés"""
+        return sorted(self._scorers)
+
+    def version(self, name):
+        """Version d'un modèle chargé (None sinon)"""
+        scorer = self._scorers.get(name)
+        return scorer.version if scorer is not None else None
+
+    def scorer(self, name=None):
+        """
+        Scorer d'un modèle, chargé au besoin
+
+        Args:
+            name (str): Nom du modèle ou "cascade" (défaut : modèle principal)
+
+        Returns:
+            ModelScorer ou CascadeScorer
+
+        Raises:
+            UnknownModelError: Modèle absent du catalogue
+            Exception: Chargement du modèle impossible
+        """
+        name = name or self.default
+        if name == CASCADE and self.cascade:
+            return self._cascade()
+
+        scorer = self._scorers.get(name)
+        if scorer is not None:
+            return scorer
+        if name not in self.paths:
+            raise UnknownModelError(name)
+
+        # Un seul chargement par modèle ; les autres modèles restent servis
+        with self._lock:
+            scorer = self._scorers.get(name)
+            if scorer is None:
+                model, version = self.load(self.paths[name])
+                n_features = getattr(model, 'n_features_in_', self.n_features)
+                if n_features != self.n_features:
+                    raise ValueError(
+                        f"Model '{name}' expects {n_features} features, "
+                        f"the shared vectorizer produces {self.n_features}"
+                    )
+                scorer = self.build_scorer(model, name, version)
+                self._scorers[name] = scorer
+        return scorer
+
+    def _cascade(self):
+        if self._cascade_scorer is None:
+            first_name, second_name = self.cascade
+            first, second = self.scorer(first_name), self.scorer(second_name)
+            with self._lock:
+                if self._cascade_scorer is None:
+                    self._cascade_scorer = CascadeScorer(first, second, self.cascade_min_confidence)
+        return self._cascade_scorer
@@ -0,0 +1,221 @@
+"""
+Chargement des modèles et choix des moteurs (inférence, vectorisation)
+
+Partagé par l'API Flask et par les traitements hors ligne (score_file.py) :
+mêmes fichiers, même empreinte de version, mêmes moteurs.
+"""
+
+import pickle
+
+import config
+from fast_vectorizer import FastTfidfVectorizer
+from forest_engine import CompiledForest
+from linear_engine import SparseLinearModel
+from model_artifacts import load_artifacts
+from result_cache import fingerprint
+
+
+def _load_pickles(model_path, vectorizer_path, log):
+    """Charger le modèle et le vectorizer depuis les fichiers .pkl"""
+    model = vectorizer = model_bytes = vectorizer_bytes = None
+
+    # Charger le modèle (forêt ou régression logistique selon le fichier)
+    try:
+        with open(model_path, 'rb') as f:
+            model_bytes = f.read()
+        model = pickle.loads(model_bytes)
+        log(f"✅ Modèle chargé : {model_path} ({type(model).__name__})")
+    except FileNotFoundError:
+        log(f"❌ ERREUR : Fichier '{model_path}' non trouvé")
+        log("   → Vérifiez que le fichier existe dans backend/models/")
+        model = None
+    except Exception as e:
+        log(f"❌ ERREUR lors du chargement du modèle : {e}")
+        model = None
+
+    # Charger le vectorizer TF-IDF
+    try:
+        with open(vectorizer_path, 'rb') as f:
+            vectorizer_bytes = f.read()
+        vectorizer = pickle.loads(vectorizer_bytes)
+        log(f"✅ Vectorizer chargé : TF-IDF")
+    except FileNotFoundError:
+        log(f"❌ ERREUR : Fichier '{vectorizer_path}' non trouvé")
+        log("   → Vérifiez que le fichier existe dans backend/models/")
+        vectorizer = None
+    except Exception as e:
+        log(f"❌ ERREUR lors du chargement du vectorizer : {e}")
+        vectorizer = None
+
+    if model is None or vectorizer is None:
+        return model, vectorizer, None
+
+    # Empreinte des fichiers chargés : identifie la version du modèle
+    return model, vectorizer, fingerprint(model_bytes, vectorizer_bytes)
+
+
+def load_models(artifacts_dir=None, model_path=None, vectorizer_path=None, log=print):
+    """
+    Charger le modèle et le vectorizer
+
+    Les artefacts .npy mappés en mémoire (convert_models.py) sont
+    préférés s'ils sont configurés ; en cas d'échec, les .pkl sont utilisés.
+
+    Args:
+        artifacts_dir (str): Dossier d'artefacts (défaut : MODEL_ARTIFACTS_DIR)
+        model_path (str): Fichier .pkl du modèle (défaut : MODEL_PATH)
+        vectorizer_path (str): Fichier .pkl du vectorizer (défaut : VECTORIZER_PATH)
+        log (callable): Fonction d'affichage des messages de chargement
+
+    Returns:
+        tuple: (modèle, vectorizer, version) ; None pour ce qui n'a pas
+            pu être chargé
+    """
+    artifacts_dir = config.MODEL_ARTIFACTS_DIR if artifacts_dir is None else artifacts_dir
+
+    # Artefacts .npy mappés en mémoire : chargement quasi instantané,
+    # pages partagées entre workers
+    if artifacts_dir:
+        try:
+            model, vectorizer, model_version = load_artifacts(artifacts_dir)
+            log(f"✅ Artefacts mappés en mémoire : {artifacts_dir} ({type(model).__name__})")
+            return model, vectorizer, model_version
+        except Exception as e:
+            log(f"❌ ERREUR lors du chargement des artefacts '{artifacts_dir}' : {e}")
+            log("   → Chargement des fichiers .pkl")
+
+    return _load_pickles(
+        model_path or config.MODEL_PATH,
+        vectorizer_path or config.VECTORIZER_PATH,
+        log
+    )
+
+
+def load_model_file(path, base_version, log=print):
+    """
+    Charger un modèle seul, pour le vectorizer déjà chargé (catalogue)
+
+    Args:
+        path (str): Fichier .pkl du modèle
+        base_version (str): Version du modèle principal (couvre le vectorizer)
+        log (callable): Fonction d'affichage
+
+    Returns:
+        tuple: (modèle, version)
+
+    Raises:
+        OSError, pickle.UnpicklingError: Fichier absent ou illisible
+    """
+    with open(path, 'rb') as f:
+        model_bytes = f.read()
+    model = pickle.loads(model_bytes)
+    log(f"✅ Modèle chargé : {path} ({type(model).__name__})")
+    return model, fingerprint(model_bytes, (base_version or '').encode())
+
+
+def build_engine(model, vectorizer, kind=None, linear=None, log=print):
+    """
+    Choisir le moteur d'inférence
+
+    Par défaut : le modèle scikit-learn tel quel. Avec kind="compiled",
+    une forêt est aplatie en tableaux NumPy (forest_engine). Une régression
+    logistique binaire passe automatiquement au moteur creux
+    (linear_engine), sauf avec linear="sklearn". Chaque moteur est soumis
+    à un contrôle de parité avec scikit-learn.
+
+    Args:
+        model: Modèle chargé (ou None)
+        vectorizer: Vectorizer chargé (sert au contrôle de parité)
+        kind (str): "sklearn" ou "compiled" (défaut : INFERENCE_ENGINE)
+        linear (str): "fast" ou "sklearn" (défaut : LINEAR_ENGINE)
+        log (callable): Fonction d'affichage
+
+    Returns:
+        Modèle exposant predict_proba (ou None si `model` est None)
+    """
+    kind = config.INFERENCE_ENGINE if kind is None else kind
+    linear = config.LINEAR_ENGINE if linear is None else linear
+
+    # Les artefacts d'une forêt sont déjà compilés
+    if model is None or isinstance(model, (CompiledForest, SparseLinearModel)):
+        return model
+
+    if SparseLinearModel.supports(model):
+        if linear != 'fast':
+            return model
+        try:
+            engine = SparseLinearModel.from_sklearn(model)
+
+            # Contrôle au démarrage : probabilités identiques au bit près
+            if vectorizer is not None:
+                probe = vectorizer.transform([' '.join(vectorizer.vocabulary_), *_PROBE_DOCUMENTS])
+                if not engine.matches(model, probe):
+                    raise ValueError("sparse linear engine does not match scikit-learn output")
+
+            log(f"⚙️  Moteur linéaire creux : {engine.n_features} poids")
+            return engine
+        except Exception as e:
+            log(f"⚠️  Moteur linéaire creux indisponible ({e}) → moteur scikit-learn")
+            return model
+
+    if kind != 'compiled':
+        return model
+
+    try:
+        compiled = CompiledForest.from_sklearn(model)
+
+        # Contrôle au démarrage : mêmes probabilités que sklearn
+        probe = vectorizer.transform([' '.join(vectorizer.vocabulary_)]) if vectorizer is not None else None
+        if probe is not None and not compiled.matches(model, probe):
+            raise ValueError("compiled engine does not match scikit-learn output")
+
+        log(f"⚙️  Moteur compilé : {compiled.n_trees} arbres, profondeur {compiled.max_depth}")
+        return compiled
+    except Exception as e:
+        log(f"⚠️  Moteur compilé indisponible ({e}) → moteur scikit-learn")
+        return model
+
+
+# Documents de contrôle : tout le vocabulaire (unigrammes et bigrammes),
+# majuscules, ponctuation, chiffres et document vide
+_PROBE_DOCUMENTS = (
+    "Breaking NEWS: the 2024 report... doctors don't want you to know!",
+    "a b c 12 x_y fake-news",
+    ""
+)
+
+
+def build_vectorizer(vectorizer, kind=None, log=print):
+    """
+    Choisir le moteur de vectorisation
+
+    Par défaut ("fast") : FastTfidfVectorizer, après un contrôle de parité
+    avec TfidfVectorizer.transform. Avec kind="sklearn", ou si la
+    configuration du vectorizer n'est pas prise en charge, le
+    vectorizer scikit-learn est utilisé tel quel.
+
+    Args:
+        vectorizer: TfidfVectorizer chargé (ou None)
+        kind (str): "fast" ou "sklearn" (défaut : VECTORIZER_ENGINE)
+        log (callable): Fonction d'affichage
+
+    Returns:
+        Objet exposant transform (ou None si `vectorizer` est None)
+    """
+    kind = config.VECTORIZER_ENGINE if kind is None else kind
+    if vectorizer is None or kind != 'fast':
+        return vectorizer
+
+    try:
+        fast = FastTfidfVectorizer.from_sklearn(vectorizer)
+
+        # Contrôle au démarrage : matrices identiques à scikit-learn
+        probe = [' '.join(vectorizer.vocabulary_)] + list(_PROBE_DOCUMENTS)
+        if not fast.matches(vectorizer, probe):
+            raise ValueError("fast vectorizer does not match scikit-learn output")
+
+        log(f"⚙️  Vectorisation rapide : {fast.n_features} colonnes")
+        return fast
+    except Exception as e:
+        log(f"⚠️  Vectorisation rapide indisponible ({e}) → vectorizer scikit-learn")
+        return vectorizer
@@ -0,0 +1,239 @@
+"""
+Registre du modèle servi : rechargement à chaud
+
+Un nouveau random_forest_optimized.pkl ne prenait effet qu'au redémarrage
+du processus. Le ModelRegistry garde une référence vers la version servie
+(ModelBundle : modèle, vectorizer, moteurs, scorer et pipeline) et la
+remplace d'un bloc :
+
+- la nouvelle paire modèle/vectorizer est chargée à côté de l'ancienne,
+  ses moteurs construits puis préchauffés par une prédiction d'exemple ;
+- la référence est ensuite remplacée par une simple affectation
+  (atomique) : une requête en cours garde la version qu'elle a lue au
+  début et se termine avec elle ;
+- l'ancienne version est libérée dès que plus aucune requête ne l'utilise.
+
+Un seul rechargement à la fois : au plus deux versions en mémoire. Le
+rechargement est déclenché explicitement (reload) ou par la surveillance
+des fichiers (thread de scrutation des tailles et dates de modification).
+"""
+
+import gc
+import os
+import threading
+import time
+
+
+def files_signature(paths):
+    """
+    Empreinte bon marché de fichiers ou de dossiers (sans les lire)
+
+    Args:
+        paths (list[str]): Fichiers ou dossiers (contenu du dossier)
+
+    Returns:
+        tuple: (chemin, taille, date de modification) de chaque fichier ;
+            taille et date valent None pour un fichier absent
+    """
+    signature = []
+    for path in paths:
+        if os.path.isdir(path):
+            entries = [os.path.join(path, name) for name in sorted(os.listdir(path))]
+        else:
+            entries = [path]
+        for entry in entries:
+            try:
+                stat = os.stat(entry)
+                signature.append((entry, stat.st_size, stat.st_mtime_ns))
+            except OSError:
+                signature.append((entry, None, None))
+    return tuple(signature)
+
+
+class ModelBundle:
+    """
+    Une version du modèle et tout ce qui en dépend
+
+    Args:
+        version (str): Empreinte des fichiers du modèle (None si non chargé)
+        model: Modèle chargé (ou None)
+        vectorizer: TfidfVectorizer chargé (ou None)
+        text_vectorizer: Moteur de vectorisation (build_vectorizer)
+        scorer (ModelScorer): Scoring du moteur d'inférence
+        pipeline (InferencePipeline): Chaîne complète (None si non chargé)
+        cache_namespace (str): Espace de clés du cache de prédictions
+        models (ModelCatalog): Modèles servis avec ce vectorizer
+    """
+
+    def __init__(self, version, model, vectorizer, text_vectorizer=None, scorer=None,
+                 pipeline=None, cache_namespace=None, models=None):
+        self.version = version
+        self.model = model
+        self.vectorizer = vectorizer
+        self.text_vectorizer = text_vectorizer
+        self.scorer = scorer
+        self.pipeline = pipeline
+        self.cache_namespace = cache_namespace
+        self.models = models
+        self.loaded_at = time.time()
+
+    @property
+    def loaded(self):
+        """Modèle et vectorizer chargés"""
+        return self.model is not None and self.vectorizer is not None
+
+
+class ModelRegistry:
+    """
+    Référence atomique vers la version du modèle servie
+
+    Le thread de surveillance est propre à chaque processus (gunicorn
+    --preload oblige) : `start_watching()` est appelé dans chaque worker
+    (hook post_worker_init). Un changement de fichiers n'est pris en
+    compte qu'une fois les fichiers stables entre deux scrutations (copie
+    terminée) ; il recharge la version même si l'empreinte du modèle
+    principal est inchangée (un autre fichier surveillé a pu changer). Un
+    chargement raté n'est retenté qu'au changement suivant.
+
+    Args:
+        load (callable): () → (modèle, vectorizer, version) (load_models)
+        build (callable): (modèle, vectorizer, version) → ModelBundle
+        warm (callable): ModelBundle → None ; lève une exception si la
+            version ne fonctionne pas (elle n'est alors pas mise en service)
+        watch_paths (list[str]): Fichiers ou dossiers surveillés
+        poll_interval (float): Secondes entre deux scrutations (0 = pas de
+            surveillance)
+        on_swap (callable): ModelBundle → None, appelé après chaque mise en
+            service (invalidation du cache de prédictions)
+        log (callable): Fonction d'affichage
+    """
+
+    def __init__(self, load, build, warm=None, watch_paths=(), poll_interval=0,
+                 on_swap=None, log=print):
+        self.load = load
+        self.build = build
+        self.warm = warm
+        self.watch_paths = [path for path in watch_paths if path]
+        self.poll_interval = poll_interval
+        self.on_swap = on_swap
+        self.log = log
+        self.reloads = 0
+        self._current = None
+        self._signature = files_signature(self.watch_paths)
+        self._reload_lock = threading.Lock()
+        self._watch_lock = threading.Lock()
+        self._watch_pid = None
+
+    @property
+    def current(self):
+        """Version servie (à lire une seule fois par requête)"""
+        return self._current
+
+    def install(self, bundle):
+        """
+        Mettre une version en service sans la préchauffer (démarrage)
+
+        Returns:
+            ModelBundle
+        """
+        self._current = bundle
+        if self.on_swap is not None:
+            self.on_swap(bundle)
+        return bundle
+
+    def reload(self, force=False):
+        """
+        Charger la version présente sur disque et la mettre en service
+
+        Args:
+            force (bool): Remplacer la version servie même si l'empreinte
+                des fichiers n'a pas changé
+
+        Returns:
+            dict: reloaded (bool), version, previous_version, et la raison
+                (reason) ou l'erreur (error) si rien n'a été remplacé
+        """
+        previous = self._current
+        previous_version = previous.version if previous is not None else None
+        outcome = {"reloaded": False, "version": previous_version, "previous_version": previous_version}
+
+        # Un seul rechargement à la fois (au plus deux versions en mémoire)
+        if not self._reload_lock.acquire(blocking=False):
+            return dict(outcome, reason="reload already in progress")
+
+        try:
+            signature = files_signature(self.watch_paths)
+            self._signature = signature
+
+            model, vectorizer, version = self.load()
+            if model is None or vectorizer is None:
+                return dict(outcome, error="models failed to load")
+            if version == previous_version and not force:
+                return dict(outcome, reason="unchanged")
+
+            bundle = self.build(model, vectorizer, version)
+            del model, vectorizer
+            if self.warm is not None:
+                self.warm(bundle)
+
+            # Remplacement atomique : les requêtes en cours gardent leur version
+            self._current = bundle
+            self.reloads += 1
+            if self.on_swap is not None:
+                self.on_swap(bundle)
+            self.log(f"🔄 Modèle rechargé : {previous_version} → {version}")
+            return dict(outcome, reloaded=True, version=version)
+        except Exception as e:
+            self.log(f"❌ Rechargement du modèle échoué (version {previous_version} conservée) : {e}")
+            return dict(outcome, error=str(e))
+        finally:
+            previous = None
+            self._reload_lock.release()
+            # Libérer l'ancienne version (ou la version rejetée) sans attendre
+            gc.collect()
+
+    def start_watching(self):
+        """
+        Démarrer le thread de surveillance dans le processus courant
+
+        Returns:
+            bool: True si la surveillance est active
+        """
+        if self.poll_interval <= 0 or not self.watch_paths:
+            return False
+        if self._watch_pid == os.getpid():
+            return True
+        with self._watch_lock:
+            if self._watch_pid != os.getpid():
+                threading.Thread(target=self._watch, name='model-watcher', daemon=True).start()
+                self._watch_pid = os.getpid()
+        return True
+
+    def _watch(self):
+        pending = None
+        while True:
+            time.sleep(self.poll_interval)
+            try:
+                signature = files_signature(self.watch_paths)
+                if signature == self._signature:
+                    pending = None
+                    continue
+                # Fichiers encore en cours d'écriture : attendre qu'ils ne changent plus
+                if signature != pending:
+                    pending = signature
+                    continue
+                pending = None
+                self.reload(force=True)
+            except Exception as e:
+                self.log(f"❌ Surveillance des modèles : {e}")
+
+    def status(self):
+        """Version servie, date de chargement et nombre de rechargements"""
+        bundle = self._current
+        return {
+            "model_version": bundle.version if bundle is not None else None,
+            "loaded_at": bundle.loaded_at if bundle is not None else None,
+            "reloads": self.reloads,
+            "watching": self._watch_pid == os.getpid(),
+            "watch_interval": self.poll_interval
+        }
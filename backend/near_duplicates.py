@@ -0,0 +1,345 @@
+"""
+Index des articles quasi dupliqués (MinHash + LSH)
+
+Une campagne coordonnée republie le même article avec de petites
+retouches : le cache exact (texte normalisé) ne les reconnaît pas et
+chaque variante repasse par toute la forêt. L'index garde une signature
+MinHash des articles récemment notés, calculée sur les mots nettoyés
+(mêmes mots que le vectorizer) :
+
+- signature : pour chaque permutation, minimum d'un hachage
+  multiplicatif des n-grammes de mots (shingles) ; la proportion de
+  minimums égaux estime la similarité de Jaccard entre deux articles ;
+- LSH : la signature est découpée en bandes ; deux articles partageant
+  une bande sont candidats, puis comparés sur la signature entière ;
+- mémoire bornée : anneau de `maxsize` emplacements (le plus ancien est
+  remplacé), une entrée de dictionnaire par bande et par article ;
+- persistance : fichier JSON local (écriture atomique), rechargé au
+  démarrage si les paramètres de hachage sont les mêmes.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from result_cache import normalize_text
+
+# Champs du résultat réutilisés pour un quasi-doublon (verdict et modèle)
+VERDICT_FIELDS = ('prediction', 'label', 'confidence', 'probabilities', 'model_id')
+
+# Multiplicateur (premier FNV 64 bits) combinant les hachages des mots d'un n-gramme
+SHINGLE_BASE = np.uint64(0x100000001B3)
+
+# Version du format du fichier de persistance
+FILE_FORMAT = 1
+
+
+def article_id(text):
+    """
+    Identifiant d'un article sans identifiant fourni
+
+    Args:
+        text (str): Texte brut
+
+    Returns:
+        str: 16 premiers caractères du SHA-256 du texte normalisé
+    """
+    return hashlib.sha256(normalize_text(text).encode('utf-8', 'surrogatepass')).hexdigest()[:16]
+
+
+class NearDuplicateIndex:
+    """
+    Index MinHash/LSH borné des derniers articles notés
+
+    Chaque entrée appartient à un espace de noms (version du modèle, seuil,
+    traitement des textes longs) : un article n'est reconnu que parmi les
+    articles notés par le même modèle dans la même configuration.
+
+    Args:
+        maxsize (int): Nombre maximal d'articles gardés
+        threshold (float): Similarité estimée minimale d'un quasi-doublon
+        num_perm (int): Longueur de la signature MinHash
+        bands (int): Nombre de bandes LSH (diviseur de num_perm)
+        shingle_size (int): Longueur des n-grammes de mots
+        ttl (float): Durée de vie d'une entrée en secondes (0 = illimitée)
+        seed (int): Graine des fonctions de hachage
+    """
+
+    def __init__(self, maxsize=20_000, threshold=0.85, num_perm=64, bands=8, shingle_size=2,
+                 ttl=0, seed=1):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.ttl = ttl
+        self.seed = seed
+
+        # Hachage multiplicatif (a·x + b mod 2^64) >> 32, a impair
+        rng = np.random.default_rng(seed)
+        self._mult = rng.integers(1, 2**63, size=(num_perm, 1), dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._add = rng.integers(0, 2**63, size=(num_perm, 1), dtype=np.uint64)
+        self._band_mult = rng.integers(1, 2**63, size=self.rows, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+
+        self.model_version = None
+        self._signatures = np.zeros((maxsize, num_perm), dtype=np.uint32)
+        self._ids = [None] * maxsize
+        self._namespaces = [None] * maxsize
+        self._results = [None] * maxsize
+        self._expires = [0.0] * maxsize
+        self._keys = [None] * maxsize
+        self._slots = {}  # (espace de noms, identifiant) → emplacement
+        self._buckets = [{} for _ in range(bands)]  # clé de bande → emplacement le plus récent
+        self._next = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # ------------------------------------------------------------
+    # Signatures
+    # ------------------------------------------------------------
+
+    def signature(self, words):
+        """
+        Signature MinHash d'une liste de mots nettoyés
+
+        Args:
+            words (list[str]): Mots nettoyés (clean_words, ou texte nettoyé découpé)
+
+        Returns:
+            np.ndarray: (num_perm,) uint32, ou None si le texte n'a aucun mot
+        """
+        if not words:
+            return None
+        hashes = np.fromiter(
+            (zlib.crc32(word.encode('utf-8', 'surrogatepass')) for word in words),
+            dtype=np.uint64, count=len(words)
+        )
+
+        # Dépassements voulus : arithmétique modulo 2^64
+        with np.errstate(over='ignore'):
+            # n-gramme de mots = combinaison polynomiale des hachages de ses mots
+            size = min(self.shingle_size, len(words))
+            shingles = hashes[:len(words) - size + 1].copy()
+            for offset in range(1, size):
+                shingles = shingles * SHINGLE_BASE + hashes[offset:len(words) - size + 1 + offset]
+            shingles = np.unique(shingles)
+
+            permuted = (self._mult * shingles + self._add) >> np.uint64(32)
+        return permuted.min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, signature):
+        with np.errstate(over='ignore'):
+            keys = (signature.reshape(self.bands, self.rows).astype(np.uint64) * self._band_mult).sum(axis=1)
+        return keys.tolist()
+
+    # ------------------------------------------------------------
+    # Recherche et insertion
+    # ------------------------------------------------------------
+
+    def lookup(self, signature, namespace):
+        """
+        Chercher un article déjà noté assez similaire
+
+        Args:
+            signature (np.ndarray): Signature de l'article (self.signature)
+            namespace (str): Espace de noms du scorer
+
+        Returns:
+            dict: Verdict de l'article trouvé (VERDICT_FIELDS) et
+                near_duplicate {"id", "similarity"} ; None sinon
+        """
+        if signature is None:
+            return None
+        keys = self._band_keys(signature)
+        now = time.time()
+
+        with self._lock:
+            candidates = {
+                slot for slot in (bucket.get(key) for bucket, key in zip(self._buckets, keys))
+                if slot is not None
+                and self._namespaces[slot] == namespace
+                and (not self._expires[slot] or self._expires[slot] > now)
+            }
+            best, best_similarity = None, 0.0
+            if candidates:
+                slots = np.fromiter(candidates, dtype=np.intp, count=len(candidates))
+                similarities = (self._signatures[slots] == signature).mean(axis=1)
+                position = int(similarities.argmax())
+                best, best_similarity = int(slots[position]), float(similarities[position])
+
+            if best is None or best_similarity < self.threshold:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return dict(
+                self._results[best],
+                near_duplicate={"id": self._ids[best], "similarity": round(best_similarity, 4)}
+            )
+
+    def add(self, item_id, signature, namespace, result, expires_at=None):
+        """
+        Ajouter (ou remplacer) un article noté
+
+        Args:
+            item_id (str): Identifiant de l'article (fourni ou article_id)
+            signature (np.ndarray): Signature de l'article
+            namespace (str): Espace de noms du scorer
+            result (dict): Résultat ; seuls VERDICT_FIELDS sont gardés
+            expires_at (float): Date d'expiration (défaut : maintenant + ttl)
+        """
+        if signature is None or self.maxsize <= 0:
+            return
+        verdict = {field: result[field] for field in VERDICT_FIELDS if field in result}
+        keys = self._band_keys(signature)
+        if expires_at is None:
+            expires_at = time.time() + self.ttl if self.ttl else 0.0
+
+        with self._lock:
+            slot = self._slots.get((namespace, item_id))
+            if slot is None:
+                # Anneau : l'emplacement suivant est le plus ancien
+                slot = self._next
+                self._next = (self._next + 1) % self.maxsize
+                if self._ids[slot] is not None:
+                    self.evictions += 1
+            self._release(slot)
+
+            self._signatures[slot] = signature
+            self._ids[slot] = item_id
+            self._namespaces[slot] = namespace
+            self._results[slot] = verdict
+            self._expires[slot] = expires_at
+            self._keys[slot] = keys
+            self._slots[(namespace, item_id)] = slot
+            for bucket, key in zip(self._buckets, keys):
+                bucket[key] = slot
+
+    def _release(self, slot):
+        """Retirer l'article d'un emplacement des tables (verrou tenu)"""
+        if self._ids[slot] is None:
+            return
+        for bucket, key in zip(self._buckets, self._keys[slot]):
+            if bucket.get(key) == slot:
+                del bucket[key]
+        del self._slots[(self._namespaces[slot], self._ids[slot])]
+        self._ids[slot] = self._namespaces[slot] = self._results[slot] = self._keys[slot] = None
+
+    def clear(self):
+        """Vider l'index"""
+        with self._lock:
+            for slot in range(self.maxsize):
+                self._release(slot)
+            self._next = 0
+
+    def bind_model_version(self, model_version):
+        """Vider l'index si le modèle principal a changé"""
+        if self.model_version != model_version:
+            self.evictions += len(self)
+            self.clear()
+            self.model_version = model_version
+
+    def __len__(self):
+        return len(self._slots)
+
+    # ------------------------------------------------------------
+    # Persistance
+    # ------------------------------------------------------------
+
+    @property
+    def params(self):
+        """Paramètres dont dépendent les signatures"""
+        return {
+            "num_perm": self.num_perm,
+            "bands": self.bands,
+            "shingle_size": self.shingle_size,
+            "seed": self.seed
+        }
+
+    def save(self, path):
+        """
+        Écrire l'index dans un fichier JSON (écriture atomique)
+
+        Returns:
+            int: Nombre d'articles écrits
+        """
+        now = time.time()
+        with self._lock:
+            # Du plus ancien au plus récent : le rechargement garde l'ordre d'éviction
+            order = [(self._next + offset) % self.maxsize for offset in range(self.maxsize)]
+            entries = [
+                {
+                    "id": self._ids[slot],
+                    "namespace": self._namespaces[slot],
+                    "signature": self._signatures[slot].tobytes().hex(),
+                    "result": self._results[slot],
+                    "expires_at": self._expires[slot]
+                }
+                for slot in order
+                if self._ids[slot] is not None and (not self._expires[slot] or self._expires[slot] > now)
+            ]
+            payload = {
+                "format": FILE_FORMAT,
+                "params": self.params,
+                "model_version": self.model_version,
+                "entries": entries
+            }
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, path)
+        return len(entries)
+
+    def load(self, path):
+        """
+        Recharger un index écrit par `save`
+
+        Le fichier est ignoré si ses paramètres de hachage diffèrent.
+
+        Returns:
+            int: Nombre d'articles rechargés
+        """
+        with open(path, encoding='utf-8') as f:
+            payload = json.load(f)
+        if payload.get("format") != FILE_FORMAT or payload.get("params") != self.params:
+            raise ValueError("index file was written with different hashing parameters")
+
+        self.clear()
+        self.model_version = payload.get("model_version")
+        now = time.time()
+        loaded = 0
+        for entry in payload["entries"][-self.maxsize:]:
+            if entry["expires_at"] and entry["expires_at"] <= now:
+                continue
+            signature = np.frombuffer(bytes.fromhex(entry["signature"]), dtype=np.uint32)
+            self.add(entry["id"], signature, entry["namespace"], entry["result"], entry["expires_at"])
+            loaded += 1
+        return loaded
+
+    def stats(self):
+        """Statistiques de l'index"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self),
+            "maxsize": self.maxsize,
+            "threshold": self.threshold,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,208 @@
+"""
+Nettoyage parallèle des textes sur plusieurs cœurs
+
+Le nettoyage (regex, stopwords, lemmatisation WordNet) est du Python pur :
+il garde le GIL et un gros lot n'utilise qu'un seul cœur. Le
+ParallelPreprocessor répartit les textes d'un lot entre des processus,
+chacun avec son propre TextPreprocessor, et rend les textes nettoyés dans
+l'ordre d'entrée, identiques au nettoyage en série.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from preprocessing import TextPreprocessor
+
+# "fork" : démarrage rapide, sans réimporter le module principal
+# (qui rechargerait les modèles) ; "spawn" là où fork n'existe pas
+START_METHOD = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn'
+
+# Préprocesseur du processus de nettoyage courant
+_worker_preprocessor = None
+
+
+def _init_worker(language, lemma_cache_size):
+    global _worker_preprocessor
+    _worker_preprocessor = TextPreprocessor(language, lemma_cache_size)
+
+
+def _clean_chunk(texts):
+    clean = _worker_preprocessor.clean
+    cleaned = []
+    for text in texts:
+        # Même repli que clean_text : texte inchangé en cas d'erreur
+        try:
+            cleaned.append(clean(text))
+        except Exception:
+            cleaned.append(text)
+    return cleaned
+
+
+def _tokens_chunk(texts):
+    tokens = _worker_preprocessor.tokens
+    words = []
+    for text in texts:
+        # Repli équivalent : le texte brut comme un seul mot
+        try:
+            words.append(tokens(text))
+        except Exception:
+            words.append([text])
+    return words
+
+
+def _warmup():
+    return os.getpid()
+
+
+def split_by_length(texts, target_chars):
+    """
+    Découper une liste de textes en paquets contigus de taille comparable
+
+    Un paquet est fermé dès que la longueur cumulée de ses textes atteint
+    `target_chars` : quelques longs articles forment un paquet, de
+    nombreux textes courts en forment un autre.
+
+    Args:
+        texts (list[str]): Textes à découper
+        target_chars (int): Longueur cumulée visée par paquet
+
+    Returns:
+        list[list[str]]: Paquets, dans l'ordre
+    """
+    chunks = []
+    chunk = []
+    size = 0
+    for text in texts:
+        chunk.append(text)
+        size += len(text)
+        if size >= target_chars:
+            chunks.append(chunk)
+            chunk = []
+            size = 0
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+class ParallelPreprocessor:
+    """
+    Pool de processus de nettoyage, démarré et préchauffé une seule fois
+
+    Les lots dont la taille totale est inférieure à `min_parallel_chars`
+    sont nettoyés dans le processus courant (l'envoi aux processus coûte
+    plus qu'il ne rapporte). Au-delà, le lot est découpé en environ
+    `chunks_per_worker` paquets par processus, de longueur cumulée
+    comparable.
+
+    Le pool est propre à chaque processus (gunicorn --preload oblige) et
+    doit être démarré par `start()` avant que le worker ne serve des
+    requêtes (hook post_worker_init) : les processus de nettoyage sont
+    alors créés par fork alors que le worker n'a encore qu'un seul thread,
+    et héritent des données NLTK déjà chargées. Sinon il est démarré au
+    premier gros lot. Si le pool est cassé (processus tué), le lot est
+    nettoyé en série et un nouveau pool est créé au lot suivant.
+
+    Args:
+        workers (int): Nombre de processus de nettoyage
+        fallback (callable): Nettoyage en série d'un texte (clean_text)
+        fallback_tokens (callable): Mots nettoyés d'un texte, en série
+            (pour tokens_many)
+        language (str): Langue des stopwords NLTK
+        lemma_cache_size (int): Taille du cache de lemmes de chaque processus
+        min_parallel_chars (int): Taille de lot en dessous de laquelle le
+            nettoyage reste en série
+        chunks_per_worker (int): Paquets visés par processus et par lot
+    """
+
+    def __init__(self, workers, fallback, fallback_tokens=None, language='english',
+                 lemma_cache_size=0, min_parallel_chars=200_000, chunks_per_worker=4):
+        self.workers = workers
+        self.fallback = fallback
+        self.fallback_tokens = fallback_tokens
+        self.language = language
+        self.lemma_cache_size = lemma_cache_size
+        self.min_parallel_chars = min_parallel_chars
+        self.chunks_per_worker = chunks_per_worker
+        self._pool = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """
+        Démarrer et préchauffer le pool (stopwords et WordNet chargés dans
+        chaque processus) ; sans effet s'il tourne déjà dans ce processus
+
+        Returns:
+            ProcessPoolExecutor
+        """
+        if self._pid == os.getpid():
+            return self._pool
+        with self._lock:
+            if self._pid == os.getpid():
+                return self._pool
+            pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context(START_METHOD),
+                initializer=_init_worker,
+                initargs=(self.language, self.lemma_cache_size)
+            )
+            # Une tâche par processus : tous démarrent et s'initialisent maintenant
+            for future in [pool.submit(_warmup) for _ in range(self.workers)]:
+                future.result()
+            self._pool = pool
+            self._pid = os.getpid()
+            return pool
+
+    def close(self):
+        """Arrêter le pool du processus courant"""
+        with self._lock:
+            if self._pool is not None and self._pid == os.getpid():
+                self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+            self._pid = None
+
+    def _map(self, chunk_function, serial_function, texts):
+        total_chars = sum(len(text) for text in texts)
+        if self.workers <= 1 or len(texts) < 2 or total_chars < self.min_parallel_chars:
+            return [serial_function(text) for text in texts]
+
+        target_chars = max(total_chars // (self.workers * self.chunks_per_worker), 1)
+        chunks = split_by_length(texts, target_chars)
+
+        try:
+            pool = self.start()
+            results = []
+            for chunk_result in pool.map(chunk_function, chunks):
+                results.extend(chunk_result)
+            return results
+        except BrokenProcessPool:
+            self.close()
+            return [serial_function(text) for text in texts]
+
+    def clean_many(self, texts):
+        """
+        Nettoyer une liste de textes
+
+        Args:
+            texts (list[str]): Textes bruts
+
+        Returns:
+            list[str]: Textes nettoyés, dans le même ordre et identiques
+                au nettoyage en série
+        """
+        return self._map(_clean_chunk, self.fallback, texts)
+
+    def tokens_many(self, texts):
+        """
+        Mots nettoyés d'une liste de textes (chemin fusionné)
+
+        Args:
+            texts (list[str]): Textes bruts
+
+        Returns:
+            list[list[str]]: Mots de chaque texte, dans le même ordre
+        """
+        return self._map(_tokens_chunk, self.fallback_tokens, texts)
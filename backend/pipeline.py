@@ -0,0 +1,307 @@
+"""
+Pipeline d'inférence par lots : nettoyage → vectorisation → scoring
+
+Partagé par /predict/batch, le micro-batching de /predict et tous les
+chemins qui notent plusieurs articles : les textes valides sont vectorisés
+en une seule matrice creuse et notés par un seul appel au modèle.
+"""
+
+from contextlib import nullcontext
+
+from near_duplicates import article_id
+
+# Longueurs minimales (mêmes règles que /predict)
+MIN_TEXT_LENGTH = 10
+MIN_CLEANED_LENGTH = 5
+
+# Erreurs rapportées article par article : code → (error, message)
+ITEM_ERRORS = {
+    'missing_text': (
+        "Missing 'text' field",
+        "Each item must provide a 'text' string"
+    ),
+    'too_short': (
+        "Text too short",
+        "Please provide at least 10 characters"
+    ),
+    'too_long': (
+        "Text too long",
+        "Text exceeds the maximum length accepted by the server"
+    ),
+    'empty_after_cleaning': (
+        "Text cleaning resulted in empty string",
+        "Text contains no meaningful content after preprocessing"
+    ),
+}
+
+
+def item_error(code):
+    """
+    Construire l'erreur d'un article
+
+    Args:
+        code (str): Clé de ITEM_ERRORS
+
+    Returns:
+        dict: {"error": ..., "message": ..., "error_code": code}
+    """
+    error, message = ITEM_ERRORS[code]
+    return {"error": error, "message": message, "error_code": code}
+
+
+class InferencePipeline:
+    """
+    Chaîne nettoyage → vectorisation → scoring pour une liste d'articles
+
+    Args:
+        clean (callable): Fonction de nettoyage (texte brut → texte nettoyé)
+        vectorizer: TfidfVectorizer ajusté
+        scorer: ModelScorer
+        clean_many (callable): Nettoyage d'une liste de textes, dans l'ordre
+            (ex : ParallelPreprocessor.clean_many) ; défaut : `clean` en série
+        tokenize (callable): Texte brut → liste de mots nettoyés. Si le
+            vectorizer expose `transform_words`, les mots sont vectorisés
+            directement, sans passer par le texte nettoyé (chemin fusionné)
+        tokens_many (callable): Version par lot de `tokenize`
+            (ex : ParallelPreprocessor.tokens_many) ; défaut : en série
+        long_text (LongTextPolicy): Traitement des textes très longs
+            (None : textes analysés en entier)
+    """
+
+    def __init__(self, clean, vectorizer, scorer, clean_many=None, tokenize=None, tokens_many=None,
+                 long_text=None):
+        self.clean = clean
+        self.vectorizer = vectorizer
+        self.scorer = scorer
+        self.long_text = long_text
+        self.clean_many = clean_many or (lambda texts: [clean(text) for text in texts])
+
+        # Chemin fusionné nettoyage + vectorisation
+        self.fused = tokenize is not None and hasattr(vectorizer, 'transform_words')
+        if self.fused:
+            self.tokens_many = tokens_many or (lambda texts: [tokenize(text) for text in texts])
+
+    def _stage(self, trace, name):
+        return trace.stage(name) if trace is not None else nullcontext()
+
+    def _vectorize(self, documents):
+        if self.fused:
+            return self.vectorizer.transform_words(documents)
+        return self.vectorizer.transform(documents)
+
+    def _probabilities(self, vectorize, documents, trace):
+        with self._stage(trace, 'vectorize'):
+            matrix = vectorize(documents)
+        with self._stage(trace, 'score'):
+            return self.scorer.predict_proba(matrix)
+
+    def _results(self, probabilities):
+        predictions = self.scorer.labels(probabilities)
+        return [
+            self.scorer.result(prediction, probs)
+            for prediction, probs in zip(predictions, probabilities)
+        ]
+
+    def predict_cleaned(self, cleaned_texts, trace=None):
+        """
+        Noter des textes déjà nettoyés (un transform, un predict_proba)
+
+        Args:
+            cleaned_texts (list[str]): Textes nettoyés non vides
+            trace (RequestTrace): Chronométrage optionnel
+
+        Returns:
+            list[dict]: prediction, label, confidence, probabilities
+        """
+        if not cleaned_texts:
+            return []
+        return self._results(self._probabilities(self.vectorizer.transform, cleaned_texts, trace))
+
+    def predict_words(self, word_lists, trace=None):
+        """
+        Noter des listes de mots nettoyés (chemin fusionné)
+
+        Args:
+            word_lists (list[list[str]]): Mots nettoyés de chaque texte
+            trace (RequestTrace): Chronométrage optionnel
+
+        Returns:
+            list[dict]: Mêmes résultats que predict_cleaned sur les textes
+                ' '.join(words)
+        """
+        if not word_lists:
+            return []
+        return self._results(self._probabilities(self.vectorizer.transform_words, word_lists, trace))
+
+    def _clean_pieces(self, pieces):
+        """
+        Nettoyer des textes (ou segments de textes)
+
+        Returns:
+            tuple: (documents pour le vectorizer, longueurs nettoyées)
+        """
+        if self.fused:
+            # Mots nettoyés ; longueur de ' '.join(words) sans construire la chaîne
+            documents = self.tokens_many(pieces)
+            lengths = [sum(map(len, words)) + len(words) - 1 if words else 0 for words in documents]
+        else:
+            documents = self.clean_many(pieces)
+            lengths = [len(cleaned) for cleaned in documents]
+        return documents, lengths
+
+    def _words(self, documents):
+        """Mots nettoyés de documents (listes de mots ou textes nettoyés)"""
+        if self.fused:
+            return [word for words in documents for word in words]
+        return [word for document in documents for word in document.split()]
+
+    def predict_texts(self, texts, trace=None, scorer=None, near_duplicates=None, namespace=None,
+                      ids=None, force=False, explain=0):
+        """
+        Valider, nettoyer et noter des textes bruts
+
+        Les textes plus longs que la limite configurée sont réduits selon
+        la politique `long_text` ; avec la stratégie "chunks", les segments
+        de tous les textes sont notés dans la même matrice puis agrégés
+        par texte (moyenne pondérée par la longueur nettoyée).
+
+        Args:
+            texts (list): Textes bruts (un élément non textuel est une erreur)
+            trace (RequestTrace): Chronométrage optionnel
+            scorer: Scorer à utiliser à la place de celui du pipeline
+                (ModelScorer d'un autre modèle ou CascadeScorer)
+            near_duplicates (NearDuplicateIndex): Index des articles déjà
+                notés ; un quasi-doublon reprend leur verdict sans passer
+                par la vectorisation ni le modèle
+            namespace (str): Espace de noms du scorer dans l'index
+            ids (list): Identifiant de chaque texte (None : article_id)
+            force (bool): Noter tous les textes, sans chercher de
+                quasi-doublon (les textes notés sont tout de même indexés)
+            explain (int): Nombre de termes de l'explication de chaque
+                texte (0 : pas d'explication) ; un texte à expliquer est
+                toujours noté, sans chercher de quasi-doublon
+
+        Returns:
+            list[dict]: Pour chaque texte, dans l'ordre, soit le résultat
+                (avec text_length, cleaned_length, text_strategy et
+                model_id, le modèle qui a noté le texte ; near_duplicate
+                {"id", "similarity"} si le verdict est celui d'un
+                quasi-doublon ; explanation si `explain`), soit une erreur
+                (error, message, error_code)
+        """
+        outputs = [None] * len(texts)
+        item_indices = []
+        item_segments = []
+        pieces = []
+
+        with self._stage(trace, 'clean'):
+            for index, text in enumerate(texts):
+                if not isinstance(text, str):
+                    outputs[index] = item_error('missing_text')
+                    continue
+                if len(text.strip()) < MIN_TEXT_LENGTH:
+                    outputs[index] = item_error('too_short')
+                    continue
+
+                if self.long_text is not None:
+                    segments, strategy = self.long_text.split(text)
+                else:
+                    segments, strategy = [text], 'full'
+                if segments is None:
+                    outputs[index] = item_error('too_long')
+                    continue
+
+                outputs[index] = {"text_length": len(text), "text_strategy": strategy}
+                if strategy != 'full':
+                    outputs[index]["analyzed_length"] = sum(len(segment) for segment in segments)
+                if strategy == 'chunks':
+                    outputs[index]["segments"] = len(segments)
+
+                item_indices.append(index)
+                item_segments.append(len(segments))
+                pieces.extend(segments)
+
+            documents, lengths = self._clean_pieces(pieces)
+
+            # Segments non vides de chaque texte ; un texte est valide si son
+            # texte nettoyé (segments joints) est assez long
+            candidates = []
+            position = 0
+            for index, count in zip(item_indices, item_segments):
+                kept = [
+                    (documents[i], lengths[i]) for i in range(position, position + count)
+                    if lengths[i] > 0
+                ]
+                position += count
+
+                cleaned_length = sum(length for _, length in kept) + max(len(kept) - 1, 0)
+                if cleaned_length < MIN_CLEANED_LENGTH:
+                    outputs[index] = item_error('empty_after_cleaning')
+                    continue
+
+                outputs[index]["cleaned_length"] = cleaned_length
+                candidates.append((index, kept))
+
+        # Quasi-doublons d'articles déjà notés : verdict repris tel quel
+        signatures = {}
+        if near_duplicates is not None and candidates:
+            with self._stage(trace, 'near_duplicate'):
+                remaining = []
+                for index, kept in candidates:
+                    signature = near_duplicates.signature(self._words([document for document, _ in kept]))
+                    match = None if force or explain else near_duplicates.lookup(signature, namespace)
+                    if match is not None:
+                        outputs[index].update(match)
+                        continue
+                    signatures[index] = signature
+                    remaining.append((index, kept))
+                candidates = remaining
+
+        valid_indices = []
+        spans = []
+        valid_documents = []
+        valid_lengths = []
+        for index, kept in candidates:
+            valid_indices.append(index)
+            spans.append((len(valid_documents), len(valid_documents) + len(kept)))
+            valid_documents.extend(document for document, _ in kept)
+            valid_lengths.extend(length for _, length in kept)
+
+        if not valid_documents:
+            return outputs
+
+        # Une seule matrice TF-IDF, quel que soit le nombre de modèles appelés
+        scorer = scorer or self.scorer
+        with self._stage(trace, 'vectorize'):
+            matrix = self._vectorize(valid_documents)
+
+        # Un texte = une ligne, ou la moyenne pondérée de ses segments
+        with self._stage(trace, 'score'):
+            probabilities, names = scorer.score_items(
+                matrix,
+                spans if len(spans) != len(valid_documents) else None,
+                valid_lengths
+            )
+            predictions = scorer.labels(probabilities)
+
+        for index, prediction, probs, name in zip(valid_indices, predictions, probabilities, names):
+            outputs[index].update(scorer.result(prediction, probs))
+            if name is not None:
+                outputs[index]["model_id"] = name
+
+        # Termes qui ont le plus pesé : lecture creuse de la matrice déjà calculée
+        if explain:
+            with self._stage(trace, 'explain'):
+                for index, (begin, end), name in zip(valid_indices, spans, names):
+                    contributions = scorer.contributions_for(name)
+                    outputs[index]["explanation"] = (
+                        contributions.explain(matrix, begin, end, valid_lengths, explain)
+                        if contributions is not None else None
+                    )
+
+        # Articles notés : candidats pour les prochains quasi-doublons
+        for index, signature in signatures.items():
+            item_id = ids[index] if ids is not None and ids[index] is not None else article_id(texts[index])
+            near_duplicates.add(str(item_id), signature, namespace, outputs[index])
+
+        return outputs
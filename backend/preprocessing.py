@@ -0,0 +1,237 @@
+"""
+Prétraitement du texte pour la Détection de Fake News
+
+Le préprocesseur est construit une seule fois au démarrage puis partagé
+par toutes les requêtes (et tous les threads) de l'API.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+
+from nltk.corpus import stopwords
+from nltk.stem import WordNetLemmatizer
+
+# ============================================================
+# EXPRESSIONS RÉGULIÈRES PRÉCOMPILÉES
+# ============================================================
+
+# URLs (http://, https://, www.)
+URL_PATTERN = re.compile(r'http\S+|www\S+|https\S+')
+
+# Adresses email
+EMAIL_PATTERN = re.compile(r'\S+@\S+')
+
+# Tout ce qui n'est ni une lettre ni un espace
+# (le texte est déjà en minuscules à cette étape)
+NON_LETTER_PATTERN = re.compile(r'[^a-z\s]+')
+
+
+# ============================================================
+# CACHE DE LEMMES
+# ============================================================
+
+class LemmaCache:
+    """
+    Cache LRU borné devant `WordNetLemmatizer.lemmatize`
+
+    Le vocabulaire des articles suit une loi de Zipf : quelques milliers de
+    mots représentent l'essentiel des tokens. Le cache garde les lemmes les
+    plus récemment utilisés et évince les plus anciens au-delà de `maxsize`.
+
+    Les compteurs (hits, misses, évictions) sont exposés par `stats()`.
+    """
+
+    def __init__(self, lemmatize, maxsize):
+        self._lemmatize = lemmatize
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __call__(self, word):
+        """Retourner le lemme de `word` (calculé au besoin puis mis en cache)"""
+        with self._lock:
+            lemma = self._data.get(word)
+            if lemma is not None:
+                self._data.move_to_end(word)
+                self.hits += 1
+                return lemma
+            self.misses += 1
+
+        # Le lemmatiseur est appelé hors du verrou
+        lemma = self._lemmatize(word)
+        self._store(word, lemma)
+        return lemma
+
+    def _store(self, word, lemma, replace=True):
+        """Insérer un lemme (sans écraser un mot présent si replace=False)"""
+        with self._lock:
+            if not replace and word in self._data:
+                return False
+            self._data[word] = lemma
+            self._data.move_to_end(word)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+            return True
+
+    def preload(self, words):
+        """
+        Précharger le cache (sans compter de hits/misses)
+
+        Args:
+            words (iterable[str]): Mots à lemmatiser à l'avance
+
+        Returns:
+            int: Nombre de mots ajoutés au cache
+        """
+        added = 0
+        for word in words:
+            if added >= self.maxsize:
+                break
+            with self._lock:
+                if word in self._data:
+                    continue
+
+            # Le lemmatiseur est appelé hors du verrou ; le mot a pu être
+            # ajouté entre-temps par une requête
+            if self._store(word, self._lemmatize(word), replace=False):
+                added += 1
+        return added
+
+    def clear(self):
+        """Vider le cache et remettre les compteurs à zéro"""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """
+        Statistiques du cache
+
+        Returns:
+            dict: size, maxsize, hits, misses, evictions, hit_rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+
+def vocabulary_words(vectorizer):
+    """
+    Extraire les mots distincts du vocabulaire d'un TfidfVectorizer ajusté
+
+    Les n-grammes ("fake news") sont découpés en mots simples.
+
+    Args:
+        vectorizer: TfidfVectorizer chargé depuis tfidf_vectorizer.pkl
+
+    Returns:
+        list[str]: Mots du vocabulaire (ordre stable)
+    """
+    words = {}
+    for term in vectorizer.vocabulary_:
+        for word in term.split():
+            words.setdefault(word, None)
+    return list(words)
+
+
+# ============================================================
+# PRÉPROCESSEUR
+# ============================================================
+
+class TextPreprocessor:
+    """
+    Pipeline de nettoyage réutilisable et sûr entre threads
+
+    Étapes (identiques à l'ancien `clean_text`) :
+    1. Conversion en minuscules
+    2. Suppression des URLs
+    3. Suppression des emails
+    4. Suppression des caractères spéciaux
+    5. Suppression des stopwords et des mots de 2 lettres ou moins
+    6. Lemmatisation
+
+    Les stopwords sont chargés une seule fois dans un `frozenset` et le
+    lemmatiseur WordNet est préchauffé à la construction : le corpus NLTK
+    est chargé paresseusement et ce chargement n'est pas sûr entre threads.
+
+    Args:
+        language (str): Langue des stopwords NLTK
+        lemma_cache_size (int): Taille du cache LRU de lemmes (0 = désactivé)
+    """
+
+    _warmup_lock = threading.Lock()
+
+    def __init__(self, language='english', lemma_cache_size=0):
+        self.stop_words = frozenset(stopwords.words(language))
+        self.lemmatizer = WordNetLemmatizer()
+
+        # Forcer le chargement du corpus WordNet avant tout appel concurrent
+        with self._warmup_lock:
+            self.lemmatizer.lemmatize('warmup')
+
+        if lemma_cache_size > 0:
+            self.lemma_cache = LemmaCache(self.lemmatizer.lemmatize, lemma_cache_size)
+            self._lemmatize = self.lemma_cache
+        else:
+            self.lemma_cache = None
+            self._lemmatize = self.lemmatizer.lemmatize
+
+    def tokens(self, text):
+        """
+        Transformer un texte brut en liste de tokens lemmatisés
+
+        Args:
+            text (str): Texte brut
+
+        Returns:
+            list[str]: Tokens nettoyés, dans l'ordre du texte
+        """
+        text = text.lower()
+        text = URL_PATTERN.sub('', text)
+        text = EMAIL_PATTERN.sub('', text)
+        text = NON_LETTER_PATTERN.sub('', text)
+
+        # str.split() sans argument découpe sur les mêmes espaces que \s
+        # et ignore les espaces en début/fin : pas besoin de les normaliser
+        stop_words = self.stop_words
+        lemmatize = self._lemmatize
+        return [
+            lemmatize(word) for word in text.split()
+            if len(word) > 2 and word not in stop_words
+        ]
+
+    def clean(self, text):
+        """
+        Nettoyer un texte brut
+
+        Args:
+            text (str): Texte brut à nettoyer
+
+        Returns:
+            str: Texte nettoyé et prétraité (tokens séparés par un espace)
+        """
+        return ' '.join(self.tokens(text))
+
+    def clean_many(self, texts):
+        """
+        Nettoyer une liste de textes
+
+        Args:
+            texts (list[str]): Textes bruts
+
+        Returns:
+            list[str]: Textes nettoyés, dans le même ordre
+        """
+        return [self.clean(text) for text in texts]
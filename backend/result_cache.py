@@ -0,0 +1,328 @@
+"""
+Cache des résultats de prédiction
+
+Les mêmes articles viraux sont soumis encore et encore : le résultat est
+mis en cache sous une clé dérivée du texte normalisé (brut s'il dépasse
+MAX_TEXT_CHARS) et de l'empreinte du modèle. Un changement de modèle
+change donc toutes les clés.
+
+Deux backends :
+- MemoryResultCache : LRU en mémoire, propre à chaque worker
+- SQLiteResultCache : fichier SQLite partagé entre les workers gunicorn
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# ============================================================
+# CLÉS DE CACHE
+# ============================================================
+
+def normalize_text(text):
+    """
+    Normaliser un texte pour la clé de cache
+
+    Minuscules + espaces compactés : le nettoyage commence lui-même par
+    ces deux opérations. Pour les textes analysés en entier (au plus
+    MAX_TEXT_CHARS caractères), deux textes de même forme normalisée
+    donnent donc exactement la même prédiction ; au-delà, le découpage
+    (LongTextPolicy) dépend des positions dans le texte brut.
+    """
+    return ' '.join(text.lower().split())
+
+
+def cache_key(text, model_version, max_chars=0):
+    """
+    Calculer la clé de cache d'un texte pour une version de modèle
+
+    Args:
+        text (str): Texte brut reçu par l'API
+        model_version (str): Empreinte du modèle et du vectorizer
+        max_chars (int): Longueur au-delà de laquelle le texte est découpé
+            (LongTextPolicy.max_chars, 0 = jamais) : la clé porte alors sur
+            le texte brut, pas sur sa forme normalisée
+
+    Returns:
+        str: Empreinte SHA-256 hexadécimale
+    """
+    digest = hashlib.sha256()
+    digest.update(model_version.encode('utf-8'))
+    digest.update(b'\0')
+    if max_chars and len(text) > max_chars:
+        digest.update(b'raw\0')
+        digest.update(text.encode('utf-8', 'surrogatepass'))
+    else:
+        digest.update(normalize_text(text).encode('utf-8', 'surrogatepass'))
+    return digest.hexdigest()
+
+
+def fingerprint(*payloads):
+    """
+    Empreinte courte d'un ensemble de fichiers de modèle
+
+    Args:
+        *payloads (bytes): Contenu brut des fichiers .pkl
+
+    Returns:
+        str: 12 premiers caractères du SHA-256
+    """
+    digest = hashlib.sha256()
+    for payload in payloads:
+        digest.update(hashlib.sha256(payload).digest())
+    return digest.hexdigest()[:12]
+
+
+# ============================================================
+# BACKEND MÉMOIRE
+# ============================================================
+
+class MemoryResultCache:
+    """
+    Cache LRU en mémoire, borné en taille et en durée de vie
+
+    Args:
+        maxsize (int): Nombre maximal d'entrées
+        ttl (float): Durée de vie d'une entrée en secondes (0 = illimitée)
+    """
+
+    backend = 'memory'
+
+    def __init__(self, maxsize=10_000, ttl=3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.model_version = None
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Retourner le résultat en cache ou None"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if not expires_at or expires_at > now:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+                self.evictions += 1
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        """Mettre un résultat en cache"""
+        expires_at = time.monotonic() + self.ttl if self.ttl else 0
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def bind_model_version(self, model_version):
+        """Vider le cache si le modèle a changé"""
+        with self._lock:
+            if self.model_version != model_version:
+                self.evictions += len(self._data)
+                self._data.clear()
+                self.model_version = model_version
+
+    def stats(self):
+        """Statistiques du cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": self.backend,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+
+# ============================================================
+# BACKEND SQLITE (PARTAGÉ ENTRE WORKERS)
+# ============================================================
+
+class SQLiteResultCache:
+    """
+    Cache partagé dans un fichier SQLite (mode WAL)
+
+    Chaque worker gunicorn ouvre sa propre connexion (une par thread) sur
+    le même fichier. La taille est bornée en supprimant les entrées les
+    moins récemment lues, par paquets, pour ne pas compter à chaque écriture.
+
+    Les compteurs hits/misses sont propres au processus courant.
+
+    Args:
+        path (str): Chemin du fichier SQLite
+        maxsize (int): Nombre maximal d'entrées
+        ttl (float): Durée de vie d'une entrée en secondes (0 = illimitée)
+    """
+
+    backend = 'sqlite'
+
+    # Nombre d'écritures entre deux vérifications de la taille
+    PRUNE_EVERY = 100
+
+    def __init__(self, path, maxsize=100_000, ttl=3600):
+        self.path = path
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.model_version = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        conn = self._connection()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS predictions ("
+            " key TEXT PRIMARY KEY,"
+            " model_version TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " created REAL NOT NULL,"
+            " accessed REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON predictions (accessed)")
+
+    def _connection(self):
+        # Une connexion par thread (et par processus : après un fork,
+        # la connexion héritée du master ne doit pas être réutilisée)
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _count(self, attribute, amount=1):
+        with self._lock:
+            setattr(self, attribute, getattr(self, attribute) + amount)
+
+    def get(self, key):
+        """Retourner le résultat en cache ou None"""
+        now = time.time()
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT value, created FROM predictions WHERE key = ?", (key,)
+        ).fetchone()
+
+        if row is None:
+            self._count('misses')
+            return None
+
+        value, created = row
+        if self.ttl and created + self.ttl <= now:
+            conn.execute("DELETE FROM predictions WHERE key = ?", (key,))
+            self._count('evictions')
+            self._count('misses')
+            return None
+
+        conn.execute("UPDATE predictions SET accessed = ? WHERE key = ?", (now, key))
+        self._count('hits')
+        return json.loads(value)
+
+    def set(self, key, value):
+        """Mettre un résultat en cache"""
+        now = time.time()
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO predictions (key, model_version, value, created, accessed)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (key, self.model_version or '', json.dumps(value), now, now)
+        )
+
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % self.PRUNE_EVERY == 0
+        if prune:
+            self._prune(conn)
+
+    def _prune(self, conn):
+        # Expiration TTL puis éviction LRU au-delà de maxsize
+        if self.ttl:
+            cursor = conn.execute(
+                "DELETE FROM predictions WHERE created <= ?", (time.time() - self.ttl,)
+            )
+            self._count('evictions', cursor.rowcount)
+
+        (size,) = conn.execute("SELECT COUNT(*) FROM predictions").fetchone()
+        if size > self.maxsize:
+            cursor = conn.execute(
+                "DELETE FROM predictions WHERE key IN ("
+                " SELECT key FROM predictions ORDER BY accessed LIMIT ?)",
+                (size - self.maxsize,)
+            )
+            self._count('evictions', cursor.rowcount)
+
+    def bind_model_version(self, model_version):
+        """Supprimer les entrées produites par une autre version du modèle"""
+        self.model_version = model_version
+        cursor = self._connection().execute(
+            "DELETE FROM predictions WHERE model_version != ?", (model_version,)
+        )
+        self._count('evictions', cursor.rowcount)
+
+    def stats(self):
+        """Statistiques du cache"""
+        (size,) = self._connection().execute("SELECT COUNT(*) FROM predictions").fetchone()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": self.backend,
+                "path": self.path,
+                "size": size,
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+
+# ============================================================
+# FABRIQUE
+# ============================================================
+
+def create_result_cache(backend, maxsize, ttl, path=None):
+    """
+    Créer le cache de résultats configuré
+
+    Args:
+        backend (str): "memory", "sqlite" ou "none"
+        maxsize (int): Nombre maximal d'entrées
+        ttl (float): Durée de vie en secondes (0 = illimitée)
+        path (str): Fichier SQLite (backend "sqlite" uniquement)
+
+    Returns:
+        MemoryResultCache | SQLiteResultCache | None
+    """
+    backend = (backend or 'none').lower()
+    if backend == 'memory':
+        return MemoryResultCache(maxsize=maxsize, ttl=ttl)
+    if backend == 'sqlite':
+        return SQLiteResultCache(path, maxsize=maxsize, ttl=ttl)
+    if backend in ('none', 'off', ''):
+        return None
+    raise ValueError(f"Unknown prediction cache backend: {backend}")
@@ -0,0 +1,344 @@
+"""
+Notation hors ligne de fichiers d'articles (CSV, JSONL, Parquet)
+
+Pour les traitements de nuit : pas de serveur HTTP, mêmes modèles, même
+nettoyage et même scoring que l'API. Le fichier d'entrée est lu par
+paquets et les paquets sont répartis entre des processus (le nettoyage
+est du Python pur, limité à un cœur par processus). Chaque processus
+charge les modèles une seule fois.
+
+Usage (depuis backend/) :
+    python score_file.py articles.csv predictions.csv --text-column text --id-column id
+    python score_file.py articles.parquet predictions.jsonl --workers 8
+    python score_file.py articles.jsonl predictions.csv --resume
+
+Sortie (CSV ou JSONL), une ligne par article, dans l'ordre d'entrée :
+    row, id, prediction, label, confidence, prob_real, prob_fake, text_strategy,
+    error, model_version
+
+--resume reprend un traitement interrompu : les articles déjà présents
+dans le fichier de sortie ne sont pas notés une seconde fois.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import config
+from model_loading import load_models, build_engine, build_vectorizer
+from long_text import LongTextPolicy
+from pipeline import InferencePipeline
+from preprocessing import TextPreprocessor
+from scoring import ModelScorer
+
+FORMATS = ('csv', 'jsonl', 'parquet')
+
+OUTPUT_FIELDS = (
+    'row', 'id', 'prediction', 'label', 'confidence',
+    'prob_real', 'prob_fake', 'text_strategy', 'error', 'model_version'
+)
+
+
+def _detect_format(path, explicit=None):
+    """Format d'un fichier : argument explicite ou extension"""
+    if explicit:
+        return explicit
+    extension = os.path.splitext(path)[1].lower().lstrip('.')
+    if extension in ('ndjson', 'json'):
+        return 'jsonl'
+    if extension in ('parq', 'pq'):
+        return 'parquet'
+    if extension not in FORMATS:
+        raise SystemExit(f"❌ Format inconnu pour '{path}' (utilisez --input-format/--output-format)")
+    return extension
+
+
+# ============================================================
+# LECTURE DE L'ENTRÉE
+# ============================================================
+
+def _read_csv(path, text_column, id_column):
+    # Les articles peuvent dépasser la limite par défaut de 128 Ko par champ
+    csv.field_size_limit(sys.maxsize)
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        if text_column not in (reader.fieldnames or ()):
+            raise SystemExit(f"❌ Colonne '{text_column}' absente de {path}")
+        for row in reader:
+            yield row.get(id_column) if id_column else None, row.get(text_column)
+
+
+def _read_jsonl(path, text_column, id_column):
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                obj = json.loads(line)
+            except ValueError:
+                # Ligne illisible : notée comme article sans texte
+                yield None, None
+                continue
+            if isinstance(obj, dict):
+                yield obj.get(id_column) if id_column else None, obj.get(text_column)
+            else:
+                yield None, obj
+
+
+def _read_parquet(path, text_column, id_column, batch_size=1024):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("❌ La lecture Parquet nécessite pyarrow (pip install pyarrow)")
+
+    columns = [text_column] + ([id_column] if id_column else [])
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size, columns=columns):
+        texts = batch.column(text_column).to_pylist()
+        ids = batch.column(id_column).to_pylist() if id_column else [None] * len(texts)
+        yield from zip(ids, texts)
+
+
+READERS = {'csv': _read_csv, 'jsonl': _read_jsonl, 'parquet': _read_parquet}
+
+
+# ============================================================
+# ÉCRITURE ET REPRISE
+# ============================================================
+
+def _completed_rows(path, output_format):
+    """
+    Nombre d'articles déjà écrits dans un fichier de sortie
+
+    Une dernière ligne incomplète (arrêt pendant l'écriture) est supprimée.
+    """
+    if not os.path.exists(path):
+        return 0
+
+    with open(path, 'rb+') as f:
+        data = f.read()
+        end = data.rfind(b'\n') + 1
+        if end < len(data):
+            f.truncate(end)
+        data = data[:end]
+
+    if output_format == 'csv':
+        rows = list(csv.reader(data.decode('utf-8').splitlines()))
+        return max(len(rows) - 1, 0)  # sans l'en-tête
+    return sum(1 for line in data.splitlines() if line.strip())
+
+
+def _record(row, item_id, output, model_version):
+    """Ligne de sortie à plat pour un article"""
+    probabilities = output.get('probabilities', {})
+    return {
+        'row': row,
+        'id': item_id,
+        'prediction': output.get('prediction'),
+        'label': output.get('label'),
+        'confidence': output.get('confidence'),
+        'prob_real': probabilities.get('real'),
+        'prob_fake': probabilities.get('fake'),
+        'text_strategy': output.get('text_strategy'),
+        'error': output.get('error_code') or output.get('error'),
+        'model_version': model_version
+    }
+
+
+class _Writer:
+    """Écriture en ajout d'un fichier CSV ou JSONL, vidé après chaque paquet"""
+
+    def __init__(self, path, output_format, append):
+        self.format = output_format
+        self.file = open(path, 'a' if append else 'w', newline='', encoding='utf-8')
+        if output_format == 'csv':
+            self.csv = csv.DictWriter(self.file, fieldnames=OUTPUT_FIELDS)
+            if not append or self.file.tell() == 0:
+                self.csv.writeheader()
+
+    def write(self, records):
+        if self.format == 'csv':
+            self.csv.writerows(records)
+        else:
+            self.file.writelines(json.dumps(record) + '\n' for record in records)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+# ============================================================
+# PROCESSUS DE NOTATION
+# ============================================================
+
+# Pipeline du processus courant (un par worker)
+_state = None
+
+
+def _init_worker(artifacts_dir, model_path, vectorizer_path, engine_kind):
+    """
+    Charger les modèles et construire le pipeline une fois par processus
+
+    Avec le démarrage par fork (Linux), les workers héritent du pipeline
+    déjà construit par le processus principal (pages partagées).
+    """
+    global _state
+    if _state is not None:
+        return _state
+
+    quiet = lambda *args: None
+    model, vectorizer, model_version = load_models(artifacts_dir, model_path, vectorizer_path, log=quiet)
+    if model is None or vectorizer is None:
+        raise RuntimeError("models could not be loaded")
+
+    engine = build_engine(model, vectorizer, engine_kind, log=quiet)
+    scorer = ModelScorer(engine, threshold=config.DECISION_THRESHOLD)
+    preprocessor = TextPreprocessor(lemma_cache_size=config.LEMMA_CACHE_SIZE)
+    text_vectorizer = build_vectorizer(vectorizer, log=quiet)
+
+    pipeline = InferencePipeline(
+        preprocessor.clean, text_vectorizer, scorer,
+        tokenize=preprocessor.tokens if config.FUSED_TOKENIZER else None,
+        long_text=LongTextPolicy(
+            config.MAX_TEXT_CHARS,
+            strategy=config.LONG_TEXT_STRATEGY,
+            segment_chars=config.LONG_TEXT_SEGMENT_CHARS
+        )
+    )
+    _state = (pipeline, model_version)
+    return _state
+
+
+def _score_chunk(texts):
+    """Noter un paquet de textes dans le worker"""
+    pipeline, _ = _state
+    return pipeline.predict_texts(texts)
+
+
+def _chunks(items, size):
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _scored_chunks(chunks, workers, init_args):
+    """
+    Noter les paquets dans l'ordre, avec au plus 2 paquets en cours par worker
+
+    Args:
+        chunks (iterable): Paquets de (ligne, id, texte)
+        workers (int): Nombre de processus (1 = dans le processus courant)
+        init_args (tuple): Arguments de `_init_worker`
+
+    Yields:
+        tuple: (paquet, résultats du paquet)
+    """
+    if workers <= 1:
+        for chunk in chunks:
+            yield chunk, _score_chunk([text for _, _, text in chunk])
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=init_args) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append((chunk, pool.submit(_score_chunk, [text for _, _, text in chunk])))
+            if len(pending) >= workers * 2:
+                chunk, future = pending.popleft()
+                yield chunk, future.result()
+        while pending:
+            chunk, future = pending.popleft()
+            yield chunk, future.result()
+
+
+def _progress(done, failed, started, final=False):
+    elapsed = time.perf_counter() - started
+    rate = done / elapsed if elapsed > 0 else 0.0
+    end = '\n' if final else '\r'
+    print(f"   {done:>10,} articles | {rate:>8,.0f} articles/s | "
+          f"{failed:,} erreurs | {elapsed:,.1f} s", end=end, file=sys.stderr, flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a CSV/JSONL/Parquet file of articles offline")
+    parser.add_argument('input', help="input file (.csv, .jsonl, .parquet)")
+    parser.add_argument('output', help="output file (.csv or .jsonl)")
+    parser.add_argument('--input-format', choices=FORMATS)
+    parser.add_argument('--output-format', choices=('csv', 'jsonl'))
+    parser.add_argument('--text-column', default='text')
+    parser.add_argument('--id-column', default=None)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="scoring processes (1 = in-process)")
+    parser.add_argument('--chunk-size', type=int, default=500, help="articles per chunk")
+    parser.add_argument('--resume', action='store_true', help="skip articles already in the output file")
+    parser.add_argument('--artifacts', default=None, help="memory-mapped artifacts directory")
+    parser.add_argument('--model', default=None,
+                        help="model .pkl file (default: MODEL_CATALOG[DEFAULT_MODEL], as the API)")
+    parser.add_argument('--vectorizer', default=None)
+    parser.add_argument('--engine', choices=('sklearn', 'compiled'), default=None)
+    args = parser.parse_args()
+
+    input_format = _detect_format(args.input, args.input_format)
+    output_format = _detect_format(args.output, args.output_format)
+    if output_format not in ('csv', 'jsonl'):
+        raise SystemExit("❌ La sortie doit être un fichier .csv ou .jsonl")
+
+    # Chargement dans le processus principal : échec immédiat si les modèles
+    # sont absents, et version du modèle pour le fichier de sortie
+    # Modèle principal résolu par le catalogue, comme l'API (app.py)
+    model_path = args.model or config.MODEL_CATALOG[config.DEFAULT_MODEL]
+    init_args = (args.artifacts, model_path, args.vectorizer, args.engine)
+    try:
+        _, model_version = _init_worker(*init_args)
+    except RuntimeError as e:
+        raise SystemExit(f"❌ {e}")
+
+    skipped = _completed_rows(args.output, output_format) if args.resume else 0
+    if skipped:
+        print(f"↩️  Reprise : {skipped:,} articles déjà notés", file=sys.stderr)
+
+    items = READERS[input_format](args.input, args.text_column, args.id_column)
+    rows = islice(enumerate(items, start=1), skipped, None)
+    chunks = ([(row, item_id, text) for row, (item_id, text) in chunk]
+              for chunk in _chunks(rows, args.chunk_size))
+
+    print(f"📄 {args.input} → {args.output} ({max(args.workers, 1)} processus, "
+          f"paquets de {args.chunk_size}, modèle {model_version})", file=sys.stderr)
+
+    writer = _Writer(args.output, output_format, append=bool(skipped))
+    started = time.perf_counter()
+    done = failed = 0
+    last_report = started
+    try:
+        for chunk, outputs in _scored_chunks(chunks, args.workers, init_args):
+            records = [
+                _record(row, item_id, output, model_version)
+                for (row, item_id, _), output in zip(chunk, outputs)
+            ]
+            writer.write(records)
+            done += len(records)
+            failed += sum(1 for record in records if record['error'])
+
+            # Progression au plus une fois par seconde
+            if time.perf_counter() - last_report >= 1.0:
+                _progress(done, failed, started)
+                last_report = time.perf_counter()
+    except KeyboardInterrupt:
+        print(f"\n⏸️  Interrompu : relancez avec --resume pour continuer", file=sys.stderr)
+        sys.exit(130)
+    finally:
+        writer.close()
+
+    _progress(done, failed, started, final=True)
+    print(f"✅ {done:,} articles notés → {args.output}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,259 @@
+"""
+Scoring du modèle : une seule passe par requête
+
+`model.predict` puis `model.predict_proba` parcourent deux fois chaque arbre
+de la forêt. Le scorer calcule les probabilités une seule fois et en dérive
+le label, avec un seuil de décision optionnel (réglage précision/rappel).
+
+Le CascadeScorer enchaîne deux scorers sur la même matrice TF-IDF : un
+modèle rapide pour tous les articles, le modèle coûteux seulement pour
+ceux dont la confiance est insuffisante.
+"""
+
+import numpy as np
+
+from instrumentation import METRICS
+
+# Classe positive du modèle (1 = FAKE)
+FAKE_CLASS = 1
+
+ESCALATIONS = METRICS.counter(
+    'fnd_cascade_escalations_total', 'Articles passed to the second model of the cascade', ('model',)
+)
+CASCADE_ITEMS = METRICS.counter(
+    'fnd_cascade_items_total', 'Articles scored by the cascade', ('model',)
+)
+
+
+def aggregate_segments(probabilities, spans, weights):
+    """
+    Probabilités par article à partir des probabilités par segment
+
+    Args:
+        probabilities (np.ndarray): Une ligne par segment
+        spans (list[tuple]): (début, fin) des lignes de chaque article
+        weights (array-like): Poids de chaque segment (longueur nettoyée)
+
+    Returns:
+        np.ndarray: Une ligne par article (moyenne pondérée de ses segments)
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    aggregated = np.empty((len(spans), probabilities.shape[1]))
+    for row, (begin, end) in enumerate(spans):
+        if end - begin == 1:
+            aggregated[row] = probabilities[begin]
+        else:
+            aggregated[row] = np.average(probabilities[begin:end], axis=0, weights=weights[begin:end])
+    return aggregated
+
+
+class ModelScorer:
+    """
+    Composant de scoring partagé par /predict, /predict/batch et /test
+
+    Args:
+        model: Estimateur scikit-learn exposant `predict_proba` et `classes_`
+        threshold (float | None): Seuil sur la probabilité FAKE.
+            None reproduit exactement `model.predict` (classe la plus probable).
+        name (str): Nom du modèle dans le catalogue (ex : "forest")
+        version (str): Empreinte du modèle
+        contributions: Explications par terme (FeatureContributions ou
+            ForestSplitEffects), ou None
+    """
+
+    def __init__(self, model, threshold=None, name=None, version=None, contributions=None):
+        self.model = model
+        self.threshold = threshold
+        self.name = name
+        self.version = version
+        self.contributions = contributions
+        self.classes = np.asarray(model.classes_)
+
+        fake_positions = np.flatnonzero(self.classes == FAKE_CLASS)
+        if len(fake_positions) != 1:
+            raise ValueError(f"Model classes {self.classes.tolist()} do not contain class {FAKE_CLASS}")
+        self.fake_index = int(fake_positions[0])
+        self.real_index = 1 - self.fake_index
+
+    def predict_proba(self, X):
+        """
+        Probabilités par classe (un seul parcours du modèle)
+
+        Args:
+            X: Matrice TF-IDF (n_articles, n_features)
+
+        Returns:
+            np.ndarray: (n_articles, 2), colonnes dans l'ordre de `classes_`
+        """
+        return self.model.predict_proba(X)
+
+    def labels(self, probabilities):
+        """
+        Dériver les prédictions des probabilités
+
+        Args:
+            probabilities (np.ndarray): Sortie de `predict_proba`
+
+        Returns:
+            np.ndarray: Classe prédite pour chaque article
+        """
+        if self.threshold is None:
+            return self.classes[probabilities.argmax(axis=1)]
+        is_fake = probabilities[:, self.fake_index] >= self.threshold
+        return np.where(is_fake, self.classes[self.fake_index], self.classes[self.real_index])
+
+    def confidences(self, probabilities):
+        """
+        Probabilité de la classe retenue pour chaque article
+
+        Args:
+            probabilities (np.ndarray): Sortie de `predict_proba`
+
+        Returns:
+            np.ndarray: Confiance de chaque article (champ "confidence")
+        """
+        is_fake = self.labels(probabilities) == self.classes[self.fake_index]
+        return np.where(is_fake, probabilities[:, self.fake_index], probabilities[:, self.real_index])
+
+    def score(self, X):
+        """
+        Scorer une matrice d'articles
+
+        Args:
+            X: Matrice TF-IDF (n_articles, n_features)
+
+        Returns:
+            tuple: (prédictions, probabilités)
+        """
+        probabilities = self.predict_proba(X)
+        return self.labels(probabilities), probabilities
+
+    def score_items(self, X, spans=None, weights=None):
+        """
+        Probabilités par article, un article pouvant couvrir plusieurs lignes
+
+        Args:
+            X: Matrice TF-IDF (une ligne par segment)
+            spans (list[tuple]): (début, fin) des lignes de chaque article
+                (None : une ligne par article)
+            weights (array-like): Poids de chaque ligne (aggregate_segments)
+
+        Returns:
+            tuple: (probabilités par article, nom du modèle de chaque article)
+        """
+        probabilities = self.predict_proba(X)
+        if spans is not None:
+            probabilities = aggregate_segments(probabilities, spans, weights)
+        return probabilities, [self.name] * len(probabilities)
+
+    def contributions_for(self, name):
+        """Table des contributions du modèle `name` (celui qui a noté l'article)"""
+        return self.contributions
+
+    def result(self, prediction, probabilities):
+        """
+        Construire les champs de réponse d'un article
+
+        Args:
+            prediction: Classe prédite
+            probabilities (np.ndarray): Probabilités de l'article
+
+        Returns:
+            dict: prediction, label, confidence, probabilities
+        """
+        prediction = int(prediction)
+        is_fake = prediction == FAKE_CLASS
+
+        # Confiance = probabilité de la classe retenue (identique au max
+        # des probabilités tant qu'aucun seuil personnalisé n'est utilisé)
+        return {
+            "prediction": prediction,
+            "label": "FAKE" if is_fake else "REAL",
+            "confidence": float(probabilities[self.fake_index if is_fake else self.real_index]),
+            "probabilities": {
+                "real": float(probabilities[self.real_index]),
+                "fake": float(probabilities[self.fake_index])
+            }
+        }
+
+
+class CascadeScorer:
+    """
+    Cascade de deux modèles sur la même matrice TF-IDF
+
+    Tous les articles sont notés par `first` (modèle rapide) ; seuls ceux
+    dont la confiance est inférieure à `min_confidence` sont notés à
+    nouveau par `second` (modèle coûteux), dont le résultat est retenu.
+    Même interface que ModelScorer.
+
+    Args:
+        first (ModelScorer): Modèle de premier passage
+        second (ModelScorer): Modèle des cas incertains
+        min_confidence (float): Confiance en dessous de laquelle un article
+            est transmis à `second`
+    """
+
+    name = 'cascade'
+
+    def __init__(self, first, second, min_confidence):
+        if not np.array_equal(first.classes, second.classes):
+            raise ValueError(
+                f"Cascade models have different classes: {first.classes.tolist()} "
+                f"vs {second.classes.tolist()}"
+            )
+        self.first = first
+        self.second = second
+        self.min_confidence = min_confidence
+        self.version = f"{first.version}+{second.version}"
+        self.classes = first.classes
+
+    def predict_proba(self, X):
+        return self.score_items(X)[0]
+
+    def labels(self, probabilities):
+        return self.first.labels(probabilities)
+
+    def confidences(self, probabilities):
+        return self.first.confidences(probabilities)
+
+    def score(self, X):
+        probabilities = self.predict_proba(X)
+        return self.labels(probabilities), probabilities
+
+    def result(self, prediction, probabilities):
+        return self.first.result(prediction, probabilities)
+
+    def contributions_for(self, name):
+        return (self.second if name == self.second.name else self.first).contributions
+
+    def score_items(self, X, spans=None, weights=None):
+        """
+        Probabilités par article : premier modèle, puis second modèle pour
+        les articles incertains (seules leurs lignes lui sont transmises)
+
+        Returns:
+            tuple: (probabilités par article, nom du modèle retenu pour
+                chaque article)
+        """
+        probabilities, names = self.first.score_items(X, spans, weights)
+        uncertain = np.flatnonzero(self.first.confidences(probabilities) < self.min_confidence)
+        CASCADE_ITEMS.inc(len(probabilities), model=self.first.name)
+
+        if len(uncertain):
+            if spans is None:
+                rows = uncertain
+                sub_spans = sub_weights = None
+            else:
+                rows = np.concatenate([np.arange(*spans[item]) for item in uncertain])
+                sizes = [spans[item][1] - spans[item][0] for item in uncertain]
+                bounds = np.concatenate(([0], np.cumsum(sizes))).tolist()
+                sub_spans = list(zip(bounds[:-1], bounds[1:]))
+                sub_weights = np.asarray(weights, dtype=np.float64)[rows]
+
+            second_probabilities, _ = self.second.score_items(X[rows], sub_spans, sub_weights)
+            probabilities[uncertain] = second_probabilities
+            for item in uncertain.tolist():
+                names[item] = self.second.name
+            ESCALATIONS.inc(len(uncertain), model=self.second.name)
+
+        return probabilities, names
@@ -0,0 +1,11 @@
+"""
+Configuration pytest : les modules de l'API sont importés depuis backend/
+(comme `python app.py`)
+"""
+
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
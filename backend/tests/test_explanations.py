@@ -0,0 +1,145 @@
+"""
+Explications
+
+- forêt : la table (nœuds rangés par feature et par seuil) donne le même
+  résultat qu'un parcours direct des nœuds, ne lit que les termes de
+  l'article et n'est construite qu'au premier article expliqué ;
+- régression logistique : somme des contributions + intercept = fonction
+  de décision.
+"""
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from explanations import FeatureContributions, ForestSplitEffects, build_contributions, vocabulary_terms
+from forest_engine import CompiledForest
+
+TEXTS = [
+    "shocking secret cure banned hoax exposed",
+    "miracle hoax truth hidden conspiracy shocking",
+    "secret conspiracy exposed government hides truth",
+    "official report minister statement budget",
+    "court ruling agency survey quarter percent",
+    "minister budget statement official survey",
+] * 10
+LABELS = (["FAKE"] * 3 + ["REAL"] * 3) * 10
+
+
+@pytest.fixture(scope='module')
+def fitted():
+    vectorizer = TfidfVectorizer().fit(TEXTS)
+    X = vectorizer.transform(TEXTS)
+    forest = RandomForestClassifier(n_estimators=25, max_features=3, random_state=0).fit(X, LABELS)
+    linear = LogisticRegression().fit(X, LABELS)
+    return vectorizer, X, forest, linear
+
+
+def _fake_index(model):
+    return int(np.flatnonzero(model.classes_ == 'FAKE')[0])
+
+
+def _explainer(vectorizer, model):
+    return ForestSplitEffects(model, vocabulary_terms(vectorizer), _fake_index(model))
+
+
+def _brute_force(compiled, fake_index, column, value):
+    """Somme des effets des nœuds qui testent `column` et dont `value` dépasse le seuil"""
+    total = 0.0
+    fake = compiled.node_proba[:, fake_index]
+    for node in range(len(compiled.feature)):
+        if compiled.left[node] == node or compiled.feature[node] != column:
+            continue
+        if np.float32(value) > compiled.threshold[node]:
+            effect = fake[compiled.right[node]] - fake[compiled.left[node]]
+            total += effect * compiled.node_weight[node]
+    return total / compiled.n_trees
+
+
+def test_forest_table_matches_node_walk(fitted):
+    vectorizer, X, forest, _ = fitted
+    compiled = CompiledForest.from_sklearn(forest)
+    explainer = _explainer(vectorizer, compiled)
+
+    for row in range(6):
+        start, stop = X.indptr[row], X.indptr[row + 1]
+        columns, values = X.indices[start:stop], X.data[start:stop]
+        expected = [_brute_force(compiled, _fake_index(forest), c, v) for c, v in zip(columns, values)]
+        np.testing.assert_allclose(explainer.effects(columns, values), expected, atol=1e-12)
+
+
+def test_forest_sklearn_and_compiled_agree_without_compiling(fitted):
+    vectorizer, X, forest, _ = fitted
+    from_sklearn = build_contributions(forest, vectorizer, _fake_index(forest), log=lambda message: None)
+    from_compiled = _explainer(vectorizer, CompiledForest.from_sklearn(forest))
+
+    # Rien n'est construit tant qu'aucun article n'est expliqué
+    assert isinstance(from_sklearn, ForestSplitEffects)
+    assert from_sklearn.model is forest and from_sklearn._table is None
+    assert from_sklearn.explain(X, 0, 1, top_k=100) == from_compiled.explain(X, 0, 1, top_k=100)
+    assert from_sklearn._table is not None
+
+
+def test_forest_reports_only_the_article_terms(fitted):
+    vectorizer, _, forest, _ = fitted
+    explainer = _explainer(vectorizer, forest)
+    rows = vectorizer.transform(["shocking secret hoax", "official budget report"])
+
+    fake = explainer.explain(rows, 0, 1, top_k=100)
+    real = explainer.explain(rows, 1, 2, top_k=100)
+    assert fake["method"] == "forest_split_effects" and fake["unit"] == "probability"
+    assert {term["term"] for term in fake["terms"]} <= {"shocking", "secret", "hoax"}
+    assert {term["term"] for term in real["terms"]} <= {"official", "budget", "report"}
+    assert all(term["tfidf"] > 0 for term in fake["terms"] + real["terms"])
+    assert sum(term["contribution"] for term in fake["terms"]) > 0
+    assert sum(term["contribution"] for term in real["terms"]) < 0
+
+
+def test_forest_terms_below_every_threshold_do_not_contribute(fitted):
+    vectorizer, _, forest, _ = fitted
+    explainer = _explainer(vectorizer, forest)
+    columns = np.arange(len(vectorizer.vocabulary_))
+    assert not explainer.effects(columns, np.full(len(columns), 1e-9)).any()
+
+
+def test_forest_segments_use_weighted_average(fitted):
+    vectorizer, _, forest, _ = fitted
+    explainer = _explainer(vectorizer, forest)
+    rows = vectorizer.transform(["shocking secret hoax", "official budget report", "shocking budget"])
+    weights = np.array([30.0, 10.0, 20.0])
+
+    explanation = explainer.explain(rows, 0, 3, weights, top_k=1000)
+    expected = {}
+    for row, weight in enumerate(weights / weights.sum()):
+        start, stop = rows.indptr[row], rows.indptr[row + 1]
+        columns, values = rows.indices[start:stop], rows.data[start:stop]
+        for column, effect in zip(columns, explainer.effects(columns, values)):
+            expected[column] = expected.get(column, 0.0) + weight * effect
+
+    terms = vocabulary_terms(vectorizer)
+    for term in explanation["terms"]:
+        column = int(np.flatnonzero(terms == term["term"])[0])
+        assert term["contribution"] == pytest.approx(expected[column], abs=1e-6)
+
+
+def test_linear_contributions_sum_to_decision_function(fitted):
+    vectorizer, X, _, linear = fitted
+    explainer = FeatureContributions.from_linear(linear.coef_[0], vocabulary_terms(vectorizer), _fake_index(linear))
+    decision = linear.decision_function(X[:6])
+    sign = 1 if _fake_index(linear) == 1 else -1
+
+    for row in range(6):
+        explanation = explainer.explain(X, row, row + 1, top_k=1000)
+        total = sum(term["contribution"] for term in explanation["terms"])
+        assert total == pytest.approx(sign * (decision[row] - linear.intercept_[0]), abs=1e-5)
+
+
+def test_top_k_orders_by_absolute_contribution(fitted):
+    vectorizer, X, forest, _ = fitted
+    explainer = build_contributions(forest, vectorizer, _fake_index(forest), log=lambda message: None)
+    terms = explainer.explain(X, 0, 1, top_k=3)["terms"]
+    assert 0 < len(terms) <= 3
+    magnitudes = [abs(term["contribution"]) for term in terms]
+    assert magnitudes == sorted(magnitudes, reverse=True)
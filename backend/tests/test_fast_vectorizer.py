@@ -0,0 +1,111 @@
+"""
+Parité de FastTfidfVectorizer avec TfidfVectorizer.transform
+
+Les matrices doivent être identiques au bit près (indptr, indices, data),
+pour `transform` comme pour `transform_words`, sur le vectorizer livré
+(models/tfidf_vectorizer.pkl) et sur d'autres configurations ajustées ici.
+"""
+
+import os
+import pickle
+import random
+
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from fast_vectorizer import FastTfidfVectorizer
+
+BUNDLED_VECTORIZER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                  'models', 'tfidf_vectorizer.pkl')
+
+# Documents bruts : casse, ponctuation, chiffres, unicode, mots courts, vides
+RAW_DOCUMENTS = [
+    "",
+    "   ",
+    "a b c 12 x_y fake-news",
+    "Breaking NEWS: the 2024 report... doctors don't want you to know!",
+    "Le président a déclaré que l'économie était en crise, café naïve",
+    "中文 новости 🚨 mixed with english words and ÉTÉ",
+    "government government government hides the truth truth",
+]
+
+# Mots nettoyés (TextPreprocessor.tokens) : chemin rapide et cas découpés
+WORD_LISTS = [
+    [],
+    ["government", "hide", "truth"],
+    ["breaking", "news", "doctor", "want", "know", "news", "news"],
+    ["x", "ab", "Upper", "café", "fake-news", "state_of", "abc"],
+    ["année", "élection", "vote", "vote"],
+]
+
+
+def _corpus(vocabulary, count, words_per_doc, seed):
+    """Documents tirés du vocabulaire (reproductibles)"""
+    rng = random.Random(seed)
+    words = sorted({word for term in vocabulary for word in term.split()})
+    return [' '.join(rng.choice(words) for _ in range(rng.randint(1, words_per_doc))) for _ in range(count)]
+
+
+def assert_identical(expected, actual):
+    expected = expected.tocsr()
+    expected.sort_indices()
+    assert actual.shape == expected.shape
+    assert np.array_equal(actual.indptr, expected.indptr)
+    assert np.array_equal(actual.indices, expected.indices)
+    assert np.array_equal(actual.data, expected.data)
+
+
+def _check(vectorizer, documents, word_lists):
+    fast = FastTfidfVectorizer.from_sklearn(vectorizer)
+
+    # Lot entier, puis document par document (chemin /predict)
+    assert_identical(vectorizer.transform(documents), fast.transform(documents))
+    for document in documents[:20]:
+        assert_identical(vectorizer.transform([document]), fast.transform([document]))
+
+    expected = vectorizer.transform([' '.join(words) for words in word_lists])
+    assert_identical(expected, fast.transform_words(word_lists))
+    for words in word_lists[:20]:
+        assert_identical(vectorizer.transform([' '.join(words)]), fast.transform_words([words]))
+
+
+@pytest.fixture(scope='module')
+def bundled():
+    if not os.path.exists(BUNDLED_VECTORIZER):
+        pytest.skip("models/tfidf_vectorizer.pkl not available")
+    with open(BUNDLED_VECTORIZER, 'rb') as f:
+        return pickle.load(f)
+
+
+@pytest.fixture(scope='module')
+def training_corpus(bundled):
+    return _corpus(bundled.vocabulary_, 300, 200, seed=1)
+
+
+def test_bundled_vectorizer(bundled):
+    documents = RAW_DOCUMENTS + [' '.join(bundled.vocabulary_)] + _corpus(bundled.vocabulary_, 200, 300, seed=2)
+    word_lists = WORD_LISTS + [document.split() for document in documents]
+    _check(bundled, documents, word_lists)
+
+
+@pytest.mark.parametrize('params', [
+    {'sublinear_tf': True},
+    {'binary': True},
+    {'norm': None},
+    {'norm': 'l1', 'sublinear_tf': True},
+    {'ngram_range': (1, 1)},
+    {'ngram_range': (1, 3), 'stop_words': 'english'},
+    {'binary': True, 'use_idf': False},
+], ids=lambda params: ','.join(f'{key}={value}' for key, value in params.items()))
+def test_other_configurations(bundled, training_corpus, params):
+    vectorizer = TfidfVectorizer(max_features=3000, **params).fit(training_corpus)
+    documents = RAW_DOCUMENTS + _corpus(bundled.vocabulary_, 100, 300, seed=3)
+    word_lists = WORD_LISTS + [document.split() for document in documents]
+    _check(vectorizer, documents, word_lists)
+
+
+def test_unsupported_configuration_is_rejected():
+    vectorizer = TfidfVectorizer(analyzer='char').fit(["some text", "other text"])
+    with pytest.raises(ValueError):
+        FastTfidfVectorizer.from_sklearn(vectorizer)
@@ -0,0 +1,89 @@
+"""
+Parité de CompiledForest avec RandomForestClassifier.predict_proba
+
+Petite forêt ajustée sur des lignes TF-IDF creuses, comparée à sklearn sur
+de nombreuses lignes : articles réels, lignes sans aucun terme, lignes à
+un seul terme, lots plus grands qu'un paquet (CHUNK_ROWS).
+"""
+
+import random
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+import forest_engine
+from forest_engine import CompiledForest
+
+FAKE_WORDS = "shocking secret exposed hoax miracle banned truth hidden cure conspiracy".split()
+REAL_WORDS = "official report minister agency statement percent quarter court budget survey".split()
+COMMON_WORDS = "people year government week city country time state public news".split()
+
+
+def _articles(count, seed):
+    """Articles synthétiques étiquetés (vocabulaire FAKE/REAL partiellement mélangé)"""
+    rng = random.Random(seed)
+    texts, labels = [], []
+    for _ in range(count):
+        label = rng.randint(0, 1)
+        own = FAKE_WORDS if label else REAL_WORDS
+        other = REAL_WORDS if label else FAKE_WORDS
+        words = [rng.choice(own if rng.random() < 0.6 else (other if rng.random() < 0.3 else COMMON_WORDS))
+                 for _ in range(rng.randint(3, 60))]
+        texts.append(' '.join(words))
+        labels.append('FAKE' if label else 'REAL')
+    return texts, labels
+
+
+@pytest.fixture(scope='module')
+def data():
+    texts, labels = _articles(800, seed=0)
+    vectorizer = TfidfVectorizer(ngram_range=(1, 2)).fit(texts)
+    return vectorizer, vectorizer.transform(texts), np.array(labels)
+
+
+@pytest.fixture(scope='module')
+def scoring_rows(data):
+    vectorizer, _, _ = data
+    texts, _ = _articles(600, seed=1)
+    n_features = len(vectorizer.vocabulary_)
+    rows = sp.vstack([
+        vectorizer.transform(texts),
+        sp.csr_matrix((5, n_features)),                    # lignes sans aucun terme
+        vectorizer.transform(FAKE_WORDS + REAL_WORDS),      # un seul terme
+        vectorizer.transform(['unknown words only', '']),  # hors vocabulaire
+    ]).tocsr()
+    return rows
+
+
+@pytest.mark.parametrize('model', [
+    RandomForestClassifier(n_estimators=30, random_state=0),
+    RandomForestClassifier(n_estimators=20, max_depth=4, class_weight='balanced', random_state=1),
+    ExtraTreesClassifier(n_estimators=20, random_state=2),
+], ids=['random_forest', 'shallow_balanced', 'extra_trees'])
+def test_predict_proba_matches_sklearn(data, scoring_rows, model):
+    _, X, y = data
+    model.fit(X, y)
+    compiled = CompiledForest.from_sklearn(model)
+
+    assert scoring_rows.shape[0] > forest_engine.CHUNK_ROWS
+    assert list(compiled.classes_) == list(model.classes_)
+    np.testing.assert_allclose(compiled.predict_proba(scoring_rows), model.predict_proba(scoring_rows),
+                               rtol=0, atol=1e-12)
+
+    # Ligne par ligne (chemin /predict) et en entrée dense
+    for index in range(0, scoring_rows.shape[0], 37):
+        row = scoring_rows[index]
+        assert np.allclose(compiled.predict_proba(row), model.predict_proba(row), rtol=0, atol=1e-12)
+    dense = scoring_rows[:50].toarray()
+    assert np.allclose(compiled.predict_proba(dense), model.predict_proba(dense), rtol=0, atol=1e-12)
+    assert compiled.matches(model, scoring_rows)
+
+
+def test_rejects_wrong_feature_count(data):
+    _, X, y = data
+    compiled = CompiledForest.from_sklearn(RandomForestClassifier(n_estimators=3, random_state=0).fit(X, y))
+    with pytest.raises(ValueError):
+        compiled.predict_proba(sp.csr_matrix((1, X.shape[1] + 1)))
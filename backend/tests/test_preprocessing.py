@@ -0,0 +1,130 @@
+"""
+Parité de TextPreprocessor avec l'ancien `clean_text` de app.py
+
+L'ancienne fonction est figée ici telle qu'elle était avant le
+préprocesseur partagé : `clean` doit produire exactement la même sortie,
+avec ou sans cache de lemmes.
+"""
+
+import re
+
+import nltk
+import pytest
+from nltk.corpus import stopwords
+from nltk.stem import WordNetLemmatizer
+
+from preprocessing import LemmaCache, TextPreprocessor
+
+# Corpus NLTK requis : téléchargés s'ils manquent (le test échoue, sans être
+# ignoré, s'ils restent introuvables)
+NLTK_CORPORA = {'stopwords': 'corpora/stopwords', 'wordnet': 'corpora/wordnet'}
+
+for package, resource in NLTK_CORPORA.items():
+    try:
+        nltk.data.find(resource)
+    except LookupError:
+        nltk.download(package, quiet=True)
+        nltk.data.find(resource)
+
+
+def legacy_clean_text(text):
+    """`clean_text` de app.py avant TextPreprocessor (référence figée)"""
+    text = text.lower()
+    text = re.sub(r'http\S+|www\S+|https\S+', '', text)
+    text = re.sub(r'\S+@\S+', '', text)
+    text = re.sub(r'[^a-zA-Z\s]', '', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    stop_words = set(stopwords.words('english'))
+    words = text.split()
+    words = [word for word in words if word not in stop_words and len(word) > 2]
+    lemmatizer = WordNetLemmatizer()
+    words = [lemmatizer.lemmatize(word) for word in words]
+    return ' '.join(words)
+
+
+CORPUS = [
+    # Textes vides ou sans contenu
+    "",
+    "   ",
+    "\n\t\r\x0b\x0c",
+    "12345 !!! ??? ...",
+    # Uniquement des stopwords ou des mots courts
+    "the and of to in is it was for on",
+    "The THE the, and AND and; I a an of at by",
+    "ok no go up be me we us",
+    # URLs
+    "Read more at https://example.com/path?x=1 and http://foo.bar now",
+    "Visit www.fakenews.org/articles/42 for the real story",
+    "links:https://a.b/c,http://d.e/f;www.g.h",
+    "The https-less word httpserver and wwwhatever stay removed",
+    # Emails
+    "Contact john.doe@example.com or press@news.org for details",
+    "Send@me and a@b.c plus trailing@",
+    # Accents et unicode
+    "Le président a déclaré que l'économie était en crise",
+    "Café naïve résumé coöperate façade Zürich São Paulo",
+    "Ünïcödé ÀÉÎÕÜ straße İstanbul KELVINK sign",
+    "Emoji news 🚨🔥 breaking 😱 shocking ✅ verified",
+    "中文 новости ニュース العربية mixed with english words",
+    "zero​width non breaking em space ideographic　space",
+    "file\x1cseparator group\x1dseparator record\x1eseparator unit\x1fseparator",
+    # Ponctuation, chiffres, casse
+    "BREAKING: Scientists DISCOVER shocking truth!!! Doctors HATE this 1 trick",
+    "COVID-19 vaccines aren't what they're saying; it's a cover-up (sources: 3)",
+    "e-mail, re-election, state-of-the-art, well—known, don't, won't",
+    # Mots répétés (hits du cache de lemmes)
+    "cats cats cats dogs dogs running running running studies studies",
+    "The government hides the truth. The government lies. The government denies everything.",
+    "election elections election elections voters voter voters ballots ballot",
+    # Article long
+    " ".join(["Officials confirmed the reports were accurate according to multiple sources"] * 20),
+]
+
+
+@pytest.fixture(scope='module')
+def preprocessor():
+    return TextPreprocessor()
+
+
+@pytest.fixture(scope='module')
+def cached_preprocessor():
+    return TextPreprocessor(lemma_cache_size=64)
+
+
+@pytest.mark.parametrize('text', CORPUS)
+def test_clean_matches_legacy(preprocessor, text):
+    assert preprocessor.clean(text) == legacy_clean_text(text)
+
+
+@pytest.mark.parametrize('text', CORPUS)
+def test_tokens_match_legacy(preprocessor, text):
+    assert preprocessor.tokens(text) == legacy_clean_text(text).split()
+
+
+def test_clean_many_matches_legacy(preprocessor):
+    assert preprocessor.clean_many(CORPUS) == [legacy_clean_text(text) for text in CORPUS]
+
+
+def test_lemma_cache_matches_legacy(cached_preprocessor):
+    cached_preprocessor.lemma_cache.clear()
+    # Deux passes : la seconde est servie par le cache
+    for _ in range(2):
+        for text in CORPUS:
+            assert cached_preprocessor.clean(text) == legacy_clean_text(text)
+
+    stats = cached_preprocessor.lemma_cache.stats()
+    assert stats['hits'] > 0
+    assert stats['size'] <= stats['maxsize']
+
+
+def test_lemma_cache_evicts_least_recently_used():
+    cache = LemmaCache(str.upper, maxsize=2)
+    assert cache('a') == 'A'
+    assert cache('b') == 'B'
+    assert cache('a') == 'A'  # 'a' devient le plus récent
+    assert cache('c') == 'C'  # évince 'b'
+
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions'], stats['size']) == (1, 3, 1, 2)
+    assert cache('b') == 'B'
+    assert cache.stats()['misses'] == 4
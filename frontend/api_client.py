@@ -0,0 +1,229 @@
+"""
+Client HTTP de l'API Flask pour le frontend Streamlit
+
+- Une seule `requests.Session` partagée par toutes les sessions Streamlit
+  (st.cache_resource) : connexions keep-alive réutilisées, pool borné.
+- Réessais avec backoff exponentiel sur les erreurs de connexion et les
+  réponses 502/503/504 (en-tête Retry-After respecté).
+- /health et /info mis en cache avec une durée de vie (st.cache_data) :
+  la barre latérale n'interroge plus l'API à chaque interaction.
+- Mémo par session des résultats /predict, indexé par l'empreinte du
+  texte : un rerun ne renvoie pas le même article à l'API.
+"""
+
+import hashlib
+import json
+from collections import OrderedDict
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+# Délai maximal d'une requête (secondes)
+TIMEOUT = 10
+
+# Connexions gardées ouvertes vers l'API (toutes sessions confondues)
+POOL_SIZE = 20
+
+# Réessais (connexion refusée, 502/503/504) : 3 tentatives supplémentaires,
+# backoff exponentiel. Un timeout de lecture n'est pas réessayé : l'API
+# traite déjà la requête, la renvoyer ne ferait qu'ajouter de la charge
+RETRIES = 3
+BACKOFF_FACTOR = 0.3
+RETRY_STATUSES = (502, 503, 504)
+
+# Durée de vie des réponses /health et /info en cache (secondes)
+HEALTH_TTL = 15
+INFO_TTL = 300
+
+# Résultats /predict gardés par session Streamlit
+PREDICT_MEMO_SIZE = 50
+
+
+class APIError(Exception):
+    """Réponse d'erreur de l'API (code HTTP différent de 200)"""
+
+    def __init__(self, status_code):
+        super().__init__(f"API Error {status_code}")
+        self.status_code = status_code
+
+
+# ============================================
+# SESSION HTTP PARTAGÉE
+# ============================================
+
+@st.cache_resource(show_spinner=False)
+def get_session():
+    """
+    Session HTTP partagée (keep-alive, pool de connexions, réessais)
+
+    /predict est idempotent (même texte → même résultat) : les POST sont
+    réessayés comme les GET.
+
+    Returns:
+        requests.Session
+    """
+    retry = Retry(
+        total=RETRIES,
+        read=False,
+        backoff_factor=BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({'GET', 'POST'}),
+        raise_on_status=False,
+        respect_retry_after_header=True
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE, max_retries=retry)
+
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def request_json(api_url, endpoint, method='GET', data=None, session=None):
+    """
+    Appeler l'API via la session partagée
+
+    Args:
+        api_url (str): URL de base de l'API
+        endpoint (str): Chemin (ex. "/predict")
+        method (str): "GET" ou "POST"
+        data (dict): Corps JSON (POST)
+        session (requests.Session): Session à utiliser (défaut : get_session) ;
+            à récupérer dans le thread du script avant de la passer à
+            d'autres threads
+
+    Returns:
+        dict: Réponse JSON
+
+    Raises:
+        APIError: Code HTTP différent de 200
+        requests.exceptions.RequestException: Connexion impossible, timeout...
+    """
+    session = session or get_session()
+    url = f"{api_url}{endpoint}"
+    if method == 'GET':
+        r = session.get(url, timeout=TIMEOUT)
+    else:
+        r = session.post(url, json=data, timeout=TIMEOUT)
+
+    if r.status_code != 200:
+        raise APIError(r.status_code)
+    return r.json()
+
+
+# ============================================
+# /health ET /info (CACHE AVEC DURÉE DE VIE)
+# ============================================
+
+# Un échec lève une exception : st.cache_data ne la met pas en cache et
+# l'appel suivant réinterroge l'API
+
+@st.cache_data(ttl=HEALTH_TTL, show_spinner=False)
+def _cached_health(api_url):
+    return request_json(api_url, '/health')
+
+
+@st.cache_data(ttl=INFO_TTL, show_spinner=False)
+def _cached_info(api_url):
+    return request_json(api_url, '/info')
+
+
+def get_health(api_url):
+    """
+    État de l'API (/health), mis en cache HEALTH_TTL secondes
+
+    Returns:
+        dict: Réponse /health, ou None si l'API ne répond pas
+    """
+    try:
+        return _cached_health(api_url)
+    except Exception:
+        return None
+
+
+def get_info(api_url):
+    """
+    Informations modèle (/info), mises en cache INFO_TTL secondes
+
+    Returns:
+        dict: Réponse /info, ou None si l'API ne répond pas
+    """
+    try:
+        return _cached_info(api_url)
+    except Exception:
+        return None
+
+
+# ============================================
+# /predict (MÉMO PAR SESSION)
+# ============================================
+
+def predict_key(data):
+    """
+    Clé du mémo : empreinte SHA-256 du corps de la requête (texte et options)
+
+    Args:
+        data (dict): Corps JSON envoyé à /predict
+
+    Returns:
+        str
+    """
+    payload = json.dumps(data, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def predict(api_url, data):
+    """
+    Prédiction (/predict), mémorisée dans la session Streamlit
+
+    Args:
+        api_url (str): URL de base de l'API
+        data (dict): Corps JSON ({"text": ...})
+
+    Returns:
+        dict: Réponse /predict
+
+    Raises:
+        APIError, requests.exceptions.RequestException: voir request_json
+    """
+    memo = st.session_state.setdefault('predict_memo', OrderedDict())
+    key = predict_key(data)
+
+    if key in memo:
+        memo.move_to_end(key)
+        return memo[key]
+
+    result = request_json(api_url, '/predict', 'POST', data)
+    memo[key] = result
+    while len(memo) > PREDICT_MEMO_SIZE:
+        memo.popitem(last=False)
+    return result
+
+
+# ============================================
+# /predict/batch
+# ============================================
+
+def predict_batch(api_url, texts, session=None):
+    """
+    Prédictions de plusieurs textes en un appel (/predict/batch), sans mémo
+
+    Args:
+        api_url (str): URL de base de l'API
+        texts (list[str]): Textes à noter
+        session (requests.Session): Voir request_json
+
+    Returns:
+        list[dict]: Un résultat par texte, dans l'ordre (ou "error")
+
+    Raises:
+        APIError, requests.exceptions.RequestException: voir request_json
+    """
+    response = request_json(api_url, '/predict/batch', 'POST', {"texts": texts}, session=session)
+    return response['results']
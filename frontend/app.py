@@ -11,6 +11,9 @@ from datetime import datetime
 import base64
 import io
 
+import api_client
+import document_analysis
+
 # ============================================
 # CONFIGURATION
 # ============================================
@@ -105,19 +108,14 @@ def t(key):
 # ============================================
 
 def call_api(endpoint, method='GET', data=None):
-    """Appeler l'API"""
-    url = f"{API_URL}{endpoint}"
+    """Appeler l'API (session partagée ; /predict mémorisé par session)"""
     try:
-        if method == 'GET':
-            r = requests.get(url, timeout=10)
-        else:
-            r = requests.post(url, json=data, timeout=10)
-        
-        if r.status_code == 200:
-            return r.json()
-        else:
-            st.error(f"❌ API Error {r.status_code}")
-            return None
+        if endpoint == '/predict' and method == 'POST':
+            return api_client.predict(API_URL, data)
+        return api_client.request_json(API_URL, endpoint, method, data)
+    except api_client.APIError as e:
+        st.error(f"❌ API Error {e.status_code}")
+        return None
     except requests.exceptions.ConnectionError:
         st.error("❌ Impossible de se connecter à l'API")
         return None
@@ -177,9 +175,9 @@ with st.sidebar:
     
     st.divider()
     
-    # État API
+    # État API (mis en cache quelques secondes, pas à chaque interaction)
     st.subheader(t('api_status'))
-    health = call_api('/health')
+    health = api_client.get_health(API_URL)
     
     if health and health.get('status') == 'healthy':
         st.success(t('api_ok'))
@@ -213,7 +211,7 @@ if t('nav_home') in page:
     
     st.subheader("📊 Informations Modèle")
     
-    info = call_api('/info')
+    info = api_client.get_info(API_URL)
     if info:
         col1, col2 = st.columns(2)
         
@@ -340,39 +338,123 @@ elif t('nav_file') in page:
     if uploaded:
         st.info(f"📄 {uploaded.name} ({uploaded.size/1024:.1f} KB)")
         
-        # Extraction texte
-        file_text = ""
+        # Ouverture seule : les pages sont extraites pendant l'analyse
+        document = None
+        try:
+            document = document_analysis.open_document(uploaded)
+        except Exception:
+            st.error("❌ Erreur lecture du fichier")
         
-        if uploaded.name.endswith('.txt'):
-            file_text = uploaded.read().decode('utf-8')
-        
-        elif uploaded.name.endswith('.pdf'):
-            try:
-                import PyPDF2
-                pdf = PyPDF2.PdfReader(uploaded)
-                for page in pdf.pages:
-                    file_text += page.extract_text()
-            except:
-                st.error("❌ Erreur lecture PDF")
-        
-        elif uploaded.name.endswith('.docx'):
-            try:
-                import docx
-                doc = docx.Document(uploaded)
-                file_text = '\n'.join([p.text for p in doc.paragraphs])
-            except:
-                st.error("❌ Erreur lecture DOCX")
-        
-        if file_text:
+        if document is not None and document.n_units:
+            units_name = {'pdf': 'pages', 'docx': 'paragraphes', 'txt': 'lignes'}[document.kind]
+            st.caption(f"{document.n_units} {units_name}")
+            
             with st.expander("👁️ Aperçu"):
-                st.text_area("Contenu:", file_text[:500]+"...", height=200, disabled=True)
+                preview = next((text for _, text in document.units() if text.strip()), "")
+                st.text_area("Contenu:", preview[:500]+"...", height=200, disabled=True)
+            
+            # Résultats gardés pour ce fichier : un rerun ne relance pas l'analyse
+            file_key = (uploaded.name, uploaded.size)
+            analysis = st.session_state.get('document_analysis')
+            if analysis and analysis['file'] != file_key:
+                analysis = None
+            
+            analyze_file = st.button("🔍 Analyser ce fichier", type="primary")
+            if analyze_file and api_client.get_health(API_URL) is None:
+                st.error("❌ Impossible de se connecter à l'API")
+                analyze_file = False
+            
+            if analyze_file:
+                # Session HTTP récupérée ici : les appels partent de threads
+                session = api_client.get_session()
+                
+                def score_batch(texts):
+                    return api_client.predict_batch(API_URL, texts, session=session)
+                
+                progress = st.progress(0.0, text="📡 Analyse par sections...")
+                results = []
+                units_done = set()
+                segments = document_analysis.iter_segments(document.units())
+                
+                for result in document_analysis.score_segments(segments, score_batch):
+                    results.append(result)
+                    units_done.update(range(result['first'], result['last'] + 1))
+                    progress.progress(
+                        min(len(units_done) / document.n_units, 1.0),
+                        text=f"📡 {len(results)} sections analysées ({len(units_done)}/{document.n_units} {units_name})"
+                    )
+                progress.progress(1.0, text=f"✅ {len(results)} sections analysées")
+                
+                results.sort(key=lambda result: result['index'])
+                analysis = {
+                    'file': file_key,
+                    'results': results,
+                    'summary': document_analysis.aggregate(results)
+                }
+                st.session_state.document_analysis = analysis
+                
+                summary = analysis['summary']
+                if summary['p_fake'] is not None:
+                    is_fake = summary['label'] == 'FAKE'
+                    st.session_state.history.append({
+                        'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                        'text': f"{uploaded.name} ({summary['segments']} sections)",
+                        'prediction': 0 if is_fake else 1,
+                        'label': summary['label'],
+                        'confidence': summary['p_fake'] if is_fake else 1 - summary['p_fake']
+                    })
             
-            if st.button("🔍 Analyser ce fichier", type="primary"):
-                with st.spinner("Analyse..."):
-                    result = call_api('/predict', 'POST', {'text': file_text})
+            if analysis:
+                summary = analysis['summary']
+                results = analysis['results']
                 
-                if result:
-                    st.success(f"✅ {result['label']} ({result['confidence']*100:.1f}%)")
+                if summary['p_fake'] is None:
+                    st.error("❌ Aucune section n'a pu être analysée")
+                else:
+                    is_fake = summary['label'] == 'FAKE'
+                    color = "#DC143C" if is_fake else "#28A745"
+                    
+                    st.markdown(f"""
+                    <div class="result-box" style="
+                        background-color:{color}15;
+                        border-left:5px solid {color};
+                    ">
+                        <h2 style="color:{color};margin:0">
+                            {'⚠️' if is_fake else '✅'} {t('result_fake') if is_fake else t('result_real')}
+                        </h2>
+                        <p style="font-size:18px;margin:10px 0">
+                            Prob. FAKE (document): <b>{summary['p_fake']*100:.1f}%</b>
+                        </p>
+                    </div>
+                    """, unsafe_allow_html=True)
+                    
+                    col1, col2, col3 = st.columns(3)
+                    col1.metric("Sections", summary['segments'])
+                    col2.metric("Sections FAKE", summary['fake_segments'])
+                    col3.metric("Échecs", summary['failed'])
+                    
+                    # Heatmap : probabilité FAKE par section
+                    scored = [result for result in results if 'p_fake' in result]
+                    fig = go.Figure(go.Heatmap(
+                        z=[[result['p_fake'] for result in scored]],
+                        x=[document.label(result['first'], result['last']) for result in scored],
+                        y=['P(fake)'],
+                        zmin=0,
+                        zmax=1,
+                        colorscale=[[0,'#28A745'],[0.5,'#FFC107'],[1,'#DC143C']],
+                        hovertemplate="%{x}<br>P(fake): %{z:.2f}<extra></extra>"
+                    ))
+                    fig.update_layout(title="Probabilité FAKE par section", height=250)
+                    st.plotly_chart(fig, use_container_width=True)
+                    
+                    with st.expander(t('details')):
+                        df = pd.DataFrame([{
+                            'Section': document.label(result['first'], result['last']),
+                            'Caractères': result['chars'],
+                            'Verdict': result.get('label', '—'),
+                            'Prob. FAKE': f"{result['p_fake']*100:.1f}%" if 'p_fake' in result else result['error']
+                        } for result in results])
+                        st.dataframe(df, use_container_width=True)
 
 # ============================================
 # PAGE: MULTILINGUE
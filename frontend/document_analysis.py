@@ -0,0 +1,256 @@
+"""
+Analyse d'un document volumineux (PDF, DOCX, TXT) par sections
+
+Au lieu d'extraire tout le document puis de l'envoyer en un seul appel
+/predict (lent, limité par le timeout, un seul verdict) :
+
+1. les pages sont extraites à la demande (générateur) ;
+2. le texte est découpé en segments d'environ SEGMENT_CHARS caractères,
+   coupés entre deux lignes ou deux mots ;
+3. les segments partent par lots vers /predict/batch, plusieurs lots en
+   parallèle ; l'extraction avance au rythme des réponses (nombre de lots
+   en vol borné) ;
+4. les résultats sont rendus au fur et à mesure (barre de progression),
+   puis agrégés en un score de document (moyenne des probabilités FAKE
+   pondérée par la longueur des segments).
+
+Ce module ne dépend pas de Streamlit : l'appel à l'API est passé en
+paramètre (score_batch), l'affichage reste dans app.py.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+# Taille visée d'un segment (caractères)
+SEGMENT_CHARS = 5000
+
+# Segments par appel /predict/batch
+BATCH_SIZE = 8
+
+# Appels /predict/batch simultanés
+WORKERS = 4
+
+# Longueur minimale acceptée par l'API (pipeline.MIN_TEXT_LENGTH)
+MIN_SEGMENT_CHARS = 10
+
+# Seuil du verdict sur la probabilité FAKE agrégée
+FAKE_THRESHOLD = 0.5
+
+
+# ============================================
+# EXTRACTION À LA DEMANDE
+# ============================================
+
+class DocumentSource:
+    """
+    Document découpé en unités (pages PDF, paragraphes DOCX, lignes TXT)
+
+    Args:
+        kind (str): "pdf", "docx" ou "txt"
+        n_units (int): Nombre d'unités (pour la progression)
+        extract (callable): Numéro d'unité (0..n_units-1) → texte
+    """
+
+    def __init__(self, kind, n_units, extract):
+        self.kind = kind
+        self.n_units = n_units
+        self.extract = extract
+
+    def units(self):
+        """Générateur de (numéro à partir de 1, texte), extrait à la demande"""
+        for number in range(self.n_units):
+            try:
+                text = self.extract(number) or ""
+            except Exception:
+                text = ""  # Page illisible : ignorée, le reste du document est analysé
+            yield number + 1, text
+
+    def label(self, first, last):
+        """Libellé d'une section (ex. "p. 3-4" pour un PDF)"""
+        prefix = "p." if self.kind == 'pdf' else "§"
+        return f"{prefix} {first}" if first == last else f"{prefix} {first}-{last}"
+
+
+def open_document(uploaded):
+    """
+    Ouvrir un fichier téléversé sans en extraire le texte
+
+    Args:
+        uploaded: Fichier Streamlit (UploadedFile) ou objet fichier binaire
+            avec un attribut `name`
+
+    Returns:
+        DocumentSource
+
+    Raises:
+        ValueError: Format non pris en charge
+    """
+    name = uploaded.name.lower()
+
+    if name.endswith('.pdf'):
+        import PyPDF2
+        reader = PyPDF2.PdfReader(uploaded)
+        pages = reader.pages
+        return DocumentSource('pdf', len(pages), lambda number: pages[number].extract_text())
+
+    if name.endswith('.docx'):
+        import docx
+        paragraphs = [p.text for p in docx.Document(uploaded).paragraphs]
+        return DocumentSource('docx', len(paragraphs), paragraphs.__getitem__)
+
+    if name.endswith('.txt'):
+        lines = uploaded.read().decode('utf-8', errors='replace').splitlines()
+        return DocumentSource('txt', len(lines), lines.__getitem__)
+
+    raise ValueError(f"Unsupported file type: {uploaded.name}")
+
+
+# ============================================
+# SEGMENTS ET LOTS
+# ============================================
+
+def _pieces(text, limit):
+    """Couper un texte trop long en morceaux de `limit` caractères au plus, entre deux mots"""
+    while len(text) > limit:
+        cut = text.rfind(' ', 0, limit)
+        if cut <= 0:
+            cut = limit
+        yield text[:cut]
+        text = text[cut:].lstrip()
+    yield text
+
+
+def iter_segments(units, segment_chars=SEGMENT_CHARS):
+    """
+    Regrouper les unités en segments d'environ `segment_chars` caractères
+
+    Args:
+        units (iterable): (numéro d'unité, texte)
+        segment_chars (int): Taille visée d'un segment
+
+    Yields:
+        dict: index, first, last (unités couvertes), text
+    """
+    buffer, length, first, last = [], 0, None, None
+    index = 0
+
+    for number, text in units:
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            for piece in _pieces(line, segment_chars):
+                if length and length + len(piece) + 1 > segment_chars:
+                    yield {"index": index, "first": first, "last": last, "text": '\n'.join(buffer)}
+                    index += 1
+                    buffer, length, first = [], 0, None
+                if first is None:
+                    first = number
+                buffer.append(piece)
+                length += len(piece) + 1
+                last = number
+
+    # Dernier segment (ignoré s'il est trop court pour l'API)
+    if buffer and length > MIN_SEGMENT_CHARS:
+        yield {"index": index, "first": first, "last": last, "text": '\n'.join(buffer)}
+
+
+def iter_batches(segments, batch_size=BATCH_SIZE):
+    """Regrouper les segments par lots de `batch_size`"""
+    batch = []
+    for segment in segments:
+        batch.append(segment)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ============================================
+# NOTATION PARALLÈLE
+# ============================================
+
+def _score_batch(score_batch, batch):
+    """Noter un lot ; une erreur d'appel est reportée sur chacun de ses segments"""
+    try:
+        outputs = score_batch([segment['text'] for segment in batch])
+    except Exception as e:
+        outputs = [{"error": str(e)}] * len(batch)
+
+    results = []
+    for segment, output in zip(batch, outputs):
+        result = {key: segment[key] for key in ('index', 'first', 'last')}
+        result['chars'] = len(segment['text'])
+        if "error" in output:
+            result['error'] = output.get('message') or output['error']
+        else:
+            result['p_fake'] = output['probabilities']['fake']
+            result['label'] = output['label']
+            result['weight'] = output.get('cleaned_length') or result['chars']
+        results.append(result)
+    return results
+
+
+def score_segments(segments, score_batch, batch_size=BATCH_SIZE, workers=WORKERS):
+    """
+    Noter les segments par lots, plusieurs lots en parallèle
+
+    Au plus 2 × `workers` lots sont en vol : les segments (et donc les
+    pages) ne sont extraits qu'au rythme des réponses de l'API.
+
+    Args:
+        segments (iterable): Segments (iter_segments)
+        score_batch (callable): Liste de textes → liste de résultats
+            /predict/batch (même ordre)
+        batch_size (int): Segments par appel
+        workers (int): Appels simultanés
+
+    Yields:
+        dict: Résultat d'un segment, dans l'ordre d'arrivée
+            (index, first, last, chars, puis p_fake, label, weight ou error)
+    """
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for batch in iter_batches(segments, batch_size):
+            pending.add(pool.submit(_score_batch, score_batch, batch))
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+
+def aggregate(results):
+    """
+    Score du document à partir des résultats par segment
+
+    Args:
+        results (list[dict]): Résultats de score_segments
+
+    Returns:
+        dict: p_fake (moyenne pondérée par la longueur des segments, None
+            si aucun segment n'a été noté), label, segments, fake_segments,
+            failed
+    """
+    scored = [result for result in results if 'p_fake' in result]
+    total_weight = sum(result['weight'] for result in scored)
+
+    p_fake = None
+    if total_weight > 0:
+        p_fake = sum(result['p_fake'] * result['weight'] for result in scored) / total_weight
+
+    return {
+        "p_fake": p_fake,
+        "label": None if p_fake is None else ("FAKE" if p_fake >= FAKE_THRESHOLD else "REAL"),
+        "segments": len(results),
+        "fake_segments": sum(1 for result in scored if result['p_fake'] >= FAKE_THRESHOLD),
+        "failed": len(results) - len(scored)
+    }